@@ -1,61 +1,33 @@
 import os
 import sys
 
+# The automaton engine is shared with 2018/18, 2020/11 and 2021/11
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '2020'))
+from automaton import Automaton, life_rule, from_lines
+
+RULE = life_rule()
+
 def load_input():
     with open(os.path.join(sys.path[0], 'input.txt')) as f:
         return [line.strip() for line in f if line.strip()]
 
-def step(grid, corners_on=False):
-    rows, cols = len(grid), len(grid[0])
-    new_grid = [[False] * cols for _ in range(rows)]
-    
-    for r in range(rows):
-        for c in range(cols):
-            neighbors = 0
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc]:
-                        neighbors += 1
-            
-            if grid[r][c]:
-                new_grid[r][c] = neighbors in (2, 3)
-            else:
-                new_grid[r][c] = neighbors == 3
-    
-    if corners_on:
-        new_grid[0][0] = True
-        new_grid[0][cols-1] = True
-        new_grid[rows-1][0] = True
-        new_grid[rows-1][cols-1] = True
-    
-    return new_grid
-
 def parse_grid(lines):
-    return [[c == '#' for c in line] for line in lines]
+    return from_lines(lines, '.#')
 
-def count_on(grid):
-    return sum(sum(row) for row in grid)
+def corners(grid):
+    rows, cols = grid.shape
+    return {(0, 0): 1, (0, cols - 1): 1, (rows - 1, 0): 1, (rows - 1, cols - 1): 1}
 
 def part1(lines):
-    grid = parse_grid(lines)
-    for _ in range(100):
-        grid = step(grid)
-    return count_on(grid)
+    lights = Automaton(parse_grid(lines), RULE)
+    lights.run(100)
+    return lights.count()
 
 def part2(lines):
     grid = parse_grid(lines)
-    rows, cols = len(grid), len(grid[0])
-    grid[0][0] = True
-    grid[0][cols-1] = True
-    grid[rows-1][0] = True
-    grid[rows-1][cols-1] = True
-    
-    for _ in range(100):
-        grid = step(grid, corners_on=True)
-    return count_on(grid)
+    lights = Automaton(grid, RULE, pinned=corners(grid))
+    lights.run(100)
+    return lights.count()
 
 if __name__ == "__main__":
     data = load_input()
@@ -1,26 +1,27 @@
 import os
 import sys
-import hashlib
+
+# The md5 miner is shared with 2016/5
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '2016'))
+from md5hash import first_match
 
 def load_input():
     with open(os.path.join(sys.path[0], 'input.txt')) as f:
         return f.read().strip()
 
-def find_hash(secret, prefix):
-    i = 1
-    while True:
-        h = hashlib.md5(f"{secret}{i}".encode()).hexdigest()
-        if h.startswith(prefix):
-            return i
-        i += 1
+def find_hash(secret, prefix, workers=1):
+    # prefix is all zeros, e.g. '00000'
+    nonce, _ = first_match(secret, len(prefix), start=1, workers=workers)
+    return nonce
 
-def part1(secret):
-    return find_hash(secret, '00000')
+def part1(secret, workers=1):
+    return find_hash(secret, '00000', workers)
 
-def part2(secret):
-    return find_hash(secret, '000000')
+def part2(secret, workers=1):
+    return find_hash(secret, '000000', workers)
 
 if __name__ == "__main__":
     data = load_input()
-    print("Part 1:", part1(data))
-    print("Part 2:", part2(data))
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else 1
+    print("Part 1:", part1(data, workers))
+    print("Part 2:", part2(data, workers))
@@ -1,198 +1,180 @@
 import sys
 import os
 import re
-from collections import deque
-from itertools import combinations, chain
+import time
 
 # Floors are 0-indexed (0=1st floor, 3=4th floor)
+FLOORS = 4
+
+# A state is one int: the elevator floor in the low 2 bits, then a 4-bit
+# count for each of the 16 (generator floor, chip floor) combinations,
+# combination g * 4 + m. Pairs are interchangeable, so counting them per
+# combination is already canonical and moving either of two alike pairs
+# gives the same state.
+ELEVATOR = 3
+COUNTERS = 2
+PER_COUNT = 15
+
+# Pair count the benchmark scales the input up to, adding pairs on floor 0
+MAX_PAIRS = 10
+
+def count_bit(code):
+    return 1 << (COUNTERS + 4 * code)
+
+# Floor masks over the presence bits (bit 4 * combination set when any pair
+# has it): generators on each floor, chips on each floor without their own
+# generator, and anything on each floor
+PRESENT = sum(1 << 4 * code for code in range(16))
+GENS = [sum(1 << 4 * (4 * f + m) for m in range(FLOORS)) for f in range(FLOORS)]
+LONE = [sum(1 << 4 * (4 * g + f) for g in range(FLOORS) if g != f) for f in range(FLOORS)]
+BELOW = [0] * FLOORS
+for f in range(1, FLOORS):
+    BELOW[f] = BELOW[f - 1] | GENS[f - 1] | LONE[f - 1]
 
 def parse_input(lines):
-    # Map element name to id
-    elements = {}
-    next_id = 0
-    
-    # Store initial positions: element_id -> [generator_floor, microchip_floor]
-    # We will build this up.
-    temp_positions = {}
-    
+    # (generator floor, microchip floor) for each element
+    positions = {}
     for floor_idx, line in enumerate(lines):
-        # Extract generators
         # "a polonium generator"
-        gens = re.findall(r'(\w+) generator', line)
-        for g in gens:
-            if g not in elements:
-                elements[g] = next_id
-                next_id += 1
-            eid = elements[g]
-            if eid not in temp_positions:
-                temp_positions[eid] = [None, None]
-            temp_positions[eid][0] = floor_idx
-            
-        # Extract microchips
+        for g in re.findall(r'(\w+) generator', line):
+            positions.setdefault(g, [None, None])[0] = floor_idx
         # "a thulium-compatible microchip"
-        chips = re.findall(r'(\w+)-compatible microchip', line)
-        for c in chips:
-            if c not in elements:
-                elements[c] = next_id
-                next_id += 1
-            eid = elements[c]
-            if eid not in temp_positions:
-                temp_positions[eid] = [None, None]
-            temp_positions[eid][1] = floor_idx
-            
-    # Convert to list of pairs sorted by element ID (though sorting by value effectively canonicalizes)
-    # The state we want is: (elevator_floor, tuple(sorted([(g_floor, m_floor) for each element])))
-    # We don't care WHICH element is at (0,0) vs (1,1), just that THERE IS an element at those coords.
-    pairs = []
-    for eid in sorted(temp_positions.keys()):
-        pairs.append(tuple(temp_positions[eid]))
-    
-    return 0, tuple(sorted(pairs))
-
-def is_valid(pairs):
-    # Check each floor safety
-    # A floor is safe if:
-    # No microchip is with another generator UNLESS its own generator is also there.
-    # More simply: if a chip is on floor F, and its gen is NOT on floor F, then NO other gen can be on floor F.
-    
-    # Precompute generators on each floor
-    gens_on_floor = [set() for _ in range(4)]
-    chips_on_floor = [set() for _ in range(4)]
-    
-    for i, (g, m) in enumerate(pairs):
-        gens_on_floor[g].add(i)
-        chips_on_floor[m].add(i)
-        
-    for f in range(4):
-        if not chips_on_floor[f] or not gens_on_floor[f]:
-            continue
-            
-        # For each chip on this floor
-        for chip_id in chips_on_floor[f]:
-            # If its generator is not here
-            if chip_id not in gens_on_floor[f]:
-                # And there are ANY generators here (which we checked above with gens_on_floor[f])
-                return False
-    return True
-
-def get_next_states(state):
-    elevator, pairs = state
-    next_states = []
-    
-    # Possible moves: 1 or 2 items from current floor
-    # Identify indices of items on current floor
-    # items are identified by (type, index_in_pairs)
-    # type 0 = gen, type 1 = chip
-    
-    items_on_floor = []
-    for i, (g, m) in enumerate(pairs):
-        if g == elevator:
-            items_on_floor.append((0, i)) # Generator i
-        if m == elevator:
-            items_on_floor.append((1, i)) # Microchip i
-            
-    possible_moves = []
-    # 1 item
-    for item in items_on_floor:
-        possible_moves.append([item])
-    # 2 items
-    for item1, item2 in combinations(items_on_floor, 2):
-        possible_moves.append([item1, item2])
-        
-    # Directions
-    directions = []
-    if elevator < 3: directions.append(1)
-    if elevator > 0: directions.append(-1)
-    
-    # Heuristic optimization: Don't move 2 items down if we can move 1
-    # Actually, we should try to move things UP.
-    # If we are at floor F, and all floors below F are empty, don't move anything down.
-    # Check if floors below are empty
-    floors_below_empty = True
-    for f in range(elevator):
-        # check if any item is at floor f
-        for g, m in pairs:
-            if g == f or m == f:
-                floors_below_empty = False
-                break
-        if not floors_below_empty:
-            break
-            
-    for d in directions:
-        next_floor = elevator + d
-        if d == -1 and floors_below_empty:
-            continue
-            
-        for move in possible_moves:
-            # Create new pairs state
-            # Tuples are immutable so we need to rebuild
-            # It's easier to convert to list of lists, modify, then back to tuple of tuples
-            
-            # Optimization: don't move 1 item down if you can move 2?
-            # Optimization: don't move 2 items up if you can move 1? -> No, moving 2 up is better.
-            
-            # Let's apply moves
-            # We need to construct new state
-            new_pairs_list = [list(p) for p in pairs]
-            
-            for type_idx, pair_idx in move:
-                new_pairs_list[pair_idx][type_idx] = next_floor
-                
-            new_pairs = tuple(sorted(tuple(p) for p in new_pairs_list))
-            
-            if is_valid(new_pairs):
-                next_states.append((next_floor, new_pairs))
-                
-    return next_states
-
-def solve_bfs(initial_state):
-    queue = deque([(0, initial_state)]) # steps, state
-    visited = set([initial_state])
-    
-    # Target: all items on floor 3
-    # Target state shape: (3, ((3,3), (3,3), ...))
-    target_pairs = tuple((3, 3) for _ in initial_state[1])
-    # Note: target elevator floor is 3. 
-    # Actually elevator must be at 3 too if everything is at 3.
-    
-    while queue:
-        steps, state = queue.popleft()
-        elevator, pairs = state
-        
-        if pairs == target_pairs and elevator == 3:
-            return steps
-        
-        for next_state in get_next_states(state):
-            if next_state not in visited:
-                visited.add(next_state)
-                queue.append((steps + 1, next_state))
-                
-    return -1
+        for c in re.findall(r'(\w+)-compatible microchip', line):
+            positions.setdefault(c, [None, None])[1] = floor_idx
+    return [tuple(pair) for pair in positions.values()]
 
-def part1():
+def encode(elevator, pairs):
+    if len(pairs) > PER_COUNT:
+        raise ValueError(f"At most {PER_COUNT} pairs fit a state, got {len(pairs)}")
+    return elevator + sum(count_bit(g * 4 + m) for g, m in pairs)
+
+def presence(state):
+    # Fold each count down onto its lowest bit
+    present = state >> COUNTERS
+    present |= present >> 1
+    present |= present >> 2
+    return present & PRESENT
+
+def safe(present, floor):
+    # A chip without its generator is fried by any other generator
+    return not (present & GENS[floor] and present & LONE[floor])
+
+def next_states(state, prune):
+    elevator = state & ELEVATOR
+    # (combination, 0 for its generator or 1 for its chip, pairs of it) on this floor
+    items = []
+    for m in range(FLOORS):
+        count = state >> (COUNTERS + 4 * (4 * elevator + m)) & 15
+        if count:
+            items.append((4 * elevator + m, 0, count))
+    for g in range(FLOORS):
+        count = state >> (COUNTERS + 4 * (4 * g + elevator)) & 15
+        if count:
+            items.append((4 * g + elevator, 1, count))
+
+    targets = []
+    if elevator < FLOORS - 1:
+        targets.append(elevator + 1)
+    # Nothing is ever brought down below the lowest floor still in use
+    if elevator > 0 and not (prune and not presence(state) & BELOW[elevator]):
+        targets.append(elevator - 1)
+
+    result = []
+    for target in targets:
+        # Each item's move: the change to the counts carrying it to target
+        moved = []
+        for code, kind, count in items:
+            dest = 4 * target + (code & 3) if kind == 0 else (code & 12) + target
+            moved.append((code, kind, count, count_bit(dest) - count_bit(code)))
+        deltas = []
+        for i, (code, kind, count, delta) in enumerate(moved):
+            deltas.append(delta)
+            if count >= 2:
+                deltas.append(2 * delta)
+            for other_code, _, other_count, other_delta in moved[i + 1:]:
+                if other_code != code:
+                    deltas.append(delta + other_delta)
+                    continue
+                # A generator and a chip both with everything on this floor:
+                # one whole pair, or parts of two
+                deltas.append(count_bit(5 * target) - count_bit(code))
+                if count >= 2:
+                    deltas.append(delta + other_delta)
+        shift = target - elevator
+        for delta in deltas:
+            new = state + delta + shift
+            present = presence(new)
+            if safe(present, elevator) and safe(present, target):
+                result.append(new)
+    return result
+
+def solve_bfs(pairs, stats=None, bidirectional=True):
+    # Level by level from both ends, always widening the smaller frontier,
+    # until one reaches a state the other has seen. Every move can be made
+    # back, so the search from the end uses the same moves, just without the
+    # pruning that only holds going forward.
+    start = encode(0, pairs)
+    goal = encode(FLOORS - 1, [(FLOORS - 1, FLOORS - 1)] * len(pairs))
+    seen = [{start: 0}, {goal: 0}]
+    frontiers = [[start], [goal]]
+    depths = [0, 0]
+    expanded = 0
+    steps = 0 if start == goal else -1
+    while steps < 0 and frontiers[0] and frontiers[1]:
+        side = 0 if not bidirectional or len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = seen[side], seen[1 - side]
+        depths[side] += 1
+        depth = depths[side]
+        frontier = []
+        best = None
+        for state in frontiers[side]:
+            expanded += 1
+            for new in next_states(state, prune=side == 0):
+                if new in mine:
+                    continue
+                if new in other and (best is None or depth + other[new] < best):
+                    best = depth + other[new]
+                mine[new] = depth
+                frontier.append(new)
+        frontiers[side] = frontier
+        if best is not None:
+            steps = best
+    if stats is not None:
+        stats['expanded'] = expanded
+        stats['visited'] = len(seen[0]) + len(seen[1])
+    return steps
+
+def read_pairs():
     input_path = os.path.join(sys.path[0], 'input.txt')
     with open(input_path) as f:
         lines = [l.strip() for l in f.readlines() if l.strip()]
-    
-    initial_state = parse_input(lines)
-    return solve_bfs(initial_state)
+    return parse_input(lines)
+
+def part1():
+    return solve_bfs(read_pairs())
 
 def part2():
-    input_path = os.path.join(sys.path[0], 'input.txt')
-    with open(input_path) as f:
-        lines = [l.strip() for l in f.readlines() if l.strip()]
-    
-    initial_elevator, initial_pairs = parse_input(lines)
-    
     # Part 2: Add 2 pairs at floor 0 (1st floor)
     # Elerium generator, Elerium-compatible microchip
     # Dilithium generator, Dilithium-compatible microchip
-    extra_pairs = ((0, 0), (0, 0))
-    
-    new_pairs = tuple(sorted(initial_pairs + extra_pairs))
-    
-    return solve_bfs((initial_elevator, new_pairs))
+    return solve_bfs(read_pairs() + [(0, 0), (0, 0)])
+
+def bench():
+    # The input with more and more pairs added on floor 0, searched from both
+    # ends and from the start only
+    pairs = read_pairs()
+    print(f"{'pairs':>5} {'search':<8} {'steps':>6} {'expanded':>10} {'visited':>10} {'seconds':>8}")
+    for count in range(len(pairs), MAX_PAIRS + 1):
+        scaled = pairs + [(0, 0)] * (count - len(pairs))
+        for name, bidirectional in (("both", True), ("one-way", False)):
+            stats = {}
+            begin = time.perf_counter()
+            steps = solve_bfs(scaled, stats, bidirectional)
+            elapsed = time.perf_counter() - begin
+            print(f"{count:>5} {name:<8} {steps:>6} {stats['expanded']:>10,} {stats['visited']:>10,} {elapsed:>8.3f}")
 
 if __name__ == "__main__":
     print("Part 1:", part1())
     print("Part 2:", part2())
+    if '--bench' in sys.argv:
+        bench()
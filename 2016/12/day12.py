@@ -1,47 +1,13 @@
 import sys
 import os
 
-def get_val(x, regs):
-    try:
-        return int(x)
-    except ValueError:
-        return regs[x]
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from assembunny import AssembunnyComputer, parse_program
 
 def run(instructions, regs):
-    program = []
-    # Parse instructions
-    for line in instructions:
-        parts = line.split()
-        program.append(parts)
-        
-    pc = 0
-    prog_len = len(program)
-    
-    while 0 <= pc < prog_len:
-        parts = program[pc]
-        op = parts[0]
-        
-        if op == 'cpy':
-            x, y = parts[1], parts[2]
-            if y in regs: # y must be a register
-                regs[y] = get_val(x, regs)
-        elif op == 'inc':
-            x = parts[1]
-            if x in regs:
-                regs[x] += 1
-        elif op == 'dec':
-            x = parts[1]
-            if x in regs:
-                regs[x] -= 1
-        elif op == 'jnz':
-            x, y = parts[1], parts[2]
-            val_x = get_val(x, regs)
-            if val_x != 0:
-                pc += get_val(y, regs)
-                continue
-        
-        pc += 1
-        
+    computer = AssembunnyComputer(parse_program(instructions), regs)
+    computer.run()
+    regs.update(computer.registers)
     return regs['a']
 
 def part1():
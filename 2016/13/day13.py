@@ -1,6 +1,9 @@
 import sys
 import os
-from collections import deque
+
+# The grid graph is shared with 2021/15, 2022/12, 2023/17 and 2024/16, 18 and 20
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '2024'))
+from gridgraph import bfs, UNREACHED
 
 def is_wall(x, y, fav_num):
     val = x*x + 3*x + 2*x*y + y + y*y + fav_num
@@ -8,34 +11,57 @@ def is_wall(x, y, fav_num):
     bits = bin(val).count('1')
     return bits % 2 != 0
 
+class Office:
+    """Neighbour lists of the side x side corner of the office at (0, 0),
+    cell y * side + x, worked out as a search reaches each cell. Each
+    cell's wall test is made once, kept as 1 open or 2 wall."""
+
+    def __init__(self, fav_num, side):
+        self.fav_num = fav_num
+        self.side = side
+        self.known = bytearray(side * side)
+
+    def __len__(self):
+        return self.side * self.side
+
+    def __getitem__(self, i):
+        side = self.side
+        known = self.known
+        y, x = divmod(i, side)
+        moves = []
+        if x:
+            moves.append(i - 1)
+        if x + 1 < side:
+            moves.append(i + 1)
+        if y:
+            moves.append(i - side)
+        if y + 1 < side:
+            moves.append(i + side)
+        result = []
+        for j in moves:
+            if not known[j]:
+                ny, nx = divmod(j, side)
+                known[j] = 2 if is_wall(nx, ny, self.fav_num) else 1
+            if known[j] == 1:
+                result.append(j)
+        return result
+
 def solve_bfs(fav_num, target_x, target_y):
-    # Queue: (x, y, dist)
-    queue = deque([(1, 1, 0)])
-    visited = set([(1, 1)])
-    
-    while queue:
-        x, y, dist = queue.popleft()
-        
-        if x == target_x and y == target_y:
-            return dist
-            
-        # Neighbors
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            
-            if nx < 0 or ny < 0:
-                continue
-                
-            if (nx, ny) in visited:
-                continue
-                
-            if is_wall(nx, ny, fav_num):
-                continue
-                
-            visited.add((nx, ny))
-            queue.append((nx, ny, dist + 1))
-            
-    return -1
+    # The office is unbounded, but a path leaving a side x side corner goes
+    # side - 1 steps out from (1, 1) and at least side - target back: search
+    # bigger corners until the path found is no longer than that
+    side = max(2, 2 * max(target_x, target_y))
+    while True:
+        target = target_y * side + target_x
+        dist = bfs(Office(fav_num, side), [side + 1], targets=[target])
+        if dist[target] != UNREACHED:
+            if dist[target] <= 2 * side - 1 - max(target_x, target_y):
+                return dist[target]
+        elif all(d == UNREACHED for d in dist[side - 1::side] + dist[side * (side - 1):]):
+            # The search covered everything it could reach and never got to
+            # the far edges: the start is shut in, however big the corner
+            return -1
+        side *= 2
 
 def part1():
     input_path = os.path.join(sys.path[0], 'input.txt')
@@ -45,32 +71,10 @@ def part1():
     return solve_bfs(fav_num, 31, 39)
 
 def solve_bfs_part2(fav_num, max_steps):
-    queue = deque([(1, 1, 0)])
-    visited = set([(1, 1)])
-    
-    while queue:
-        x, y, dist = queue.popleft()
-        
-        if dist >= max_steps:
-            continue
-            
-        # Neighbors
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            
-            if nx < 0 or ny < 0:
-                continue
-                
-            if (nx, ny) in visited:
-                continue
-                
-            if is_wall(nx, ny, fav_num):
-                continue
-                
-            visited.add((nx, ny))
-            queue.append((nx, ny, dist + 1))
-            
-    return len(visited)
+    # Nothing within max_steps of (1, 1) lies past x or y = 1 + max_steps
+    side = max_steps + 2
+    dist = bfs(Office(fav_num, side), [side + 1], limit=max_steps)
+    return sum(1 for d in dist if d != UNREACHED)
 
 def part2():
     input_path = os.path.join(sys.path[0], 'input.txt')
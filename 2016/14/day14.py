@@ -1,32 +1,25 @@
 import sys
 import os
-import hashlib
 import re
-from collections import deque
+from collections import defaultdict, deque
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from md5hash import StretchedHashes
+
+QUINTUPLET = re.compile(r'(.)\1{4}')
 
 class KeyFinder:
-    def __init__(self, salt, stretch=0):
+    def __init__(self, salt, stretch=0, workers=1, memo=None):
         self.salt = salt
         self.stretch = stretch
-        self.hash_cache = {}
-        # Optimization: Pre-scan cache for quintuplets?
-        # Actually simple memoization is fine for N=64 keys.
         # We might need to go up to index 25000 approx.
-        # 25000 hashes is fast for regular MD5. 
         # For stretched MD5 (2016 extra hashes), it's 25000 * 2017 hashes ~ 50 million hashes.
-        # That takes a while in Python (maybe 20-30s). Acceptable.
+        # The scanner only ever looks 1000 ahead, so hashes are produced in
+        # chunks ahead of it (across workers) and dropped once behind it.
+        self.hashes = StretchedHashes(salt, stretch, workers, memo=memo)
 
     def get_hash(self, index):
-        if index in self.hash_cache:
-            return self.hash_cache[index]
-        
-        # Calculate
-        h = hashlib.md5(f"{self.salt}{index}".encode('utf-8')).hexdigest()
-        for _ in range(self.stretch):
-            h = hashlib.md5(h.encode('utf-8')).hexdigest()
-            
-        self.hash_cache[index] = h
-        return h
+        return self.hashes[index]
 
     def find_triplet(self, h):
         # "contains three of the same character in a row... Only consider the first such triplet"
@@ -42,6 +35,10 @@ class KeyFinder:
 
     def solve(self, n_keys=64):
         keys = []
+        # Indexes of hashes with five of a character in a row, per character,
+        # from each hash as it is first seen
+        quintuplets = defaultdict(deque)
+        seen = 0
         i = 0
         while len(keys) < n_keys:
             h = self.get_hash(i)
@@ -49,35 +46,37 @@ class KeyFinder:
             
             if char:
                 # Check next 1000
-                is_key = False
-                for j in range(1, 1001):
-                    h_next = self.get_hash(i + j)
-                    if self.has_quintuplet(h_next, char):
-                        is_key = True
-                        break
+                while seen <= i + 1000:
+                    for c in set(QUINTUPLET.findall(self.get_hash(seen))):
+                        quintuplets[c].append(seen)
+                    seen += 1
+                later = quintuplets[char]
+                while later and later[0] <= i:
+                    later.popleft()
                 
-                if is_key:
+                if later:
                     keys.append(i)
                     # print(f"Key {len(keys)} found at index {i}")
             
             i += 1
             
+        self.hashes.close()
         return keys[-1]
 
-def part1():
+def part1(workers=1, memo=None):
     input_path = os.path.join(sys.path[0], 'input.txt')
     with open(input_path) as f:
         salt = f.read().strip()
     
-    finder = KeyFinder(salt)
+    finder = KeyFinder(salt, workers=workers, memo=memo)
     return finder.solve(64)
 
-def part2():
+def part2(workers=1, memo=None):
     input_path = os.path.join(sys.path[0], 'input.txt')
     with open(input_path) as f:
         salt = f.read().strip()
     
-    finder = KeyFinder(salt, stretch=2016)
+    finder = KeyFinder(salt, stretch=2016, workers=workers, memo=memo)
     return finder.solve(64)
 
 def run_example():
@@ -117,5 +116,8 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         run_example()
     else:
-        print("Part 1:", part1())
-        print("Part 2:", part2())
+        workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else 1
+        # --memo keeps the hashes on disk next to the input, for instant re-runs
+        memo = os.path.join(sys.path[0], '.memo') if '--memo' in sys.argv else None
+        print("Part 1:", part1(workers, memo))
+        print("Part 2:", part2(workers, memo))
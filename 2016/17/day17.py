@@ -3,85 +3,85 @@ import os
 import hashlib
 from collections import deque
 
-def get_md5(s):
-    return hashlib.md5(s.encode('utf-8')).hexdigest()
+# U, D, L, R: (direction, dx, dy)
+MOVES = [('U', 0, -1), ('D', 0, 1), ('L', -1, 0), ('R', 1, 0)]
+STEPS = [d.encode() for d, _, _ in MOVES]
 
-def get_open_doors(passcode, path):
-    h = get_md5(passcode + path)
-    chars = h[:4]
-    doors = []
-    # U, D, L, R
-    # Open: b, c, d, e, f
-    open_chars = {'b', 'c', 'd', 'e', 'f'}
-    
-    if chars[0] in open_chars:
-        doors.append('U')
-    if chars[1] in open_chars:
-        doors.append('D')
-    if chars[2] in open_chars:
-        doors.append('L')
-    if chars[3] in open_chars:
-        doors.append('R')
-        
-    return doors
+# Rooms numbered y * 4 + x: the doors that lead to another room, and where they go
+INSIDE = [sum(1 << i for i, (_, dx, dy) in enumerate(MOVES) if 0 <= r % 4 + dx <= 3 and 0 <= r // 4 + dy <= 3)
+          for r in range(16)]
+NEXT_ROOM = [[r + dx + 4 * dy for _, dx, dy in MOVES] for r in range(16)]
+VAULT = 15
+
+def open_doors(h):
+    # Doors are the first four hex digits of the hash; b-f (11-15) is open.
+    # h is the md5 object for passcode + path so far, read as raw bytes.
+    # Returns a bit per open door, U as bit 0.
+    d = h.digest()
+    a, b = d[0], d[1]
+    return ((a >> 4) > 10) | ((a & 15) > 10) << 1 | ((b >> 4) > 10) << 2 | ((b & 15) > 10) << 3
 
-def solve_part1(passcode):
-    # (x, y, path)
-    queue = deque([(0, 0, "")])
+def solve_part1(passcode, stats=None):
+    # (room, path, md5 of passcode + path)
+    queue = deque([(0, "", hashlib.md5(passcode.encode('utf-8')))])
+    expanded = 0
     
     while queue:
-        x, y, path = queue.popleft()
+        room, path, h = queue.popleft()
         
-        if x == 3 and y == 3:
+        if room == VAULT:
+            if stats is not None:
+                stats['expanded'] = expanded
             return path
             
-        open_dirs = get_open_doors(passcode, path)
-        
-        for d in open_dirs:
-            nx, ny = x, y
-            if d == 'U':
-                ny -= 1
-            elif d == 'D':
-                ny += 1
-            elif d == 'L':
-                nx -= 1
-            elif d == 'R':
-                nx += 1
-            
-            if 0 <= nx <= 3 and 0 <= ny <= 3:
-                queue.append((nx, ny, path + d))
+        expanded += 1
+        doors = open_doors(h) & INSIDE[room]
+        for i, (d, _, _) in enumerate(MOVES):
+            if doors >> i & 1:
+                # Extending the path by one step only hashes one more byte
+                step = h.copy()
+                step.update(STEPS[i])
+                queue.append((NEXT_ROOM[room][i], path + d, step))
                 
     return None
 
-def solve_part2_longest(passcode):
-    # DFS to find longest path
-    # Stack: (x, y, path)
-    stack = [(0, 0, "")]
+def solve_part2_longest(passcode, stats=None):
+    # Iterative DFS keeping, per step of the current path, the room, its md5
+    # object and a mask of the doors not tried yet. Memory grows with the
+    # path length, not with every open branch and its whole path string.
+    root = hashlib.md5(passcode.encode('utf-8'))
+    rooms = [0]
+    hashes = [root]
+    untried = [open_doors(root) & INSIDE[0]]
     max_len = 0
+    expanded = 1
+    peak = 1
     
-    while stack:
-        x, y, path = stack.pop()
-        
-        if x == 3 and y == 3:
-            max_len = max(max_len, len(path))
+    while untried:
+        doors = untried[-1]
+        if not doors:
+            rooms.pop()
+            hashes.pop()
+            untried.pop()
             continue
-            
-        open_dirs = get_open_doors(passcode, path)
-        
-        for d in open_dirs:
-            nx, ny = x, y
-            if d == 'U':
-                ny -= 1
-            elif d == 'D':
-                ny += 1
-            elif d == 'L':
-                nx -= 1
-            elif d == 'R':
-                nx += 1
-            
-            if 0 <= nx <= 3 and 0 <= ny <= 3:
-                stack.append((nx, ny, path + d))
-                
+        i = (doors & -doors).bit_length() - 1
+        untried[-1] = doors & (doors - 1)
+        room = NEXT_ROOM[rooms[-1]][i]
+        if room == VAULT:
+            # The path ends here; its length is the number of steps taken
+            max_len = max(max_len, len(rooms))
+            continue
+        step = hashes[-1].copy()
+        step.update(STEPS[i])
+        rooms.append(room)
+        hashes.append(step)
+        untried.append(open_doors(step) & INSIDE[room])
+        expanded += 1
+        peak = max(peak, len(rooms))
+    
+    if stats is not None:
+        stats['expanded'] = expanded
+        stats['peak_depth'] = peak
     return max_len
 
 def part1():
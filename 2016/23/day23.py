@@ -1,110 +1,14 @@
 import sys
 import os
 
-def parse_val(x, regs):
-    try:
-        return int(x)
-    except ValueError:
-        return regs.get(x, 0)
-
-def toggle(inst):
-    # tgl x
-    # one-arg: inc -> dec, others -> inc
-    # two-arg: jnz -> cpy, others -> jnz
-    op = inst[0]
-    args = inst[1:]
-    
-    if len(args) == 1:
-        if op == 'inc':
-            return ['dec'] + args
-        else:
-            return ['inc'] + args
-    elif len(args) == 2:
-        if op == 'jnz':
-            return ['cpy'] + args
-        else:
-            return ['jnz'] + args
-    return inst
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from assembunny import AssembunnyComputer
 
 def run(instructions, initial_a=7):
-    regs = {'a': initial_a, 'b': 0, 'c': 0, 'd': 0}
-    # Make a copy of instructions as they will be modified
-    code = [list(i) for i in instructions]
-    pc = 0
-    
-    while 0 <= pc < len(code):
-        # Optimization: Check for multiplication loop pattern
-        # cpy b c
-        # inc a
-        # dec c
-        # jnz c -2
-        # dec d
-        # jnz d -5
-        if pc + 5 < len(code):
-            i0 = code[pc]
-            i1 = code[pc+1]
-            i2 = code[pc+2]
-            i3 = code[pc+3]
-            i4 = code[pc+4]
-            i5 = code[pc+5]
-            
-            # Check for specific structure in user input (lines 5-10)
-            # 5: cpy b c
-            # 6: inc a
-            # 7: dec c
-            # 8: jnz c -2
-            # 9: dec d
-            # 10: jnz d -5
-            if (i0[0] == 'cpy' and i0[2] == 'c' and
-                i1[0] == 'inc' and i1[1] == 'a' and
-                i2[0] == 'dec' and i2[1] == 'c' and
-                i3[0] == 'jnz' and i3[1] == 'c' and i3[2] == '-2' and
-                i4[0] == 'dec' and i4[1] == 'd' and
-                i5[0] == 'jnz' and i5[1] == 'd' and i5[2] == '-5'):
-                
-                # Perform multiplication: a += b * d
-                # c = 0, d = 0
-                val_b = parse_val(i0[1], regs)
-                val_d = parse_val('d', regs) # current d
-                
-                regs['a'] += val_b * val_d
-                regs['c'] = 0
-                regs['d'] = 0
-                pc += 6
-                continue
-
-        inst = code[pc]
-        op = inst[0]
-        
-        if op == 'cpy':
-            x, y = inst[1], inst[2]
-            if y in regs: # y must be a register
-                regs[y] = parse_val(x, regs)
-        elif op == 'inc':
-            x = inst[1]
-            if x in regs:
-                regs[x] += 1
-        elif op == 'dec':
-            x = inst[1]
-            if x in regs:
-                regs[x] -= 1
-        elif op == 'jnz':
-            x, y = inst[1], inst[2]
-            val_x = parse_val(x, regs)
-            val_y = parse_val(y, regs)
-            if val_x != 0:
-                pc += val_y
-                continue
-        elif op == 'tgl':
-            x = inst[1]
-            offset = parse_val(x, regs)
-            target_idx = pc + offset
-            if 0 <= target_idx < len(code):
-                code[target_idx] = toggle(code[target_idx])
-        
-        pc += 1
-        
-    return regs['a']
+    # tgl rewrites the program as it runs; the engine re-fuses its loops after each one
+    computer = AssembunnyComputer(instructions, {'a': initial_a})
+    computer.run()
+    return computer.registers['a']
 
 def parse_input(lines):
     instructions = []
@@ -1,46 +1,18 @@
 import sys
 import os
 
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from assembunny import AssembunnyComputer, HALT
+
 def check_outputs(instructions, initial_a, limit=50):
-    regs = {'a': initial_a, 'b': 0, 'c': 0, 'd': 0}
-    pc = 0
-    outputs = []
-    
-    # Simple interpreter (no optimize needed for just generating output logic)
-    # But we need 'out' support.
+    # The clock signal must go 0, 1, 0, 1, ... checked as each value comes out
+    computer = AssembunnyComputer(instructions, {'a': initial_a})
     
-    while 0 <= pc < len(instructions) and len(outputs) < limit:
-        inst = instructions[pc]
-        op = inst[0]
-        
-        if op == 'cpy':
-            x, y = inst[1], inst[2]
-            val = int(x) if (isinstance(x, int) or x.lstrip('-').isdigit()) else regs[x]
-            if y in regs: regs[y] = val
-        elif op == 'inc':
-            x = inst[1]
-            if x in regs: regs[x] += 1
-        elif op == 'dec':
-            x = inst[1]
-            if x in regs: regs[x] -= 1
-        elif op == 'jnz':
-            x, y = inst[1], inst[2]
-            val_x = int(x) if (isinstance(x, int) or x.lstrip('-').isdigit()) else regs[x]
-            val_y = int(y) if (isinstance(y, int) or y.lstrip('-').isdigit()) else regs[y]
-            if val_x != 0:
-                pc += val_y
-                continue
-        elif op == 'out':
-            x = inst[1]
-            val = int(x) if (isinstance(x, int) or x.lstrip('-').isdigit()) else regs[x]
-            outputs.append(val)
-            # Verify immediately?
-            expected = (len(outputs) - 1) % 2 == 0 # 0 for 1st (idx 0), 1 for 2nd
-            expected_val = 0 if expected else 1
-            if val != expected_val:
-                return False
-        
-        pc += 1
+    while len(computer.outputs) < limit:
+        if computer.run(until_output=True) == HALT:
+            break
+        if computer.outputs[-1] != (len(computer.outputs) - 1) % 2:
+            return False
         
     return True
 
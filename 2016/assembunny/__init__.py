@@ -0,0 +1 @@
+from .computer import AssembunnyComputer, parse_program, optimize, toggle, HALT, OUTPUT
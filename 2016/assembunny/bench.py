@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from assembunny import AssembunnyComputer, parse_program
+
+YEAR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (label, day, registers, outputs to collect or None to run to halt, also time without fusing)
+RUNS = [
+    ("2016/12 part 1", 12, {}, None, True),
+    ("2016/12 part 2", 12, {'c': 1}, None, False),
+    ("2016/23 part 1", 23, {'a': 7}, None, True),
+    ("2016/23 part 2", 23, {'a': 12}, None, False),
+    ("2016/25 clock, a=158", 25, {'a': 158}, 50, True),
+]
+
+
+def load_day(day):
+    with open(os.path.join(YEAR_DIR, str(day), 'input.txt')) as f:
+        return parse_program(f.read().splitlines())
+
+
+def time_run(program, registers, outputs, fuse):
+    computer = AssembunnyComputer(program, registers, fuse)
+    start = time.perf_counter()
+    if outputs is None:
+        computer.run()
+    else:
+        while len(computer.outputs) < outputs and not computer.halted:
+            computer.run(until_output=True)
+    return computer, time.perf_counter() - start
+
+
+def main():
+    """Cycles (instructions the program executes) vs dispatches (ops the engine ran) per day"""
+    print(f"{'run':<22} {'engine':<7} {'cycles':>13} {'dispatches':>11} {'seconds':>9}")
+    for label, day, registers, outputs, plain in RUNS:
+        program = load_day(day)
+        for fuse in (True, False) if plain else (True,):
+            computer, elapsed = time_run(program, registers, outputs, fuse)
+            engine = 'fused' if fuse else 'plain'
+            print(f"{label:<22} {engine:<7} {computer.cycles:>13,} {computer.dispatches:>11,} {elapsed:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+HALT = 'HALT'
+OUTPUT = 'OUTPUT'
+
+REGISTERS = 'abcd'
+
+# Decoded opcodes. NOP is an instruction made invalid by tgl (e.g. cpy 1 2).
+CPY, INC, DEC, JNZ, TGL, OUT, NOP = range(7)
+OPCODES = {'cpy': CPY, 'inc': INC, 'dec': DEC, 'jnz': JNZ, 'tgl': TGL, 'out': OUT}
+
+# Fused loop idioms, placed on the first instruction of the loop they replace
+ADD, MUL, CLR = range(3)
+
+
+def parse_program(lines):
+    return [line.split() for line in lines if line.strip()]
+
+
+def toggle(inst):
+    # one-arg: inc -> dec, others -> inc
+    # two-arg: jnz -> cpy, others -> jnz
+    op, args = inst[0], inst[1:]
+    if len(args) == 1:
+        return ['dec' if op == 'inc' else 'inc'] + args
+    if len(args) == 2:
+        return ['cpy' if op == 'jnz' else 'jnz'] + args
+    return inst
+
+
+class Decoder:
+    """Turns text instructions into (opcode, x, y) tuples of slots in the register file.
+
+    Constants get read-only slots after the four registers, so every operand
+    is read as R[slot] whether it is a register or a number.
+    """
+
+    def __init__(self):
+        self.constants = []
+
+    def slot(self, arg):
+        if arg in REGISTERS:
+            return REGISTERS.index(arg)
+        value = int(arg)
+        if value not in self.constants:
+            self.constants.append(value)
+        return len(REGISTERS) + self.constants.index(value)
+
+    def decode(self, inst):
+        op = OPCODES.get(inst[0])
+        args = [self.slot(arg) for arg in inst[1:]]
+        if op is None or len(args) != (2 if op in (CPY, JNZ) else 1):
+            return (NOP, 0, 0)
+        if op == CPY and args[1] >= len(REGISTERS):
+            return (NOP, 0, 0)
+        if op in (INC, DEC) and args[0] >= len(REGISTERS):
+            return (NOP, 0, 0)
+        return (op, args[0], args[1] if len(args) > 1 else 0)
+
+
+def step_of(inst):
+    """(register, +1/-1) for an inc/dec, else None"""
+    op, x, _ = inst
+    if op == INC:
+        return x, 1
+    if op == DEC:
+        return x, -1
+    return None
+
+
+def is_constant(values, slot, value):
+    return slot >= len(REGISTERS) and values[slot] == value
+
+
+def match_add(code, values, pc):
+    # inc/dec x, inc/dec y, jnz y -2 (in either order): x += dx * |y|, y = 0
+    if pc + 2 >= len(code):
+        return None
+    first, second = step_of(code[pc]), step_of(code[pc + 1])
+    op, cond, offset = code[pc + 2]
+    if first is None or second is None or op != JNZ or not is_constant(values, offset, -2):
+        return None
+    if first[0] == cond:
+        first, second = second, first
+    (x, dx), (y, dy) = first, second
+    if x == y or y != cond:
+        return None
+    return (ADD, x, dx, y, dy)
+
+
+def match_clear(code, values, pc):
+    # inc/dec y, jnz y -1: y = 0
+    if pc + 1 >= len(code):
+        return None
+    step = step_of(code[pc])
+    op, cond, offset = code[pc + 1]
+    if step is None or op != JNZ or step[0] != cond or not is_constant(values, offset, -1):
+        return None
+    return (CLR, step[0], step[1])
+
+
+def match_mul(code, values, pc):
+    # cpy s t, <add loop on x and t>, inc/dec z, jnz z -5: x += dx * |s| * |z|, t = z = 0
+    if pc + 5 >= len(code):
+        return None
+    op, s, t = code[pc]
+    add = match_add(code, values, pc + 1)
+    step = step_of(code[pc + 4])
+    jop, cond, offset = code[pc + 5]
+    if op != CPY or add is None or step is None or jop != JNZ:
+        return None
+    _, x, dx, counter, dt = add
+    z, dz = step
+    if counter != t or cond != z or not is_constant(values, offset, -5):
+        return None
+    if len({x, t, z}) < 3 or s in (x, t, z):
+        return None
+    return (MUL, x, dx, s, t, dt, z, dz)
+
+
+def optimize(code, values):
+    """Fused loop idiom per pc (or None), for add-, multiply- and clear-loops on any registers.
+
+    A fused op only stands in for the loop when entered at its first
+    instruction and when its counters run down to zero; otherwise the
+    original instructions run. Re-run after every tgl.
+    """
+    fused = [None] * len(code)
+    for pc in range(len(code)):
+        fused[pc] = match_mul(code, values, pc) or match_add(code, values, pc) or match_clear(code, values, pc)
+    return fused
+
+
+class AssembunnyComputer:
+    """Assembunny machine on decoded instructions, with loop idioms fused into single ops.
+
+    cycles counts the instructions the original program executes, fused
+    loops included; dispatches counts what the engine actually ran.
+    """
+
+    def __init__(self, program, registers=None, fuse=True):
+        self.text = [list(inst) for inst in program] # Rewritten by tgl
+        self.decoder = Decoder()
+        self.code = [self.decoder.decode(inst) for inst in self.text]
+        registers = registers or {}
+        self.regs = [registers.get(r, 0) for r in REGISTERS] + self.decoder.constants
+        self.fuse = fuse
+        self.fused = optimize(self.code, self.regs) if fuse else [None] * len(self.code)
+        self.pc = 0
+        self.outputs = []
+        self.halted = False
+        self.cycles = 0
+        self.dispatches = 0
+
+    @property
+    def registers(self):
+        return dict(zip(REGISTERS, self.regs))
+
+    def toggle(self, target):
+        if not 0 <= target < len(self.text):
+            return
+        self.text[target] = toggle(self.text[target])
+        # Toggled operands are already in the constant table
+        self.code[target] = self.decoder.decode(self.text[target])
+        if self.fuse:
+            self.fused[:] = optimize(self.code, self.regs)
+
+    def run(self, until_output=False):
+        """Run until halt (or after one out if until_output). Returns HALT or OUTPUT."""
+        R = self.regs
+        code = self.code
+        fused = self.fused
+        size = len(code)
+        pc = self.pc
+        cycles = 0
+        dispatches = 0
+
+        while 0 <= pc < size:
+            dispatches += 1
+            f = fused[pc]
+            if f is not None:
+                kind = f[0]
+                if kind == MUL:
+                    _, x, dx, s, t, dt, z, dz = f
+                    inner, outer = R[s], R[z]
+                    if inner * dt < 0 and outer * dz < 0:
+                        inner, outer = abs(inner), abs(outer)
+                        R[x] += dx * inner * outer
+                        R[t] = 0
+                        R[z] = 0
+                        cycles += outer * (3 * inner + 3)
+                        pc += 6
+                        continue
+                elif kind == ADD:
+                    _, x, dx, y, dy = f
+                    n = R[y]
+                    if n * dy < 0:
+                        n = abs(n)
+                        R[x] += dx * n
+                        R[y] = 0
+                        cycles += 3 * n
+                        pc += 3
+                        continue
+                else:
+                    _, y, dy = f
+                    n = R[y]
+                    if n * dy < 0:
+                        R[y] = 0
+                        cycles += 2 * abs(n)
+                        pc += 2
+                        continue
+
+            op, x, y = code[pc]
+            cycles += 1
+            if op == JNZ:
+                if R[x] != 0:
+                    pc += R[y]
+                    continue
+            elif op == INC:
+                R[x] += 1
+            elif op == DEC:
+                R[x] -= 1
+            elif op == CPY:
+                R[y] = R[x]
+            elif op == TGL:
+                self.toggle(pc + R[x])
+            elif op == OUT:
+                self.outputs.append(R[x])
+                if until_output:
+                    self.pc = pc + 1
+                    self.cycles += cycles
+                    self.dispatches += dispatches
+                    return OUTPUT
+            pc += 1
+
+        self.pc = pc
+        self.halted = True
+        self.cycles += cycles
+        self.dispatches += dispatches
+        return HALT
@@ -0,0 +1,2 @@
+from .miner import matches, first_match, scan
+from .stretch import StretchedHashes, stretched
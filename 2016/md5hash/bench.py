@@ -0,0 +1,125 @@
+import hashlib
+import importlib.util
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from md5hash import matches, StretchedHashes
+
+PREFIX = 'abcdef'
+ZEROS = 5
+NONCES = 2_000_000
+WORKER_COUNTS = (1, 2, 4)
+
+YEAR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+SALT = 'abc'
+STRETCH = 2016
+INDEXES = 2000
+
+
+def naive(prefix, zeros, stop):
+    # A fresh string and a hex comparison per attempt
+    target = '0' * zeros
+    return [(i, h) for i in range(stop)
+            if (h := hashlib.md5(f"{prefix}{i}".encode()).hexdigest()).startswith(target)]
+
+
+def naive_stretched(salt, index, stretch):
+    h = hashlib.md5(f"{salt}{index}".encode()).hexdigest()
+    for _ in range(stretch):
+        h = hashlib.md5(h.encode()).hexdigest()
+    return h
+
+
+def bench_stretch():
+    """md5s per second filling a window of stretched hashes, per worker count"""
+    total = INDEXES * (STRETCH + 1)
+    print(f"\n{INDEXES:,} indexes, salt {SALT!r}, stretch {STRETCH}")
+    print(f"{'producer':<12} {'workers':>7} {'seconds':>8} {'md5s/s':>11}")
+    start = time.perf_counter()
+    expected = [naive_stretched(SALT, index, STRETCH) for index in range(INDEXES)]
+    elapsed = time.perf_counter() - start
+    print(f"{'naive':<12} {1:>7} {elapsed:>8.3f} {total / elapsed:>11,.0f}")
+    for workers in WORKER_COUNTS:
+        start = time.perf_counter()
+        with StretchedHashes(SALT, STRETCH, workers, chunk=100) as hashes:
+            found = [hashes[index] for index in range(INDEXES)]
+        elapsed = time.perf_counter() - start
+        assert found == expected
+        print(f"{'window':<12} {workers:>7} {elapsed:>8.3f} {total / elapsed:>11,.0f}")
+
+
+def bench_miner():
+    """Hashes per second over the same nonce range, per worker count"""
+    print(f"{os.cpu_count()} CPUs, {NONCES:,} nonces, prefix {PREFIX!r}, {ZEROS} zeros")
+    print(f"{'miner':<12} {'workers':>7} {'matches':>7} {'seconds':>8} {'hashes/s':>11}")
+    start = time.perf_counter()
+    expected = naive(PREFIX, ZEROS, NONCES)
+    elapsed = time.perf_counter() - start
+    print(f"{'naive':<12} {1:>7} {len(expected):>7} {elapsed:>8.3f} {NONCES / elapsed:>11,.0f}")
+    for workers in WORKER_COUNTS:
+        start = time.perf_counter()
+        found = list(matches(PREFIX, ZEROS, stop=NONCES, workers=workers))
+        elapsed = time.perf_counter() - start
+        assert found == expected
+        print(f"{'copy+digest':<12} {workers:>7} {len(found):>7} {elapsed:>8.3f} {NONCES / elapsed:>11,.0f}")
+
+
+def load_day(day):
+    path = os.path.join(YEAR_DIR, str(day), f'day{day}.py')
+    spec = importlib.util.spec_from_file_location(f'day{day}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with open(os.path.join(YEAR_DIR, str(day), 'input.txt')) as f:
+        return module, f.read().strip()
+
+
+def naive_longest(passcode, stats):
+    # A stack of whole paths, each hashed from scratch with the passcode
+    stack = [(0, 0, "")]
+    max_len = 0
+    expanded = 0
+    while stack:
+        x, y, path = stack.pop()
+        if x == 3 and y == 3:
+            max_len = max(max_len, len(path))
+            continue
+        expanded += 1
+        h = hashlib.md5((passcode + path).encode()).hexdigest()
+        for d, dx, dy, c in (('U', 0, -1, h[0]), ('D', 0, 1, h[1]), ('L', -1, 0, h[2]), ('R', 1, 0, h[3])):
+            if c in 'bcdef' and 0 <= x + dx <= 3 and 0 <= y + dy <= 3:
+                stack.append((x + dx, y + dy, path + d))
+    stats['expanded'] = expanded
+    return max_len
+
+
+def bench_paths():
+    """Node expansions per second and peak memory finding 2016/17's longest path"""
+    day17, passcode = load_day(17)
+    print(f"\n2016/17 longest path, passcode {passcode!r}")
+    print(f"{'search':<18} {'length':>6} {'expanded':>9} {'seconds':>8} {'nodes/s':>9} {'peak KiB':>9}")
+    for label, search in (("rehash paths", naive_longest), ("md5 copy, stacks", day17.solve_part2_longest)):
+        stats = {}
+        start = time.perf_counter()
+        length = search(passcode, stats)
+        elapsed = time.perf_counter() - start
+        # Python allocations only; the md5 states themselves live in OpenSSL
+        tracemalloc.start()
+        search(passcode, {})
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        expanded = stats['expanded']
+        print(f"{label:<18} {length:>6} {expanded:>9,} {elapsed:>8.3f} {expanded / elapsed:>9,.0f} {peak / 1024:>9,.1f}")
+
+
+def main():
+    bench_miner()
+    bench_stretch()
+    bench_paths()
+
+
+if __name__ == "__main__":
+    main()
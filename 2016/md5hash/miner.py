@@ -0,0 +1,88 @@
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Nonces per job; a job is one call to scan(), in this process or a worker
+CHUNK = 100_000
+
+# Last three decimal digits of a nonce, zero padded, for nonces of 1000 and up
+TAIL = [b'%03d' % n for n in range(1000)]
+
+# The digits of the nonces below 1000
+SHORT = [b'%d' % n for n in range(1000)]
+
+
+def scan(prefix, zeros, lo, hi):
+    """[(nonce, hexdigest)] for nonces in lo..hi-1 whose md5(prefix + nonce) starts with zeros '0's.
+
+    The prefix is fed to one md5 object and copied per nonce; from 1000 up,
+    the digits above the last three are fed once per thousand as well, so
+    each attempt only adds its last three digits. Digests are compared raw:
+    the hex form starts with zeros '0's when the first zeros // 2 bytes are
+    zero, and for odd zeros the next byte is below 16.
+    """
+    full, half = divmod(zeros, 2)
+    zero_bytes = bytes(full)
+    base = hashlib.md5(prefix)
+    found = []
+
+    nonce = lo
+    while nonce < hi:
+        thousands, tail = divmod(nonce, 1000)
+        if thousands:
+            head = base.copy()
+            head.update(str(thousands).encode())
+            digits = TAIL
+        else:
+            head, digits = base, SHORT
+        end = min(hi - thousands * 1000, 1000)
+        for t in range(tail, end):
+            h = head.copy()
+            h.update(digits[t])
+            digest = h.digest()
+            if digest[:full] == zero_bytes and (not half or digest[full] < 16):
+                found.append((thousands * 1000 + t, h.hexdigest()))
+        nonce = thousands * 1000 + end
+    return found
+
+
+def chunks(start, stop, size):
+    lo = start
+    while stop is None or lo < stop:
+        hi = lo + size if stop is None else min(lo + size, stop)
+        yield lo, hi
+        lo = hi
+
+
+def matches(prefix, zeros, start=0, stop=None, workers=1, chunk=CHUNK):
+    """Yield (nonce, hexdigest) for every nonce from start (up to stop, or
+    forever) whose md5 starts with zeros '0's, in nonce order.
+
+    With workers > 1 the nonce space is sharded into chunks across a process
+    pool, a few chunks ahead of the consumer; results still come out in
+    order. Stop iterating to cancel the outstanding chunks.
+    """
+    if isinstance(prefix, str):
+        prefix = prefix.encode()
+    if workers <= 1:
+        for lo, hi in chunks(start, stop, chunk):
+            yield from scan(prefix, zeros, lo, hi)
+        return
+
+    pool = ProcessPoolExecutor(workers)
+    try:
+        pending = deque()
+        ranges = chunks(start, stop, chunk)
+        for lo, hi in ranges:
+            pending.append(pool.submit(scan, prefix, zeros, lo, hi))
+            if len(pending) < 2 * workers:
+                continue
+            yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def first_match(prefix, zeros, start=0, workers=1):
+    return next(matches(prefix, zeros, start, workers=workers))
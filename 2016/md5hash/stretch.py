@@ -0,0 +1,117 @@
+import hashlib
+import os
+from binascii import hexlify
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Indexes per job; a job is one call to stretch_range(), in this process or a worker
+CHUNK = 1000
+
+# Hex digest plus newline, per index in a memo file
+RECORD = 33
+
+
+def stretched(salt, index, stretch):
+    """md5 of salt + index, rehashed stretch more times, as hex bytes.
+
+    Each round hexlifies the raw digest straight to the bytes the next
+    round hashes, rather than going through a hex str.
+    """
+    h = hexlify(hashlib.md5(f"{salt}{index}".encode()).digest())
+    md5 = hashlib.md5
+    for _ in range(stretch):
+        h = hexlify(md5(h).digest())
+    return h
+
+
+def stretch_range(salt, stretch, lo, hi):
+    return [stretched(salt, index, stretch).decode() for index in range(lo, hi)]
+
+
+class StretchedHashes:
+    """Stretched hashes by index, produced in chunks ahead of the reader.
+
+    Only a sliding window is kept: entries more than keep indexes behind the
+    furthest index asked for are dropped (and recomputed if asked for
+    again). With workers > 1, the chunks after the window are computed
+    across a process pool, 2 * workers of them at a time. With a memo
+    directory, hashes are also kept on disk in a file per (salt, stretch),
+    read back on later runs instead of being recomputed.
+    """
+
+    def __init__(self, salt, stretch=0, workers=1, keep=1000, chunk=CHUNK, memo=None):
+        self.salt = salt
+        self.stretch = stretch
+        self.keep = keep
+        self.chunk = chunk
+        self.window = deque()
+        self.base = 0 # Index of window[0]
+        self.pending = deque() # (lo, hi, future or list) for chunks after the window
+        self.requested = 0 # First index not yet in a chunk
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        self.memo = None
+        self.memoized = 0
+        if memo is not None:
+            os.makedirs(memo, exist_ok=True)
+            self.memo = open(os.path.join(memo, f"{salt}-{stretch}.txt"), 'a+b')
+            self.memoized = self.memo.seek(0, os.SEEK_END) // RECORD
+            self.memo.truncate(self.memoized * RECORD) # Drop a record cut short
+        self.computed = 0 # Hashes not read from the memo
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+        if self.memo:
+            self.memo.close()
+            self.memo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self):
+        # Queue the next chunk, from the memo as far as it goes
+        lo = self.requested
+        hi = lo + self.chunk
+        if self.memo and lo < self.memoized:
+            hi = min(hi, self.memoized)
+            self.memo.seek(lo * RECORD)
+            hashes = self.memo.read((hi - lo) * RECORD).decode().split()
+        elif self.pool:
+            hashes = self.pool.submit(stretch_range, self.salt, self.stretch, lo, hi)
+        else:
+            hashes = None # Computed when it is reached
+        self.pending.append((lo, hi, hashes))
+        self.requested = hi
+
+    def extend(self):
+        # Move the next chunk into the window
+        while len(self.pending) < (2 * self.workers if self.pool else 1):
+            self.request()
+        lo, hi, hashes = self.pending.popleft()
+        if hashes is None:
+            hashes = stretch_range(self.salt, self.stretch, lo, hi)
+        elif not isinstance(hashes, list):
+            hashes = hashes.result()
+        if lo >= self.memoized:
+            self.computed += len(hashes)
+            if self.memo:
+                self.memo.seek(0, os.SEEK_END)
+                self.memo.write("".join(h + "\n" for h in hashes).encode())
+                self.memoized = hi
+        self.window.extend(hashes)
+
+    def __getitem__(self, index):
+        if index < self.base:
+            return stretched(self.salt, index, self.stretch).decode()
+        while index >= self.base + len(self.window):
+            self.extend()
+        oldest = index - self.keep
+        while self.base < oldest:
+            self.window.popleft()
+            self.base += 1
+        return self.window[index - self.base]
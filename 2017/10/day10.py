@@ -1,58 +1,18 @@
 import os
 import sys
 
-
-def knot_hash_round(elements, lengths, pos=0, skip=0):
-    """Perform one round of the knot hash algorithm."""
-    n = len(elements)
-    
-    for length in lengths:
-        # Reverse 'length' elements starting at 'pos'
-        indices = [(pos + i) % n for i in range(length)]
-        values = [elements[i] for i in indices]
-        values.reverse()
-        for i, idx in enumerate(indices):
-            elements[idx] = values[i]
-        
-        pos = (pos + length + skip) % n
-        skip += 1
-    
-    return pos, skip
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from knothash import knot_round, knot_hash
 
 
 def part1(lengths_str, size=256):
     """Simple knot hash - multiply first two elements after one round."""
     lengths = [int(x) for x in lengths_str.split(',')]
     elements = list(range(size))
-    knot_hash_round(elements, lengths)
+    knot_round(elements, lengths)
     return elements[0] * elements[1]
 
 
-def knot_hash(input_str):
-    """Full knot hash producing hex string."""
-    # Convert to ASCII codes and add suffix
-    lengths = [ord(c) for c in input_str.strip()] + [17, 31, 73, 47, 23]
-    
-    elements = list(range(256))
-    pos, skip = 0, 0
-    
-    # 64 rounds
-    for _ in range(64):
-        pos, skip = knot_hash_round(elements, lengths, pos, skip)
-    
-    # Dense hash: XOR each block of 16
-    dense = []
-    for i in range(16):
-        block = elements[i*16:(i+1)*16]
-        xor = 0
-        for v in block:
-            xor ^= v
-        dense.append(xor)
-    
-    # Convert to hex
-    return ''.join(f'{x:02x}' for x in dense)
-
-
 def part2(input_str):
     return knot_hash(input_str)
 
@@ -62,7 +22,7 @@ def run_example():
     lengths_str = "3,4,1,5"
     lengths = [int(x) for x in lengths_str.split(',')]
     elements = list(range(5))
-    knot_hash_round(elements, lengths)
+    knot_round(elements, lengths)
     assert elements[0] * elements[1] == 12
     print("Part 1 example passed!")
     
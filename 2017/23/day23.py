@@ -1,46 +1,20 @@
 import os
 import sys
-from collections import defaultdict
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from duet import DuetComputer, parse_program
 
 
 def parse_instructions(text):
     """Parse program instructions."""
-    return [line.split() for line in text.strip().split('\n') if line.strip()]
-
-
-def get_value(regs, x):
-    """Get value - either register or integer."""
-    try:
-        return int(x)
-    except ValueError:
-        return regs[x]
+    return parse_program(text)
 
 
 def part1(instructions):
     """Count how many times mul is invoked."""
-    regs = defaultdict(int)
-    ip = 0
-    mul_count = 0
-    
-    while 0 <= ip < len(instructions):
-        inst = instructions[ip]
-        op = inst[0]
-        
-        if op == 'set':
-            regs[inst[1]] = get_value(regs, inst[2])
-        elif op == 'sub':
-            regs[inst[1]] -= get_value(regs, inst[2])
-        elif op == 'mul':
-            regs[inst[1]] *= get_value(regs, inst[2])
-            mul_count += 1
-        elif op == 'jnz':
-            if get_value(regs, inst[1]) != 0:
-                ip += get_value(regs, inst[2])
-                continue
-        
-        ip += 1
-    
-    return mul_count
+    computer = DuetComputer(instructions, profile=True)
+    computer.run()
+    return computer.opcode_counts()['mul']
 
 
 def is_prime(n):
@@ -89,3 +63,8 @@ if __name__ == "__main__":
     
     print(f"Part 1: {part1(instructions)}")
     print(f"Part 2: {part2(instructions)}")
+    if '--profile' in sys.argv:
+        computer = DuetComputer(instructions, profile=True)
+        computer.run()
+        for name, count in computer.opcode_counts().most_common():
+            print(f"{name}: {count}")
@@ -0,0 +1 @@
+from .computer import DuetComputer, parse_program, connect, run_until_deadlock, HALT, INPUT, RECOVER, DEADLOCK
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from duet import DuetComputer, parse_program, connect, run_until_deadlock
+
+YEAR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def load_day(day):
+    with open(os.path.join(YEAR_DIR, str(day), 'input.txt')) as f:
+        return parse_program(f.read())
+
+
+def ring(program, programs):
+    machines = [DuetComputer(program, {'p': pid}) for pid in range(programs)]
+    for pid, machine in enumerate(machines):
+        connect(machine, machines[(pid + 1) % programs])
+    status = run_until_deadlock(machines)
+    return machines, status
+
+
+def single(program, **options):
+    computer = DuetComputer(program, **options)
+    status = computer.run()
+    return [computer], status
+
+
+# (label, day, run)
+RUNS = [
+    ("2017/18 part 1", 18, lambda program: single(program, sound=True)),
+    ("2017/18 part 2", 18, lambda program: ring(program, 2)),
+    ("2017/18 ring of 8", 18, lambda program: ring(program, 8)),
+    ("2017/23 part 1", 23, lambda program: single(program)),
+    ("2017/23 profiled", 23, lambda program: single(program, profile=True)),
+]
+
+
+def main():
+    """Instructions executed, values sent and time taken per run"""
+    print(f"{'run':<20} {'status':<9} {'steps':>11} {'sent':>8} {'seconds':>9}")
+    for label, day, run in RUNS:
+        program = load_day(day)
+        start = time.perf_counter()
+        machines, status = run(program)
+        elapsed = time.perf_counter() - start
+        steps = sum(m.steps for m in machines)
+        sent = sum(m.sent for m in machines)
+        print(f"{label:<20} {status:<9} {steps:>11,} {sent:>8,} {elapsed:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
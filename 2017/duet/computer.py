@@ -0,0 +1,163 @@
+from collections import Counter, deque
+
+HALT = 'HALT'
+INPUT = 'INPUT'
+RECOVER = 'RECOVER'
+DEADLOCK = 'DEADLOCK'
+
+# Decoded opcodes, for both the 2017/18 and 2017/23 dialects
+SND, SET, ADD, SUB, MUL, MOD, RCV, JGZ, JNZ = range(9)
+OPCODES = {'snd': SND, 'set': SET, 'add': ADD, 'sub': SUB, 'mul': MUL,
+           'mod': MOD, 'rcv': RCV, 'jgz': JGZ, 'jnz': JNZ}
+NAMES = {op: name for name, op in OPCODES.items()}
+
+
+def parse_program(text):
+    return [line.split() for line in text.strip().splitlines() if line.strip()]
+
+
+class Decoder:
+    """Turns text instructions into (opcode, x, y) tuples of slots in the register file.
+
+    Registers get a slot each in order of appearance, and constants get
+    read-only slots after them, so every operand is read as R[slot].
+    """
+
+    def __init__(self, program):
+        self.registers = []
+        for inst in program:
+            for arg in inst[1:]:
+                if arg.isalpha() and arg not in self.registers:
+                    self.registers.append(arg)
+        self.constants = []
+
+    def slot(self, arg):
+        if arg in self.registers:
+            return self.registers.index(arg)
+        value = int(arg)
+        if value not in self.constants:
+            self.constants.append(value)
+        return len(self.registers) + self.constants.index(value)
+
+    def decode(self, inst):
+        args = [self.slot(arg) for arg in inst[1:]]
+        return (OPCODES[inst[0]], args[0], args[1] if len(args) > 1 else 0)
+
+
+class DuetComputer:
+    """Duet machine on decoded instructions, talking over deque channels.
+
+    snd appends to outputs and rcv pops from inputs; wire outputs of one
+    machine to inputs of another with connect(). In sound mode (2017/18 part
+    1) rcv instead stops with RECOVER when its register is non-zero, and the
+    last sound is outputs[-1]. With profile=True, opcode_counts() tallies
+    the instructions executed by opcode.
+    """
+
+    def __init__(self, program, registers=None, sound=False, profile=False):
+        decoder = Decoder(program)
+        self.code = [decoder.decode(inst) for inst in program]
+        self.names = decoder.registers
+        registers = registers or {}
+        self.regs = [registers.get(r, 0) for r in self.names] + decoder.constants
+        self.sound = sound
+        self.inputs = deque()
+        self.outputs = deque()
+        self.pc = 0
+        self.halted = False
+        self.steps = 0
+        self.sent = 0
+        self.tally = [0] * len(self.code) if profile else None
+
+    @property
+    def registers(self):
+        return dict(zip(self.names, self.regs))
+
+    def opcode_counts(self):
+        counts = Counter()
+        for (op, _, _), n in zip(self.code, self.tally):
+            counts[NAMES[op]] += n
+        return counts
+
+    def run(self):
+        """Run until halt, a rcv with nothing to receive, or (sound mode) a recover.
+
+        Returns HALT, INPUT or RECOVER; a blocked machine resumes at its rcv.
+        """
+        R = self.regs
+        code = self.code
+        size = len(code)
+        tally = self.tally
+        inputs, outputs = self.inputs, self.outputs
+        pc = self.pc
+        steps = 0
+        status = HALT
+
+        while 0 <= pc < size:
+            op, x, y = code[pc]
+            if tally:
+                tally[pc] += 1
+            steps += 1
+            if op == JNZ:
+                if R[x] != 0:
+                    pc += R[y]
+                    continue
+            elif op == JGZ:
+                if R[x] > 0:
+                    pc += R[y]
+                    continue
+            elif op == SET:
+                R[x] = R[y]
+            elif op == ADD:
+                R[x] += R[y]
+            elif op == SUB:
+                R[x] -= R[y]
+            elif op == MUL:
+                R[x] *= R[y]
+            elif op == MOD:
+                R[x] %= R[y]
+            elif op == SND:
+                outputs.append(R[x])
+                self.sent += 1
+            elif self.sound:
+                if R[x] != 0:
+                    pc += 1
+                    status = RECOVER
+                    break
+            elif inputs:
+                R[x] = inputs.popleft()
+            else:
+                steps -= 1 # The rcv runs again once there is input
+                if tally:
+                    tally[pc] -= 1
+                status = INPUT
+                break
+            pc += 1
+
+        self.pc = pc
+        self.steps += steps
+        self.halted = status == HALT
+        return status
+
+
+def connect(sender, receiver):
+    """Make everything sender sends arrive at receiver"""
+    sender.outputs = receiver.inputs
+
+
+def run_until_deadlock(machines):
+    """Run each machine until it blocks, round robin, until none can move.
+
+    Returns HALT if every machine halted, else DEADLOCK (every machine
+    halted or waiting on an empty channel).
+    """
+    while True:
+        progress = False
+        for machine in machines:
+            if machine.halted:
+                continue
+            before = machine.steps
+            machine.run()
+            progress |= machine.steps != before
+        if not progress:
+            return HALT if all(m.halted for m in machines) else DEADLOCK
@@ -0,0 +1,2 @@
+from .knot import knot, knot_round, knot_hash, knot_hash_bytes, knot_hash_many, sparse_hash, dense_hash, key_lengths
+from .regions import count_regions, runs
@@ -0,0 +1,108 @@
+import os
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+from scipy.ndimage import label
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from knothash import knot_hash, knot_hash_many, key_lengths, dense_hash, count_regions
+
+KEY = 'flqrgnkx'
+ROWS = 128
+WORKER_COUNTS = (1, 2, 4)
+
+# Random square grids for the region labeller, half the squares used
+STRESS_SIZES = (1024, 4096)
+
+
+def naive_knot_hash(key):
+    # Index and value lists built for every length
+    lengths = key_lengths(key)
+    elements = list(range(256))
+    pos = skip = 0
+    for _ in range(64):
+        for length in lengths:
+            indices = [(pos + i) % 256 for i in range(length)]
+            values = [elements[i] for i in indices]
+            values.reverse()
+            for i, idx in enumerate(indices):
+                elements[idx] = values[i]
+            pos = (pos + length + skip) % 256
+            skip += 1
+    return dense_hash(elements).hex()
+
+
+def flood_regions(rows, width):
+    # Breadth-first flood over (r, c) tuples
+    seen = set()
+    regions = 0
+    for r0 in range(len(rows)):
+        for c0 in range(width):
+            if rows[r0] >> c0 & 1 and (r0, c0) not in seen:
+                regions += 1
+                seen.add((r0, c0))
+                queue = deque([(r0, c0)])
+                while queue:
+                    r, c = queue.popleft()
+                    for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                        if 0 <= nr < len(rows) and 0 <= nc < width and rows[nr] >> nc & 1 and (nr, nc) not in seen:
+                            seen.add((nr, nc))
+                            queue.append((nr, nc))
+    return regions
+
+
+def scipy_regions(rows, width):
+    packed = np.array([np.frombuffer(row.to_bytes(width // 8, 'little'), np.uint8) for row in rows])
+    return label(np.unpackbits(packed, axis=1, bitorder='little'))[1]
+
+
+def bench_regions():
+    """Regions counted per grid, by flood fill, the scanline labeller and scipy as a check"""
+    random.seed(2017)
+    grids = [("2017/14 example", knot_hash_many([f"{KEY}-{row}" for row in range(ROWS)]), ROWS)]
+    grids += [(f"random {n}x{n}", [random.getrandbits(n) for _ in range(n)], n) for n in STRESS_SIZES]
+    print(f"\n{'grid':<16} {'labeller':<9} {'regions':>9} {'seconds':>8}")
+    for name, rows, width in grids:
+        counters = [("flood", flood_regions), ("scanline", lambda rows, width: count_regions(rows)), ("scipy", scipy_regions)]
+        if width > ROWS:
+            counters = counters[1:]
+        results = set()
+        for label_name, counter in counters:
+            start = time.perf_counter()
+            regions = counter(rows, width)
+            elapsed = time.perf_counter() - start
+            results.add(regions)
+            print(f"{name:<16} {label_name:<9} {regions:>9,} {elapsed:>8.3f}")
+        assert len(results) == 1
+
+
+def bench_hashes():
+    """Knot hashes per second for the 128 rows of a 2017/14 grid"""
+    keys = [f"{KEY}-{row}" for row in range(ROWS)]
+    print(f"{os.cpu_count()} CPUs, {ROWS} keys")
+    print(f"{'hasher':<16} {'workers':>7} {'seconds':>8} {'hashes/s':>9}")
+    start = time.perf_counter()
+    expected = [int(naive_knot_hash(key), 16) for key in keys]
+    elapsed = time.perf_counter() - start
+    print(f"{'index lists':<16} {1:>7} {elapsed:>8.3f} {ROWS / elapsed:>9,.0f}")
+    start = time.perf_counter()
+    assert [int(knot_hash(key), 16) for key in keys] == expected
+    elapsed = time.perf_counter() - start
+    print(f"{'bytearray':<16} {1:>7} {elapsed:>8.3f} {ROWS / elapsed:>9,.0f}")
+    for workers in WORKER_COUNTS:
+        start = time.perf_counter()
+        assert knot_hash_many(keys, workers) == expected
+        elapsed = time.perf_counter() - start
+        print(f"{'knot_hash_many':<16} {workers:>7} {elapsed:>8.3f} {ROWS / elapsed:>9,.0f}")
+
+
+def main():
+    bench_hashes()
+    bench_regions()
+
+
+if __name__ == "__main__":
+    main()
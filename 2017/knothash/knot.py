@@ -0,0 +1,73 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import xor
+
+SUFFIX = [17, 31, 73, 47, 23]
+ROUNDS = 64
+
+
+def knot(elements, lengths, rounds=1, pos=0, skip=0):
+    """Tie the knot over a bytearray (or list) in place. Returns (pos, skip).
+
+    The buffer is kept rotated so the current position is at index 0: each
+    reversal is a prefix slice and each move a rotation by slicing, and the
+    buffer is only turned back to its original orientation at the end.
+    """
+    n = len(elements)
+    buf = elements[pos:] + elements[:pos]
+    moved = 0
+    for _ in range(rounds):
+        for length in lengths:
+            if length > 1:
+                buf[:length] = buf[length - 1::-1]
+            k = (length + skip) % n
+            buf = buf[k:] + buf[:k]
+            moved += k
+            skip += 1
+    pos = (pos + moved) % n
+    elements[:] = buf[n - pos:] + buf[:n - pos]
+    return pos, skip
+
+
+def knot_round(elements, lengths, pos=0, skip=0):
+    """One round of the knot hash algorithm"""
+    return knot(elements, lengths, 1, pos, skip)
+
+
+def key_lengths(key):
+    return list(key.strip().encode()) + SUFFIX
+
+
+def sparse_hash(lengths, size=256, rounds=ROUNDS):
+    elements = bytearray(range(size))
+    knot(elements, lengths, rounds)
+    return elements
+
+
+def dense_hash(sparse):
+    """XOR each block of 16: the 16 bytes of the hash"""
+    return bytes(reduce(xor, sparse[i:i + 16]) for i in range(0, len(sparse), 16))
+
+
+def knot_hash_bytes(key):
+    return dense_hash(sparse_hash(key_lengths(key)))
+
+
+def knot_hash(key):
+    """Full knot hash as a hex string"""
+    return knot_hash_bytes(key).hex()
+
+
+def knot_hash_many(keys, workers=1):
+    """Knot hashes of many keys as a packed bit grid: one int per key, bits
+    in hex order (the first bit of the hash is bit 127).
+
+    With workers > 1 the keys are hashed across a process pool.
+    """
+    if workers <= 1:
+        digests = map(knot_hash_bytes, keys)
+        return [int.from_bytes(d, 'big') for d in digests]
+    keys = list(keys)
+    with ProcessPoolExecutor(workers) as pool:
+        digests = pool.map(knot_hash_bytes, keys, chunksize=max(1, len(keys) // (4 * workers)))
+        return [int.from_bytes(d, 'big') for d in digests]
@@ -0,0 +1,52 @@
+import re
+
+RUN = re.compile('1+')
+
+
+def runs(row):
+    """(start, end) bit spans of the runs of set bits in an int row, lowest first"""
+    return [m.span() for m in RUN.finditer(bin(row)[:1:-1])]
+
+
+def count_regions(rows):
+    """Regions of set bits connected up/down/left/right, in a grid of int rows.
+
+    A scanline labeller: every run of set bits in a row is a node of a
+    union-find, joined to the runs it overlaps in the row above (both lists
+    are in bit order, so a merge walk finds them). The grid can be any
+    width; rows only need to use the same bit for the same column.
+    """
+    parent = []
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+        return x
+
+    regions = 0
+    above = [] # (start, end, node) of the runs in the row above
+    for row in rows:
+        current = []
+        i = 0
+        for start, end in runs(row):
+            node = len(parent)
+            parent.append(node)
+            touching = []
+            # Runs above that end first can't reach any later run in this row
+            while i < len(above) and above[i][1] < end:
+                if above[i][1] > start:
+                    touching.append(above[i][2])
+                i += 1
+            # The next one may reach past this run and touch the next too
+            if i < len(above) and above[i][0] < end:
+                touching.append(above[i][2])
+            # node stays the root of its region as the others join it
+            regions += 1
+            for other in touching:
+                root = find(other)
+                if root != node:
+                    parent[root] = node
+                    regions -= 1
+            current.append((start, end, node))
+        above = current
+    return regions
@@ -2,6 +2,9 @@
 import sys
 import os
 
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cycles import CycleFinder, ShiftHash
+
 def parse_input(filename):
     with open(filename, 'r') as f:
         lines = [l.strip() for l in f.readlines() if l.strip()]
@@ -47,30 +50,25 @@ def step(state, rules):
             
     return new_state
 
-def simulate(initial_state, rules, generations):
+def simulate(initial_state, rules, generations, stats=None):
     state = initial_state.copy()
-    seen = {}
-    
-    # For Part 2 detection
-    prev_sum = sum(state)
-    diffs = []
-    
-    for gen in range(1, generations + 1):
-        state = step(state, rules)
-        current_sum = sum(state)
-        diff = current_sum - prev_sum
-        prev_sum = current_sum
-        
-        # Part 2 heuristic: if diff stabilizes, we can project
-        diffs.append(diff)
-        if len(diffs) > 100:
-            last_100 = diffs[-100:]
-            if all(d == last_100[0] for d in last_100):
-                # Stable difference found!
-                remaining_gens = generations - gen
-                final_sum = current_sum + remaining_gens * diff
-                return final_sum, state
-                
+    # The pots settle into a pattern that moves along as a whole, so
+    # fingerprint the pattern wherever it is and let the sum drift
+    shape = ShiftHash(state)
+    finder = CycleFinder()
+
+    for gen in range(generations):
+        if finder.push(shape.value(min(state, default=0)), sum(state)):
+            if stats is not None:
+                stats.update(index=finder.index, period=finder.period)
+            return finder.extrapolate(generations), state
+        new_state = step(state, rules)
+        for pot in state - new_state:
+            shape.remove(pot)
+        for pot in new_state - state:
+            shape.add(pot)
+        state = new_state
+
     return sum(state), state
 
 def part1(filename):
@@ -78,9 +76,9 @@ def part1(filename):
     result, _ = simulate(state, rules, 20)
     return result
 
-def part2(filename):
+def part2(filename, stats=None):
     state, rules = parse_input(filename)
-    result, _ = simulate(state, rules, 50000000000)
+    result, _ = simulate(state, rules, 50000000000, stats)
     return result
 
 def run_example():
@@ -3,65 +3,19 @@ import sys
 import os
 import re
 
-class CPU:
-    def __init__(self, registers=None):
-        self.regs = [0, 0, 0, 0] if registers is None else list(registers)
-
-    def addr(self, a, b, c):
-        self.regs[c] = self.regs[a] + self.regs[b]
-
-    def addi(self, a, b, c):
-        self.regs[c] = self.regs[a] + b
-
-    def mulr(self, a, b, c):
-        self.regs[c] = self.regs[a] * self.regs[b]
-
-    def muli(self, a, b, c):
-        self.regs[c] = self.regs[a] * b
-
-    def banr(self, a, b, c):
-        self.regs[c] = self.regs[a] & self.regs[b]
-
-    def bani(self, a, b, c):
-        self.regs[c] = self.regs[a] & b
-
-    def borr(self, a, b, c):
-        self.regs[c] = self.regs[a] | self.regs[b]
-
-    def bori(self, a, b, c):
-        self.regs[c] = self.regs[a] | b
-
-    def setr(self, a, b, c):
-        self.regs[c] = self.regs[a]
-
-    def seti(self, a, b, c):
-        self.regs[c] = a
-
-    def gtir(self, a, b, c):
-        self.regs[c] = 1 if a > self.regs[b] else 0
-
-    def gtri(self, a, b, c):
-        self.regs[c] = 1 if self.regs[a] > b else 0
-
-    def gtrr(self, a, b, c):
-        self.regs[c] = 1 if self.regs[a] > self.regs[b] else 0
-
-    def eqir(self, a, b, c):
-        self.regs[c] = 1 if a == self.regs[b] else 0
-
-    def eqri(self, a, b, c):
-        self.regs[c] = 1 if self.regs[a] == b else 0
-
-    def eqrr(self, a, b, c):
-        self.regs[c] = 1 if self.regs[a] == self.regs[b] else 0
-
-    def execute(self, opcode_name, a, b, c):
-        getattr(self, opcode_name)(a, b, c)
-
-ALl_OPCODES = [
-    'addr', 'addi', 'mulr', 'muli', 'banr', 'bani', 'borr', 'bori',
-    'setr', 'seti', 'gtir', 'gtri', 'gtrr', 'eqir', 'eqri', 'eqrr'
-]
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from elfcode import ElfcodeCPU, OPCODES, OPERATIONS
+
+def behaves_like(sample):
+    # Opcodes that turn the sample's before registers into its after registers
+    _, a, b, c = sample['instr']
+    matches = set()
+    for opcode in OPCODES:
+        regs = list(sample['before'])
+        OPERATIONS[opcode](regs, a, b, c)
+        if regs == sample['after']:
+            matches.add(opcode)
+    return matches
 
 def parse_input(filename):
     with open(filename, 'r') as f:
@@ -127,30 +81,17 @@ def parse_input(filename):
 def solve_part1(samples):
     count = 0
     for sample in samples:
-        behave_count = 0
-        for opcode in ALl_OPCODES:
-            cpu = CPU(sample['before'])
-            cpu.execute(opcode, sample['instr'][1], sample['instr'][2], sample['instr'][3])
-            if cpu.regs == sample['after']:
-                behave_count += 1
-        if behave_count >= 3:
+        if len(behaves_like(sample)) >= 3:
             count += 1
     return count
 
 def solve_part2(samples, program):
     # Determine opcode mapping
-    possible_opcodes = {i: set(ALl_OPCODES) for i in range(16)}
+    possible_opcodes = {i: set(OPCODES) for i in range(16)}
     
     for sample in samples:
         op_num = sample['instr'][0]
-        valid_ops = set()
-        for opcode in ALl_OPCODES:
-            cpu = CPU(sample['before'])
-            cpu.execute(opcode, sample['instr'][1], sample['instr'][2], sample['instr'][3])
-            if cpu.regs == sample['after']:
-                valid_ops.add(opcode)
-        
-        possible_opcodes[op_num] &= valid_ops
+        possible_opcodes[op_num] &= behaves_like(sample)
         
     # Reduce possibilities
     mapping = {}
@@ -167,11 +108,8 @@ def solve_part2(samples, program):
                         possible_opcodes[j].discard(op_name)
     
     # Run program
-    cpu = CPU([0, 0, 0, 0])
-    for instr in program:
-        op_name = mapping[instr[0]]
-        cpu.execute(op_name, instr[1], instr[2], instr[3])
-        
+    cpu = ElfcodeCPU([(mapping[op], a, b, c) for op, a, b, c in program], registers=[0, 0, 0, 0])
+    cpu.run()
     return cpu.regs[0]
 
 def part1(filename):
@@ -194,14 +132,8 @@ def run_example():
     }
     
     # Check matching opcodes
-    cpu = CPU([3, 2, 1, 1])
-    matches = []
-    for op in ALl_OPCODES:
-        cpu.regs = list(sample['before'])
-        cpu.execute(op, 2, 1, 2)
-        if cpu.regs == sample['after']:
-            matches.append(op)
-            
+    matches = [op for op in OPCODES if op in behaves_like(sample)]
+
     print(f"Matches for example: {matches}")
     # Description says: mulr, addi, seti matches.
     # My matches should include these.
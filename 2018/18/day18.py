@@ -1,7 +1,14 @@
 
 import sys
 import os
-import copy
+
+import numpy as np
+
+# The automaton engine is shared with 2015/18, 2020/11 and 2021/11
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '2020'))
+from automaton import Automaton, rule_table, from_lines
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cycles import CycleFinder, Zobrist
 
 def parse_input(filename):
     with open(filename, 'r') as f:
@@ -11,104 +18,48 @@ def parse_input(filename):
         grid = [line.rstrip('\n') for line in f.readlines() if line.strip()]
     return grid
 
-def get_adj(grid, x, y):
-    h = len(grid)
-    w = len(grid[0])
-    adj = []
-    trees = 0
-    lumber = 0
-    open_g = 0
-    
-    for dy in [-1, 0, 1]:
-        for dx in [-1, 0, 1]:
-            if dx == 0 and dy == 0:
-                continue
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h:
-                c = grid[ny][nx]
-                if c == '|': trees += 1
-                elif c == '#': lumber += 1
-                elif c == '.': open_g += 1
-                
-    return trees, lumber, open_g
+OPEN, TREES, LUMBER = range(3)
+SYMBOLS = '.|#'
 
-def step(grid):
-    h = len(grid)
-    w = len(grid[0])
-    new_grid = [['' for _ in range(w)] for _ in range(h)]
-    
-    for y in range(h):
-        for x in range(w):
-            c = grid[y][x]
-            trees, lumber, open_g = get_adj(grid, x, y)
-            
-            if c == '.':
-                if trees >= 3:
-                    new_grid[y][x] = '|'
-                else:
-                    new_grid[y][x] = '.'
-            elif c == '|':
-                if lumber >= 3:
-                    new_grid[y][x] = '#'
-                else:
-                    new_grid[y][x] = '|'
-            elif c == '#':
-                if lumber >= 1 and trees >= 1:
-                    new_grid[y][x] = '#'
-                else:
-                    new_grid[y][x] = '.'
-                    
-    return ["".join(row) for row in new_grid]
+def next_acre(acre, trees, lumber):
+    if acre == OPEN:
+        return TREES if trees >= 3 else OPEN
+    if acre == TREES:
+        return LUMBER if lumber >= 3 else TREES
+    return LUMBER if lumber >= 1 and trees >= 1 else OPEN
 
-def resource_value(grid):
-    trees = sum(row.count('|') for row in grid)
-    lumber = sum(row.count('#') for row in grid)
-    return trees * lumber
+# rule[acre, adjacent trees, adjacent lumberyards]
+RULE = rule_table(3, 2, 8, next_acre)
+
+def landscape(grid):
+    return Automaton(from_lines(grid, SYMBOLS), RULE, counted=(TREES, LUMBER))
+
+def resource_value(area):
+    return area.count(TREES) * area.count(LUMBER)
 
 def solve_part1(filename):
-    grid = parse_input(filename)
-    for _ in range(10):
-        grid = step(grid)
-    return resource_value(grid)
+    area = landscape(parse_input(filename))
+    area.run(10)
+    return resource_value(area)
 
-def solve_part2(filename):
-    grid = parse_input(filename)
+def solve_part2(filename, stats=None):
+    area = landscape(parse_input(filename))
     # 1,000,000,000 minutes is too long to simulate directly.
-    # We must find a cycle.
-    
-    seen = {}
-    history = []
-    
+    # Run until the landscape repeats, then extrapolate.
     target = 1000000000
-    
-    for i in range(target):
-        # Convert grid to string or tuple for hashing
-        state = "\n".join(grid)
-        
-        if state in seen:
-            first_seen_at = seen[state]
-            period = i - first_seen_at
-            
-            remaining = target - i
-            offset = remaining % period
-            
-            # The state at target will be same as state at (first_seen_at + offset)
-            # Or just jump ahead
-            
-            final_idx = first_seen_at + offset
-            final_state = history[final_idx]
-            
-            # Convert back to grid if needed, or just count chars in string
-            trees = final_state.count('|')
-            lumber = final_state.count('#')
-            return trees * lumber
-            
-        seen[state] = i
-        history.append(state)
-        
-        grid = step(grid)
-        
-    return resource_value(grid)
+
+    fingerprint = Zobrist(area.grid.size, 3)
+    fingerprint.reset(area.grid.ravel().tolist())
+    finder = CycleFinder()
+    while not finder.push(fingerprint.value, resource_value(area)):
+        before = area.grid.ravel()
+        after = area.step().ravel()
+        changed = np.flatnonzero(before != after)
+        fingerprint.update(changed.tolist(), before[changed].tolist(), after[changed].tolist())
+
+    if stats is not None:
+        stats.update(index=finder.index, period=finder.period)
+    return finder.extrapolate(target)
 
 def run_example():
     ex = """.#.#...|#.
@@ -0,0 +1,2 @@
+from .finder import CycleFinder
+from .fingerprint import Zobrist, ShiftHash
@@ -0,0 +1,97 @@
+import importlib.util
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cycles import CycleFinder
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+# (label, year, day, part 2 call given the module and input path)
+RUNS = [
+    ("2018/12", 2018, 12, lambda day, path, stats: day.part2(path, stats)),
+    ("2018/18", 2018, 18, lambda day, path, stats: day.solve_part2(path, stats)),
+    ("2022/17", 2022, 17, lambda day, path, stats: day.part2(open(path).read(), stats)),
+    ("2023/14", 2023, 14, lambda day, path, stats: day.part2(open(path).read().splitlines(), stats)),
+]
+
+# Synthetic stream: states of STATE_BYTES bytes, a tail of TAIL before a cycle of PERIOD
+STATE_BYTES = 10_000
+TAIL = 20_000
+PERIOD = 3_000
+
+
+def load_day(year, day):
+    path = os.path.join(ROOT, str(year), str(day), f'day{day}.py')
+    spec = importlib.util.spec_from_file_location(f'day_{year}_{day}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module, os.path.join(ROOT, str(year), str(day), 'input.txt')
+
+
+def synthetic(i):
+    """(state, value) at step i"""
+    n = i if i < TAIL else TAIL + (i - TAIL) % PERIOD
+    return n.to_bytes(8, 'little') * (STATE_BYTES // 8), n % 7
+
+
+def seen_dict(target):
+    # Every state kept, keyed on its full contents
+    seen = {}
+    values = []
+    i = 0
+    while True:
+        state, value = synthetic(i)
+        if state in seen:
+            start = seen[state]
+            return values[start + (target - start) % (i - start)]
+        seen[state] = i
+        values.append(value)
+        i += 1
+
+
+def brent(target):
+    finder = CycleFinder()
+    i = 0
+    while True:
+        state, value = synthetic(i)
+        if finder.push(hash(state), value):
+            return finder.extrapolate(target)
+        i += 1
+
+
+def traced(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    """Part 2 of each day on the cycle finder, then full-state dict against
+    the finder on a synthetic stream with large states (timed under tracemalloc)"""
+    print(f"{'run':<10} {'index':>6} {'period':>6} {'seconds':>8} {'peak KiB':>9}")
+    for label, year, day, run in RUNS:
+        module, path = load_day(year, day)
+        stats = {}
+        _, elapsed, peak = traced(lambda: run(module, path, stats))
+        print(f"{label:<10} {stats['index']:>6} {stats['period']:>6} {elapsed:>8.3f} {peak / 1024:>9,.0f}")
+
+    target = 10 ** 9
+    print(f"\n{TAIL:,} + {PERIOD:,} states of {STATE_BYTES:,} bytes")
+    print(f"{'finder':<10} {'seconds':>8} {'peak KiB':>9}")
+    results = set()
+    for name, finder in (("dict", seen_dict), ("brent", brent)):
+        result, elapsed, peak = traced(lambda: finder(target))
+        results.add(result)
+        print(f"{name:<10} {elapsed:>8.3f} {peak / 1024:>9,.0f}")
+    assert len(results) == 1
+
+
+if __name__ == "__main__":
+    main()
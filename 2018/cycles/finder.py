@@ -0,0 +1,41 @@
+class CycleFinder:
+    """Brent's cycle detection over a stream of state fingerprints.
+
+    Push the fingerprints of states 0, 1, 2, ... in turn, each with a value
+    to extrapolate (a height, a load, a sum of positions). Only the
+    fingerprint at the latest power-of-two checkpoint is kept, with the
+    values pushed since it, so no states are stored however long they take
+    to repeat. push() returns the period once the latest state matches the
+    checkpoint; extrapolate() then gives the value at any later state.
+    """
+
+    def __init__(self):
+        self.index = -1 # Of the latest state
+        self.mark = None # Fingerprint at the checkpoint
+        self.mark_index = 0
+        self.values = [] # Pushed since the checkpoint, from it on
+        self.power = 1
+        self.period = None
+
+    def push(self, fingerprint, value):
+        self.index += 1
+        since = self.index - self.mark_index
+        self.values.append(value)
+        if since and fingerprint == self.mark:
+            self.period = since
+            return self.period
+        if not self.index or since == self.power:
+            if self.index:
+                self.power *= 2
+            self.mark = fingerprint
+            self.mark_index = self.index
+            self.values = [value]
+        return None
+
+    def extrapolate(self, target):
+        """Value at state target, from the period that ends at the latest
+        state. Values that drift by the same amount every period (heights,
+        sums of positions that move along) are carried on by that drift."""
+        periods, offset = divmod(target - self.mark_index, self.period)
+        values = self.values
+        return values[offset] + periods * (values[-1] - values[0])
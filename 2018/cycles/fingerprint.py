@@ -0,0 +1,65 @@
+import random
+
+# Modulus of ShiftHash, a Mersenne prime
+MERSENNE = (1 << 61) - 1
+
+
+class Zobrist:
+    """64-bit fingerprint of a grid of cell states.
+
+    The fingerprint is the XOR of a random key per (cell, state), with state
+    0 keyed 0 so an empty grid is 0. Changing a cell XORs its old and new
+    keys in, so a simulation keeps its fingerprint in O(changed cells) a
+    step. Cells are numbered in flat (row-major) order.
+    """
+
+    def __init__(self, cells, states=2, seed=0):
+        rng = random.Random(seed)
+        self.keys = [[0] + [rng.getrandbits(64) for _ in range(states - 1)] for _ in range(cells)]
+        self.value = 0
+
+    def reset(self, states):
+        """Fingerprint from scratch, from the state of every cell in order"""
+        self.value = 0
+        for keys, state in zip(self.keys, states):
+            self.value ^= keys[state]
+        return self.value
+
+    def change(self, cell, old, new):
+        keys = self.keys[cell]
+        self.value ^= keys[old] ^ keys[new]
+        return self.value
+
+    def update(self, cells, old, new):
+        """change() for sequences of cells and their old and new states"""
+        value = self.value
+        keys = self.keys
+        for cell, o, n in zip(cells, old, new):
+            value ^= keys[cell][o] ^ keys[cell][n]
+        self.value = value
+        return value
+
+
+class ShiftHash:
+    """Fingerprint of a set of int positions that is the same for every
+    translated copy of the set.
+
+    Keeps sum(base ** p) mod a 61-bit prime as positions come and go, and
+    divides out base ** lowest when read, lowest being the smallest
+    position in the set.
+    """
+
+    def __init__(self, positions=(), seed=0):
+        self.base = random.Random(seed).randrange(2, MERSENNE - 1)
+        self.total = 0
+        for p in positions:
+            self.add(p)
+
+    def add(self, p):
+        self.total = (self.total + pow(self.base, p, MERSENNE)) % MERSENNE
+
+    def remove(self, p):
+        self.total = (self.total - pow(self.base, p, MERSENNE)) % MERSENNE
+
+    def value(self, lowest):
+        return self.total * pow(self.base, -lowest, MERSENNE) % MERSENNE
@@ -0,0 +1,2 @@
+from .vm import ElfcodeCPU, parse_program, OPCODES, OPERATIONS, HALT, BREAK, BUDGET
+from .lifter import lift, decompile, control_flow_graph
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from elfcode import ElfcodeCPU, parse_program, lift, BREAK
+
+YEAR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (label, day, r0, breakpoints, breaks to run through or None to run to halt, engines)
+RUNS = [
+    ("2018/19 part 1", 19, 0, (), None, ('lifted', 'blocks', 'stepped')),
+    ("2018/19 part 2", 19, 1, (), None, ('lifted',)),
+    ("2018/21 first check", 21, 0, (28,), 1, ('lifted', 'blocks', 'stepped')),
+    ("2018/21 100 checks", 21, 0, (28,), 100, ('lifted', 'blocks', 'stepped')),
+    ("2018/21 10000 checks", 21, 0, (28,), 10000, ('lifted', 'blocks')),
+]
+
+
+def load_day(day):
+    with open(os.path.join(YEAR_DIR, str(day), 'input.txt')) as f:
+        return parse_program(f.read())
+
+
+def time_run(ip_bind, program, r0, breakpoints, breaks, engine):
+    start = time.perf_counter()
+    fused = lift(program, ip_bind) if engine == 'lifted' else None
+    cpu = ElfcodeCPU(program, registers=[r0, 0, 0, 0, 0, 0], ip_bind=ip_bind, breakpoints=breakpoints, fused=fused)
+    if engine == 'stepped':
+        # One pre-resolved op per instruction, no blocks or fused loops
+        seen = 0
+        while 0 <= cpu.ip < len(program):
+            if cpu.ip in cpu.breakpoints and cpu.cycles:
+                seen += 1
+                if seen == breaks:
+                    break
+            cpu.step()
+    else:
+        for _ in range(breaks or 1):
+            if cpu.run() != BREAK:
+                break
+    return cpu, time.perf_counter() - start
+
+
+def main():
+    """Cycles executed and time taken: lifted loop nests, compiled blocks (with
+    only the divide loop fused) and stepping one op at a time"""
+    print(f"{'run':<22} {'engine':<8} {'cycles':>19} {'seconds':>9} {'Mcycles/s':>10}")
+    for label, day, r0, breakpoints, breaks, engines in RUNS:
+        ip_bind, program = load_day(day)
+        for engine in engines:
+            cpu, elapsed = time_run(ip_bind, program, r0, breakpoints, breaks, engine)
+            print(f"{label:<22} {engine:<8} {cpu.cycles:>19,} {elapsed:>9.4f} {cpu.cycles / elapsed / 1e6:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import re
+from collections import namedtuple
+
+from .vm import expression, fuse_divide, match_divide, DIVIDE_LENGTH
+
+# A basic block: instructions start..end inclusive. successors is None when
+# the last instruction jumps to a register value that is not known statically.
+Block = namedtuple('Block', 'start end successors')
+
+COMPARISONS = {'gtir', 'gtri', 'gtrr', 'eqir', 'eqri', 'eqrr'}
+COMMUTATIVE = {'addr', 'mulr', 'banr', 'borr', 'eqrr'}
+
+# Templates for idioms, one (op, a, b, c) per instruction. Names are
+# registers ('ip' is the bound one), '_' matches anything and '@k' is a jump
+# to the k-th instruction of the template (the seti operand k - 1).
+DIVISOR_SUM = [
+    ('seti', 1, '_', 'i'),
+    ('seti', 1, '_', 'j'),
+    ('mulr', 'i', 'j', 't'),
+    ('eqrr', 't', 'n', 't'),
+    ('addr', 't', 'ip', 'ip'),
+    ('addi', 'ip', 1, 'ip'),
+    ('addr', 'i', 'acc', 'acc'),
+    ('addi', 'j', 1, 'j'),
+    ('gtrr', 'j', 'n', 't'),
+    ('addr', 'ip', 't', 'ip'),
+    ('seti', '@2', '_', 'ip'),
+    ('addi', 'i', 1, 'i'),
+    ('gtrr', 'i', 'n', 't'),
+    ('addr', 't', 'ip', 'ip'),
+    ('seti', '@1', '_', 'ip'),
+]
+
+# One round of the 2018/21 hash per byte of x, the next byte coming from the
+# divide loop at offset 10 (see vm.match_divide)
+HASH_LOOP = [
+    ('bani', 'x', 'mask', 'byte'),
+    ('addr', 'h', 'byte', 'h'),
+    ('bani', 'h', 'wrap', 'h'),
+    ('muli', 'h', 'factor', 'h'),
+    ('bani', 'h', 'wrap2', 'h'),
+    ('gtir', 'limit', 'x', 'done'),
+    ('addr', 'done', 'ip', 'ip'),
+    ('addi', 'ip', 1, 'ip'),
+    ('seti', 'exit', '_', 'ip'),
+    ('seti', 0, '_', 'q'),
+]
+HASH_DIVIDE = len(HASH_LOOP)
+HASH_TAIL = [
+    ('setr', 'q', '_', 'x'),
+    ('seti', 'back', '_', 'ip'),
+]
+
+
+def jump_targets(program, ip_bind, ip):
+    """Possible next ips after the instruction at ip (None if unknown)"""
+    name, a, b, c = program[ip]
+    if c != ip_bind:
+        return [ip + 1]
+    reads = []
+    if name not in ('seti', 'gtir', 'eqir'):
+        reads.append(a)
+    if name[-1] == 'r' and name != 'setr':
+        reads.append(b)
+    if all(r == ip_bind for r in reads):
+        # Only the ip itself and immediates: a fixed jump
+        return [eval(expression(name, a, b), {f"r{ip_bind}": ip}) + 1]
+    if name == 'addr' and ip_bind in (a, b):
+        flag = b if a == ip_bind else a
+        if ip > 0 and program[ip - 1][0] in COMPARISONS and program[ip - 1][3] == flag:
+            # Skip the next instruction when a comparison just set the flag
+            return [ip + 1, ip + 2]
+    return None
+
+
+def control_flow_graph(program, ip_bind):
+    """{start: Block} for the program; jumps are writes to the ip register"""
+    size = len(program)
+    exits = [jump_targets(program, ip_bind, ip) for ip in range(size)]
+    leaders = {0}
+    for ip, targets in enumerate(exits):
+        if targets != [ip + 1]:
+            leaders.add(ip + 1)
+            leaders.update(targets or ())
+    leaders = sorted(ip for ip in leaders if 0 <= ip < size)
+
+    cfg = {}
+    for start, following in zip(leaders, leaders[1:] + [size]):
+        end = following - 1
+        targets = exits[end]
+        successors = None if targets is None else [t for t in targets if 0 <= t < size]
+        cfg[start] = Block(start, end, successors)
+    return cfg
+
+
+def loop_heads(cfg):
+    """Starts of blocks jumped back to from later in the program"""
+    heads = set()
+    for block in cfg.values():
+        for target in block.successors or ():
+            if target <= block.start:
+                heads.add(target)
+    return heads
+
+
+def unify(template, program, ip_bind, start, env=None):
+    """Register bindings that make the program at start match template, or None"""
+    if start < 0 or start + len(template) > len(program):
+        return None
+    env = {'ip': ip_bind} if env is None else dict(env)
+    for offset, pattern in enumerate(template):
+        inst = program[start + offset]
+        if pattern[0] != inst[0]:
+            return None
+        orders = [inst[1:]]
+        if inst[0] in COMMUTATIVE:
+            orders.append((inst[2], inst[1], inst[3]))
+        for operands in orders:
+            bound = bind_operands(pattern[1:], operands, start, env)
+            if bound is not None:
+                env = bound
+                break
+        else:
+            return None
+    return env
+
+
+def bind_operands(patterns, operands, start, env):
+    env = dict(env)
+    for pattern, value in zip(patterns, operands):
+        if pattern == '_':
+            continue
+        if isinstance(pattern, int):
+            if value != pattern:
+                return None
+        elif pattern.startswith('@'):
+            if value != start + int(pattern[1:]) - 1:
+                return None
+        elif env.setdefault(pattern, value) != value:
+            return None
+    return env
+
+
+def fuse_divisor_sum(program, ip_bind, start):
+    """acc += every divisor of n, by trial over i, j in 1..n -> O(sqrt n)"""
+    env = unify(DIVISOR_SUM, program, ip_bind, start)
+    if env is None or ip_bind is None:
+        return None
+    i, j, t, n, acc, ip = (env[r] for r in ('i', 'j', 't', 'n', 'acc', 'ip'))
+    if len({i, j, t, n, acc, ip}) < 6:
+        return None
+    # 8n - 1 cycles for the inner loop, 4 around it (3 on the last pass), +1 to enter
+    return [
+        f"if r{n} < 1:",
+        f"    r{ip} = {start}",
+        f"    r{i} = 1",
+        f"    ip = {start + 1}",
+        f"    cycles = 1",
+        f"else:",
+        f"    d = 1",
+        f"    while d * d <= r{n}:",
+        f"        if r{n} % d == 0:",
+        f"            r{acc} += d if d * d == r{n} else d + r{n} // d",
+        f"        d += 1",
+        f"    cycles = 8 * r{n} * r{n} + 4 * r{n}",
+        f"    r{i} = r{j} = r{n} + 1",
+        f"    r{t} = 1",
+        f"    r{ip} = {start + 14}",
+        f"    ip = {start + 15}",
+    ]
+
+
+def fuse_hash_loop(program, ip_bind, start):
+    """The 2018/21 hash of x into h, byte by byte, as a Python loop"""
+    env = unify(HASH_LOOP, program, ip_bind, start)
+    if env is None or ip_bind is None:
+        return None
+    divide = match_divide(program, ip_bind, start + HASH_DIVIDE)
+    tail = start + HASH_DIVIDE + DIVIDE_LENGTH
+    if divide is None or divide[0] != env['q'] or divide[3] != env['x'] or divide[4] != tail:
+        return None
+    env = unify(HASH_TAIL, program, ip_bind, tail, env)
+    if env is None or env['back'] != start - 1 or len({env['x'], env['h'], env['done'], ip_bind}) < 4:
+        return None
+    if ip_bind in (env['byte'], env['q'], divide[1]):
+        return None
+
+    body = [f"cycles = 0", f"while True:"]
+    for offset in range(6):
+        name, a, b, c = program[start + offset]
+        body.append(f"    r{c} = {expression(name, a, b)}")
+    body += [
+        f"    if r{env['done']}:",
+        f"        r{ip_bind} = {env['exit']}",
+        f"        ip = {env['exit'] + 1}",
+        f"        cycles += 8",
+        f"        break",
+        f"    r{env['q']} = 0",
+    ]
+    body += ["    " + line for line in fuse_divide(program, ip_bind, start + HASH_DIVIDE)
+             if not line.startswith(("cycles", "ip"))]
+    body += [
+        f"    cycles += 7 * r{env['q']} + 16",
+        f"    r{env['x']} = r{env['q']}",
+        f"    r{ip_bind} = {start - 1}",
+    ]
+    return body
+
+
+# (idiom, instructions it stands in for)
+IDIOMS = [
+    (fuse_divisor_sum, len(DIVISOR_SUM)),
+    (fuse_hash_loop, len(HASH_LOOP) + DIVIDE_LENGTH + len(HASH_TAIL)),
+]
+
+
+def lift(program, ip_bind):
+    """{ip: (end, body lines)} for ElfcodeCPU(fused=...): known loop nests
+    around the program's loop heads replaced by Python, plus every divide
+    loop, each standing in for the instructions from ip up to end."""
+    cfg = control_flow_graph(program, ip_bind)
+    fused = {}
+    for head in sorted(loop_heads(cfg)):
+        # A nest is entered at its head or at the block falling into it
+        for start in (head - 1, head):
+            for idiom, length in IDIOMS:
+                body = idiom(program, ip_bind, start) if start >= 0 else None
+                if body:
+                    fused[start] = (start + length, body)
+                    break
+    for start in cfg:
+        if start not in fused:
+            body = fuse_divide(program, ip_bind, start)
+            if body:
+                fused[start] = (start + DIVIDE_LENGTH, body)
+    return fused
+
+
+def source(program, ip_bind, ip):
+    # The instruction's expression, with the ip register read as its known value
+    name, a, b, c = program[ip]
+    return re.sub(rf"\br{ip_bind}\b", str(ip), expression(name, a, b))
+
+
+def decompile(program, ip_bind):
+    """Listing of the program by basic block, with jumps written as gotos"""
+    cfg = control_flow_graph(program, ip_bind)
+    lines = []
+    for block in cfg.values():
+        lines.append(f"{block.start}:")
+        for ip in range(block.start, block.end + 1):
+            name, a, b, c = program[ip]
+            if c != ip_bind:
+                lines.append(f"    r{c} = {source(program, ip_bind, ip)}")
+        targets = jump_targets(program, ip_bind, block.end)
+        if targets is None:
+            lines.append(f"    goto {source(program, ip_bind, block.end)} + 1")
+            continue
+        jumps = [f"goto {t}" if 0 <= t < len(program) else "halt" for t in targets]
+        if len(targets) == 2:
+            name, a, b, c = program[block.end]
+            flag = b if a == ip_bind else a
+            lines.append(f"    {jumps[1]} if r{flag} else {jumps[0]}")
+        elif targets[0] != block.end + 1 or jumps[0] == "halt":
+            lines.append(f"    {jumps[0]}")
+    return "\n".join(lines)
@@ -0,0 +1,232 @@
+HALT = 'HALT'
+BREAK = 'BREAK'
+BUDGET = 'BUDGET'
+
+# Opcode -> Python expression for the value written to register C.
+# 'rA'/'rB' read registers, 'A'/'B' are the immediates.
+SEMANTICS = {
+    'addr': 'rA + rB', 'addi': 'rA + B',
+    'mulr': 'rA * rB', 'muli': 'rA * B',
+    'banr': 'rA & rB', 'bani': 'rA & B',
+    'borr': 'rA | rB', 'bori': 'rA | B',
+    'setr': 'rA', 'seti': 'A',
+    'gtir': '1 if A > rB else 0', 'gtri': '1 if rA > B else 0', 'gtrr': '1 if rA > rB else 0',
+    'eqir': '1 if A == rB else 0', 'eqri': '1 if rA == B else 0', 'eqrr': '1 if rA == rB else 0',
+}
+
+OPCODES = list(SEMANTICS)
+
+# Instructions translated into one block at most
+MAX_BLOCK = 100
+
+# Instructions in the divide loop (see match_divide)
+DIVIDE_LENGTH = 8
+
+
+def expression(name, a, b, regs="r{}"):
+    """Python expression for instruction name with operands a, b baked in"""
+    expr = SEMANTICS[name]
+    for token, value in (('rA', regs.format(a)), ('rB', regs.format(b)), ('A', str(a)), ('B', str(b))):
+        expr = expr.replace(token, value)
+    return expr
+
+
+def bind(name, a, b, c):
+    """Pre-resolved operation: a function applying one instruction to a register list"""
+    namespace = {}
+    exec(f"def op(r):\n    r[{c}] = {expression(name, a, b, regs='r[{}]')}", namespace)
+    return namespace['op']
+
+
+# name -> function(registers, a, b, c), for trying opcodes out on samples (2018/16)
+OPERATIONS = {}
+for _name in OPCODES:
+    _namespace = {}
+    exec(f"def {_name}(r, A, B, C):\n    r[C] = {SEMANTICS[_name].replace('rA', 'r[A]').replace('rB', 'r[B]')}", _namespace)
+    OPERATIONS[_name] = _namespace[_name]
+
+
+def parse_program(text):
+    """(ip_bind, [(op, a, b, c)]) from elfcode source with an optional #ip line"""
+    ip_bind = None
+    program = []
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == '#ip':
+            ip_bind = int(parts[1])
+            continue
+        program.append((parts[0], int(parts[1]), int(parts[2]), int(parts[3])))
+    return ip_bind, program
+
+
+def match_divide(program, ip_bind, start):
+    """Find the divide-by-counting loop some programs use for n // K.
+
+        q + 1 -> t; t * K -> t; t > n -> t; ip += t; ip += 1; exit: ip = X; q += 1; ip = start - 1
+
+    Returns (q, t, K, n, exit_ip) or None.
+    """
+    if ip_bind is None or start + DIVIDE_LENGTH > len(program):
+        return None
+    (o1, q, one, t), (o2, t2, k, t3), (o3, t4, n, t5), (o4, t6, p1, p2), (o5, p3, one2, p4), \
+        (o6, x, _, p5), (o7, q2, one3, q3), (o8, back, _, p6) = program[start:start + DIVIDE_LENGTH]
+    p = ip_bind
+    if (o1, o2, o3, o4, o5, o6, o7, o8) != ('addi', 'muli', 'gtrr', 'addr', 'addi', 'seti', 'addi', 'seti'):
+        return None
+    if one != 1 or one2 != 1 or one3 != 1 or k <= 0 or back != start - 1:
+        return None
+    if not (t2 == t3 == t4 == t5 == t6 == t and p1 == p2 == p3 == p4 == p5 == p6 == p and q2 == q3 == q):
+        return None
+    if len({q, t, n, p}) < 4:
+        return None
+    return q, t, k, n, x + 1
+
+
+def fuse_divide(program, ip_bind, start):
+    """Body lines standing in for the divide loop at start, or None.
+
+    The smallest q' >= q with (q' + 1) * K > n, at 7 cycles per count and 5
+    to leave the loop.
+    """
+    divide = match_divide(program, ip_bind, start)
+    if divide is None:
+        return None
+    q, t, k, num, exit_ip = divide
+    return [
+        f"d = r{num} // {k}",
+        f"if (r{q} + 1) * {k} > r{num}: d = r{q}",
+        f"cycles = 7 * (d - r{q}) + 5",
+        f"r{q} = d",
+        f"r{t} = 1",
+        f"r{ip_bind} = {exit_ip - 1}",
+        f"ip = {exit_ip}",
+    ]
+
+
+def fuse(program, ip_bind):
+    """{ip: (end, body lines)} for every fused loop found in program, the
+    loop being the instructions from ip up to end"""
+    fused = {}
+    for ip in range(len(program)):
+        body = fuse_divide(program, ip_bind, ip)
+        if body:
+            fused[ip] = (ip + DIVIDE_LENGTH, body)
+    return fused
+
+
+def translate_block(program, ip_bind, start, stops, nregs, fused):
+    """Python source for the straight-line code at start, up to a write to the ip
+    register, a stop (breakpoint) or the end of the program.
+
+    fused maps ips to the body lines of loops replaced by Python; a body sets
+    ip and cycles, and a block also ends where one starts so the loop is
+    entered through its own block. Returns (source, length) where length is
+    the number of instructions, or None for a fused loop whose cycle count is
+    only known at run time.
+    """
+    regs = ", ".join(f"r{i}" for i in range(nregs))
+    lines = [f"def block(regs):", f"    {regs} = regs"]
+    tail = f"    regs[:] = ({regs},)"
+    ip = start
+    n = 0
+
+    if start in fused:
+        lines += ["    " + line for line in fused[start]]
+        lines += [tail, f"    return ip, cycles"]
+        return "\n".join(lines), None
+
+    while ip < len(program) and n < MAX_BLOCK:
+        name, a, b, c = program[ip]
+        if ip_bind is not None:
+            lines.append(f"    r{ip_bind} = {ip}")
+        lines.append(f"    r{c} = {expression(name, a, b)}")
+        n += 1
+        if c == ip_bind:
+            lines += [tail, f"    return r{ip_bind} + 1, {n}"]
+            return "\n".join(lines), n
+        ip += 1
+        if ip in stops or ip in fused:
+            break
+    lines += [tail, f"    return {ip}, {n}"]
+    return "\n".join(lines), n
+
+
+class ElfcodeCPU:
+    """Elfcode machine running translated blocks, with ip binding, breakpoints and a cycle budget.
+
+    Each instruction is bound to a pre-resolved operation once, and straight
+    runs of instructions are compiled into one Python function. fused maps
+    ips to loops replaced by Python (see fuse() and lifter.lift()). run() stops
+    before executing an instruction at a breakpoint ip; calling run() again
+    executes it and carries on. A fused loop runs its whole range at once, so
+    one with a breakpoint in its range is left to the blocks, which stop there.
+    """
+
+    def __init__(self, program, registers=None, ip_bind=None, breakpoints=(), nregs=6, fused=None):
+        self.program = program
+        self.fused = fuse(program, ip_bind) if fused is None else fused
+        self.regs = [0] * nregs if registers is None else list(registers)
+        self.ip_bind = ip_bind
+        self.ip = 0
+        self.cycles = 0
+        self.ops = [bind(*inst) for inst in program]
+        self.set_breakpoints(breakpoints)
+
+    def set_breakpoints(self, breakpoints):
+        self.breakpoints = set(breakpoints)
+        self.blocks = {} # Blocks end at breakpoints, so rebuild them
+        self.active = {ip: body for ip, (end, body) in self.fused.items()
+                       if not any(ip <= point < end for point in self.breakpoints)}
+
+    def fetch_block(self, ip):
+        block = self.blocks.get(ip)
+        if block is None:
+            source, length = translate_block(self.program, self.ip_bind, ip, self.breakpoints, len(self.regs), self.active)
+            namespace = {}
+            exec(source, namespace)
+            block = self.blocks[ip] = (namespace['block'], length)
+        return block
+
+    def step(self):
+        """Execute the instruction at ip, the plain way"""
+        if self.ip_bind is not None:
+            self.regs[self.ip_bind] = self.ip
+        self.ops[self.ip](self.regs)
+        if self.ip_bind is not None:
+            self.ip = self.regs[self.ip_bind]
+        self.ip += 1
+        self.cycles += 1
+
+    def run(self, max_cycles=None):
+        """Run until the program halts, reaches a breakpoint or has used max_cycles.
+
+        Returns HALT, BREAK or BUDGET.
+        """
+        size = len(self.program)
+        budget = None if max_cycles is None else self.cycles + max_cycles
+        regs = self.regs
+        ip = self.ip
+        first = True
+
+        while 0 <= ip < size:
+            if ip in self.breakpoints and not first:
+                self.ip = ip
+                return BREAK
+            first = False
+            func, length = self.fetch_block(ip)
+            if budget is not None and (length is None or self.cycles + length > budget):
+                # Close to the budget, go one instruction at a time
+                if self.cycles >= budget:
+                    self.ip = ip
+                    return BUDGET
+                self.ip = ip
+                self.step()
+                ip = self.ip
+                continue
+            ip, n = func(regs)
+            self.cycles += n
+
+        self.ip = ip
+        return HALT
@@ -1,97 +1,9 @@
 
 import sys
 import os
-from collections import defaultdict, deque
 
-class IntcodeComputer:
-    def __init__(self, program):
-        self.memory = defaultdict(int)
-        for i, val in enumerate(program):
-            self.memory[i] = val
-        self.pc = 0
-        self.relative_base = 0
-        self.inputs = deque()
-        self.outputs = deque()
-        self.halted = False
-        self.waiting_for_input = False
-
-    def get_addr(self, pos, mode):
-        if mode == 0: return self.memory[pos]
-        elif mode == 1: return pos
-        elif mode == 2: return self.memory[pos] + self.relative_base
-        else: raise ValueError(f"Unknown mode {mode}")
-
-    def get_val(self, pos, mode):
-        return self.memory[self.get_addr(pos, mode)]
-
-    def set_val(self, pos, mode, val):
-        self.memory[self.get_addr(pos, mode)] = val
-
-    def add_input(self, val):
-        self.inputs.append(val)
-        self.waiting_for_input = False
-    
-    def add_ascii_input(self, s):
-        for char in s:
-            self.inputs.append(ord(char))
-        self.inputs.append(10) # Newline if mostly required, check later? Usually yes.
-
-    def has_output(self):
-        return len(self.outputs) > 0
-    
-    def get_output(self):
-        return self.outputs.popleft() if self.outputs else None
-    
-    def get_all_outputs(self):
-        out = list(self.outputs)
-        self.outputs.clear()
-        return out
-
-    def run(self):
-        while True:
-            instr = self.memory[self.pc]
-            opcode = instr % 100
-            modes = [(instr // 100) % 10, (instr // 1000) % 10, (instr // 10000) % 10]
-
-            if opcode == 99:
-                self.halted = True
-                return
-            elif opcode == 1:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], v1 + v2)
-                self.pc += 4
-            elif opcode == 2:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], v1 * v2)
-                self.pc += 4
-            elif opcode == 3:
-                if not self.inputs:
-                    self.waiting_for_input = True
-                    return # Suspends execution waiting for input
-                self.set_val(self.pc + 1, modes[0], self.inputs.popleft())
-                self.pc += 2
-            elif opcode == 4:
-                self.outputs.append(self.get_val(self.pc + 1, modes[0]))
-                self.pc += 2
-            elif opcode == 5:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.pc = v2 if v1 != 0 else self.pc + 3
-            elif opcode == 6:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.pc = v2 if v1 == 0 else self.pc + 3
-            elif opcode == 7:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], 1 if v1 < v2 else 0)
-                self.pc += 4
-            elif opcode == 8:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], 1 if v1 == v2 else 0)
-                self.pc += 4
-            elif opcode == 9:
-                self.relative_base += self.get_val(self.pc + 1, modes[0])
-                self.pc += 2
-            else:
-                raise ValueError(f"Unknown opcode {opcode}")
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from intcode import IntcodeComputer
 
 def parse_grid(outputs):
     grid_str = ''.join(chr(c) for c in outputs)
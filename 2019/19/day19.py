@@ -1,105 +1,34 @@
 
 import sys
 import os
-from collections import defaultdict, deque
 
-class IntcodeComputer:
-    def __init__(self, program):
-        self.memory = defaultdict(int)
-        for i, val in enumerate(program):
-            self.memory[i] = val
-        self.pc = 0
-        self.relative_base = 0
-        self.inputs = deque()
-        self.outputs = deque()
-        self.halted = False
-        self.waiting_for_input = False
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from intcode import CompiledIntcodeComputer
 
-    def get_addr(self, pos, mode):
-        if mode == 0: return self.memory[pos]
-        elif mode == 1: return pos
-        elif mode == 2: return self.memory[pos] + self.relative_base
-        else: raise ValueError(f"Unknown mode {mode}")
+def boot_drone(program):
+    """Run the drone program up to its first request for coordinates.
 
-    def get_val(self, pos, mode):
-        return self.memory[self.get_addr(pos, mode)]
-
-    def set_val(self, pos, mode, val):
-        self.memory[self.get_addr(pos, mode)] = val
-
-    def add_input(self, val):
-        self.inputs.append(val)
-        self.waiting_for_input = False
-
-    def has_output(self):
-        return len(self.outputs) > 0
-    
-    def get_output(self):
-        return self.outputs.popleft() if self.outputs else None
-    
-    def get_all_outputs(self):
-        out = list(self.outputs)
-        self.outputs.clear()
-        return out
-
-    def run(self):
-        while True:
-            instr = self.memory[self.pc]
-            opcode = instr % 100
-            modes = [(instr // 100) % 10, (instr // 1000) % 10, (instr // 10000) % 10]
-
-            if opcode == 99:
-                self.halted = True
-                return
-            elif opcode == 1:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], v1 + v2)
-                self.pc += 4
-            elif opcode == 2:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], v1 * v2)
-                self.pc += 4
-            elif opcode == 3:
-                if not self.inputs:
-                    self.waiting_for_input = True
-                    return # Suspends execution waiting for input
-                self.set_val(self.pc + 1, modes[0], self.inputs.popleft())
-                self.pc += 2
-            elif opcode == 4:
-                self.outputs.append(self.get_val(self.pc + 1, modes[0]))
-                self.pc += 2
-            elif opcode == 5:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.pc = v2 if v1 != 0 else self.pc + 3
-            elif opcode == 6:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.pc = v2 if v1 == 0 else self.pc + 3
-            elif opcode == 7:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], 1 if v1 < v2 else 0)
-                self.pc += 4
-            elif opcode == 8:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], 1 if v1 == v2 else 0)
-                self.pc += 4
-            elif opcode == 9:
-                self.relative_base += self.get_val(self.pc + 1, modes[0])
-                self.pc += 2
-            else:
-                raise ValueError(f"Unknown opcode {opcode}")
+    Returns the machine and a snapshot of it at that point, so every probe
+    restarts from the booted drone instead of building a fresh machine.
+    """
+    computer = CompiledIntcodeComputer(program)
+    computer.run()
+    return computer, computer.snapshot()
 
-def check_point(program, x, y):
-    computer = IntcodeComputer(program)
+def check_point(drone, x, y):
+    computer, booted = drone
+    computer.restore(booted)
     computer.add_input(x)
     computer.add_input(y)
     computer.run()
     return computer.get_output()
 
 def solve_part1(program):
+    drone = boot_drone(program)
     count = 0
     for y in range(50):
         for x in range(50):
-            if check_point(program, x, y):
+            if check_point(drone, x, y):
                 count += 1
     return count
 
@@ -123,12 +52,13 @@ def solve_part2(program):
     # For a given Y, finding the range of X (x_start, x_end) that is in the beam.
     # The beam is continuous in X for a given Y.
     
+    drone = boot_drone(program)
     y = 100
     x = 0
     
     while True:
         # Find start of beam at this Y (assuming beam moves right/down)
-        while check_point(program, x, y) == 0:
+        while check_point(drone, x, y) == 0:
             x += 1
             
         # Beam starts at x.
@@ -164,7 +94,7 @@ def solve_part2(program):
         
         # Note: (x+99, y-99) validity check requires y >= 99.
         
-        if check_point(program, x + 99, y - 99) == 1:
+        if check_point(drone, x + 99, y - 99) == 1:
             # Found it!
             return x * 10000 + (y - 99)
             
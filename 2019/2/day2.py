@@ -2,24 +2,13 @@
 import os
 import sys
 
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from intcode import IntcodeComputer
+
 def run_intcode(memory):
-    memory = list(memory) # copy so we don't mutate the original input list if reused
-    pc = 0
-    while True:
-        opcode = memory[pc]
-        if opcode == 99:
-            break
-        elif opcode == 1:
-            p1, p2, p3 = memory[pc+1], memory[pc+2], memory[pc+3]
-            memory[p3] = memory[p1] + memory[p2]
-            pc += 4
-        elif opcode == 2:
-            p1, p2, p3 = memory[pc+1], memory[pc+2], memory[pc+3]
-            memory[p3] = memory[p1] * memory[p2]
-            pc += 4
-        else:
-            raise ValueError(f"Unknown opcode {opcode} at {pc}")
-    return memory[0]
+    computer = IntcodeComputer(memory) # copies, so the original input list is not mutated
+    computer.run()
+    return computer.memory[0]
 
 def part1(data):
     memory = [int(x) for x in data.split(',')]
@@ -2,109 +2,18 @@
 import sys
 import os
 from collections import defaultdict, deque
-import itertools
 import re
 
-class IntcodeComputer:
-    def __init__(self, program):
-        self.memory = defaultdict(int)
-        for i, val in enumerate(program):
-            self.memory[i] = val
-        self.pc = 0
-        self.relative_base = 0
-        self.inputs = deque()
-        self.outputs = deque()
-        self.halted = False
-        self.waiting_for_input = False
-
-    def get_addr(self, pos, mode):
-        if mode == 0: return self.memory[pos]
-        elif mode == 1: return pos
-        elif mode == 2: return self.memory[pos] + self.relative_base
-        else: raise ValueError(f"Unknown mode {mode}")
-
-    def get_val(self, pos, mode):
-        return self.memory[self.get_addr(pos, mode)]
-
-    def set_val(self, pos, mode, val):
-        self.memory[self.get_addr(pos, mode)] = val
-
-    def add_input(self, val):
-        self.inputs.append(val)
-        self.waiting_for_input = False
-    
-    def add_ascii_input(self, s):
-        for char in s:
-            self.inputs.append(ord(char))
-    
-    def has_output(self):
-        return len(self.outputs) > 0
-    
-    def get_output(self):
-        return self.outputs.popleft() if self.outputs else None
-    
-    def run_until_output_or_input(self):
-        while True:
-            instr = self.memory[self.pc]
-            opcode = instr % 100
-            modes = [(instr // 100) % 10, (instr // 1000) % 10, (instr // 10000) % 10]
-
-            if opcode == 99:
-                self.halted = True
-                return 'HALT'
-            elif opcode == 1:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], v1 + v2)
-                self.pc += 4
-            elif opcode == 2:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], v1 * v2)
-                self.pc += 4
-            elif opcode == 3:
-                if not self.inputs:
-                    self.waiting_for_input = True
-                    return 'INPUT'
-                self.set_val(self.pc + 1, modes[0], self.inputs.popleft())
-                self.pc += 2
-            elif opcode == 4:
-                self.outputs.append(self.get_val(self.pc + 1, modes[0]))
-                self.pc += 2
-                return 'OUTPUT'
-            elif opcode == 5:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.pc = v2 if v1 != 0 else self.pc + 3
-            elif opcode == 6:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.pc = v2 if v1 == 0 else self.pc + 3
-            elif opcode == 7:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], 1 if v1 < v2 else 0)
-                self.pc += 4
-            elif opcode == 8:
-                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
-                self.set_val(self.pc + 3, modes[2], 1 if v1 == v2 else 0)
-                self.pc += 4
-            elif opcode == 9:
-                self.relative_base += self.get_val(self.pc + 1, modes[0])
-                self.pc += 2
-            else:
-                raise ValueError(f"Unknown opcode {opcode}")
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from intcode import CompiledIntcodeComputer
 
 def run_command(computer, cmd):
     if cmd:
         computer.add_ascii_input(cmd + "\n")
     
-    output_chars = []
-    while True:
-        status = computer.run_until_output_or_input()
-        if status == 'OUTPUT':
-            output_chars.append(chr(computer.get_output()))
-        elif status == 'INPUT':
-            break
-        elif status == 'HALT':
-            break
-            
-    return "".join(output_chars)
+    # Runs until the droid asks for the next command (or halts)
+    computer.run()
+    return "".join(map(chr, computer.get_all_outputs()))
 
 def parse_room_name(text):
     for line in text.splitlines():
@@ -143,10 +52,11 @@ def parse_doors(text):
     return doors
 
 def solve(program):
-    computer = IntcodeComputer(program)
+    computer = CompiledIntcodeComputer(program)
     
-    # DFS Mapping
-    visited = set()
+    # BFS Mapping
+    # Every room keeps a snapshot of the droid standing in it, and each door is
+    # tried by restoring that snapshot, so the droid never has to walk back.
     adj = defaultdict(dict) # room -> {dir -> next_room}
     room_items = {} # room -> [item]
     dangerous_items = ["infinite loop", "giant electromagnet", "molten lava", "photons", "escape pod"]
@@ -154,74 +64,40 @@ def solve(program):
     
     out = run_command(computer, "")
     start_room = parse_room_name(out)
+    start = computer.snapshot()
     
     # Identify checkpoint and pressure floor dir
     checkpoint_room = "Security Checkpoint"
     pressure_dir = None
     
-    def dfs(current_room, description):
-        visited.add(current_room)
-        
-        items = parse_items(description)
-        doors = parse_doors(description)
-        room_items[current_room] = [i for i in items if i not in dangerous_items]
+    visited = {start_room}
+    queue = deque([(start_room, out, start)])
+    while queue:
+        current_room, description, snap = queue.popleft()
+        room_items[current_room] = [i for i in parse_items(description) if i not in dangerous_items]
         
-        for d in doors:
-            # Check if we already know where this leads
+        for d in parse_doors(description):
             if d in adj[current_room]:
-                known_next = adj[current_room][d]
-                # If we haven't visited known_next, we should?
-                # But in DFS we usually only traverse edges to unvisited.
-                # However, we must physically move to traverse.
-                
-                # If we already connected it, we assume we visited it or will visit?
-                # Actually, simple DFS on graph:
-                if known_next not in visited:
-                     res = run_command(computer, d)
-                     dfs(known_next, res)
-                     # Backtrack
-                     run_command(computer, reverse_dir[d])
                 continue
             
-            # Unknown edge, explore
+            computer.restore(snap)
             res = run_command(computer, d)
             
             # Check for bounce (pressure floor)
-            if "Alert!" in res or "heavier" in res or "lighter" in res:
-                # We bounced back to current_room (or stayed in Checkpoint)
-                # We know this direction leads to Pressure Floor
-                if current_room == checkpoint_room:
-                    # Found it
-                    pass
-                # Don't recurse, don't backtrack (we were pushed back)
+            if "Alert!" in res:
+                # Pushed back into the checkpoint, this door leads to the pressure floor
+                pressure_dir = d
                 continue
-                
-            next_room = parse_room_name(res)
             
-            if next_room:
-                adj[current_room][d] = next_room
-                adj[next_room][reverse_dir[d]] = current_room
-                
-                if next_room not in visited:
-                    dfs(next_room, res)
-                
-                # Backtrack
-                run_command(computer, reverse_dir[d])
-            else:
-                # Should not happen if normal move
-                pass
-
-    dfs(start_room, out)
+            next_room = parse_room_name(res)
+            adj[current_room][d] = next_room
+            adj[next_room][reverse_dir[d]] = current_room
+            if next_room not in visited:
+                visited.add(next_room)
+                queue.append((next_room, res, computer.snapshot()))
     
     # Mapping done. Now we have exact map.
-    # Collect all safe items.
-    
-    # Re-start for clean state collection
-    # (Or we could have collected during DFS, but state management is trickier)
-    # Fast path: BFS on `adj` to find items.
-    
-    # Build graph for BFS
-    # adj is ready.
+    # Collect all safe items, walking one droid from the start.
     
     def bfs_path(start, target):
         q = deque([(start, [])])
@@ -236,12 +112,7 @@ def solve(program):
                     q.append((neighbor, path + [d]))
         return None
 
-    # Collect items
-    # Start fresh computer?
-    # Actually we can just continue using `computer`? 
-    # It is currently at `start_room` (because DFS backtracked all the way).
-    # Yes, DFS ends at start.
-    
+    computer.restore(start)
     current_loc = start_room
     
     all_safe_items = []
@@ -262,128 +133,31 @@ def solve(program):
     path_to_cp = bfs_path(current_loc, checkpoint_room)
     for move in path_to_cp:
         run_command(computer, move)
-    current_loc = checkpoint_room
-    
-    # Identify pressure floor direction
-    # It's the direction NOT in adj? Or check exits again.
-    # We scanned all doors in DFS. Including the one that bounced.
-    # If the one that bounced wasn't added to `adj`, we need to find which one it was.
-    # Re-scan current output or check missing connections.
-    
-    # Get current description again
-    desc = run_command(computer, "inv") # Just to flush or get status? No inv just lists items.
-    # We need to look implies doors.
-    # `adj[checkpoint_room]` has safe exits.
-    # We need the unsafe one.
-    
-    # Just try all 4 dirs. The one not in adj is likely it, or the one that gives alert.
-    # But if we encountered it in DFS, we didn't add it to adj.
-    
-    all_dirs = ['north', 'south', 'east', 'west']
-    pressure_dir = None
-    
-    # Try dirs not in adj[checkpoint_room]
-    # But wait, parse_doors gave us the list of doors.
-    # DFS iterated them.
-    # If we failed to enter (alert), we didn't add to adj.
-    # So we just need to try the door that is physically there but not map-connected.
-    # Or just try all valid doors from description.
-    
-    # Look to get description
-    look_out = run_command(computer, "look") # Assuming 'look' works? Or just move back and forth?
-    # 'look' is not standard.
-    # We can infer from `adj`.
-    # But we need to know which of the 4 directions IS the pressure floor.
-    # In DFS, we tried all doors.
-    # If we didn't record one, it's because it alerted.
-    # So finding the direction that triggers alert is safe.
     
-    for d in all_dirs:
-        # If we know this leads to a room, skip (safe for efficiency)
-        if d in adj[checkpoint_room]:
-            continue
-            
-        # Try it
-        res = run_command(computer, d)
-        if "Alert" in res or "heavier" in res or "lighter" in res:
-            pressure_dir = d
-            break
-        # If we moved successfully (e.g. into unknown room not found in DFS? Unlikely), go back
-        if parse_room_name(res):
-             run_command(computer, reverse_dir[d])
-             
-    if not pressure_dir:
-        # Maybe we processed all in DFS but didn't mark pressure?
-        # Fallback: try all dirs
-        pass
-
-    # Gray Code
     items = [i[1] for i in all_safe_items]
-    n = len(items)
     
-    # Current state: Holding ALL items.
-    # Try current
-    res = run_command(computer, pressure_dir)
-    if "Analysis complete! You may proceed." in res:
-        return parse_code(res)
-        
-    # Bitmask: 1 = Hold, 0 = Drop
-    # Start: 111...1 (All items held)
-    current_mask = (1 << n) - 1
-    
-    # Gray code usually starts from 0. We are at max.
-    # We can iterate from 0 to 2^n, map to mask, diff with current.
-    # Or just standard gray code sequence relative to current?
-    # Gray code: 0, 1, 3, 2, 6... (change one bit at a time)
-    # We want to visit all 2^n states.
-    
-    # Let's generate standard Gray code sequence 0..(2^n-1)
-    # And convert to set of items to hold.
-    # Then diff with current inventory.
-    
-    gray_codes = []
-    for i in range(1 << n):
-        gray_codes.append(i ^ (i >> 1))
-        
-    # We are currently at mask (1<<n)-1.
-    # We can jump to nearest gray code?
-    # No, just drop all first? NO, dropping all is slow.
-    # We want one op per step.
-    
-    # Just standard Gray code from 0?
-    # Start with all dropped?
-    # Drop all now.
-    for item in items:
-        run_command(computer, f"drop {item}")
-    current_mask = 0
-    
-    # Iterate gray codes
-    for g in gray_codes:
-        if g == 0: continue # Empty, checked? Or just skip.
-        
-        # Diff between current_mask and g
-        diff = current_mask ^ g
-        # Find bit
-        bit = 0
-        while (diff >> bit) & 1 == 0:
-            bit += 1
-        
-        item = items[bit]
-        if (g >> bit) & 1:
-            # New state has bit set -> Take
-            run_command(computer, f"take {item}")
-        else:
-            # New state has bit unset -> Drop
-            run_command(computer, f"drop {item}")
-            
-        current_mask = g
-        
-        # Try
+    # Depth-first over the items to put down, starting from holding them all.
+    # Each set held is a snapshot of the droid at the checkpoint. When the floor
+    # finds us too light, dropping anything more only makes it worse, so that
+    # branch is not extended.
+    def search(snap, first):
+        computer.restore(snap)
         res = run_command(computer, pressure_dir)
         if "Analysis complete! You may proceed." in res:
             return parse_code(res)
-            
-    return "Failed"
+        if "heavier" in res:
+            # Droids on this ship are heavier than the detected value
+            return None
+        
+        for i in range(first, len(items)):
+            computer.restore(snap)
+            run_command(computer, f"drop {items[i]}")
+            code = search(computer.snapshot(), i + 1)
+            if code:
+                return code
+        return None
+
+    return search(computer.snapshot(), 0) or "Failed"
 
 def parse_code(text):
     match = re.search(r'\d+', text)
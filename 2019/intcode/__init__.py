@@ -0,0 +1,3 @@
+from .computer import IntcodeComputer, Snapshot, parse_program, HALT, INPUT, OUTPUT
+from .compiler import CompiledIntcodeComputer
+from .network import Network
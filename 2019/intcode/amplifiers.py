@@ -0,0 +1,105 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .computer import IntcodeComputer
+
+# Phase settings handed to a worker at a time
+BATCH_SIZE = 64
+
+# The booted amplifier in a worker process, set by load_program()
+BOOT = None
+
+
+def phase_space(values, amps=None):
+    """Every phase setting for a chain of amps.
+
+    Permutations of values, as in the puzzle, while there are enough values
+    to go round; a longer chain gets every assignment with repeats.
+    """
+    values = tuple(values)
+    amps = len(values) if amps is None else amps
+    if amps <= len(values):
+        return itertools.permutations(values, amps)
+    return itertools.product(values, repeat=amps)
+
+
+def load_program(program):
+    """Boot one amplifier to fork every other one from: run it up to its
+    first input request, where it waits for its phase"""
+    global BOOT
+    BOOT = IntcodeComputer(program, name="Amp")
+    BOOT.run()
+    BOOT.snapshot() # Forks share its pages
+
+
+def chain_signal(amp, booted, phases):
+    # Amps in series: one machine, restored to the booted state for each amp
+    signal = 0
+    for phase in phases:
+        amp.restore(booted)
+        amp.add_inputs((phase, signal))
+        amp.run()
+        signal = amp.get_output()
+    return signal
+
+
+def feedback_signal(boot, phases):
+    # Amps in a loop, each forked from the booted machine. The ring is fixed,
+    # so each amp simply runs in turn until it needs input; the asyncio
+    # scheduler (see network.py) would cost over twice as long per loop.
+    amps = []
+    for i, phase in enumerate(phases):
+        amp = boot.fork()
+        amp.name = f"Amp{i}"
+        amp.add_input(phase)
+        amps.append(amp)
+    amps[0].add_input(0)
+    signal = None
+    while not amps[-1].halted:
+        for i, amp in enumerate(amps):
+            amp.run()
+            out = amp.get_all_outputs()
+            amps[(i + 1) % len(amps)].add_inputs(out)
+            if out and i == len(amps) - 1:
+                signal = out[-1]
+    return signal
+
+
+def evaluate(batch, feedback=False):
+    """[(phases, signal)] for a batch of phase settings, using the booted amplifier"""
+    if feedback:
+        signals = [feedback_signal(BOOT, phases) for phases in batch]
+    else:
+        amp = BOOT.fork()
+        booted = amp.snapshot()
+        signals = [chain_signal(amp, booted, phases) for phases in batch]
+    return list(zip(batch, signals))
+
+
+def batches(items, size):
+    items = iter(items)
+    while batch := list(itertools.islice(items, size)):
+        yield batch
+
+
+def sweep(program, phase_settings, feedback=False, workers=1, batch_size=BATCH_SIZE):
+    """Yield (phases, signal) for every phase setting as its batch finishes.
+
+    With workers > 1 the batches go to a process pool. The parsed program
+    reaches each worker once, through the pool initializer, and the worker
+    boots it a single time and forks every amp from that machine.
+    """
+    if workers <= 1:
+        load_program(program)
+        for batch in batches(phase_settings, batch_size):
+            yield from evaluate(batch, feedback)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=load_program, initargs=(program,)) as pool:
+        futures = [pool.submit(evaluate, batch, feedback) for batch in batches(phase_settings, batch_size)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def best_signal(program, phase_settings, feedback=False, workers=1):
+    return max(signal for _, signal in sweep(program, phase_settings, feedback, workers))
@@ -0,0 +1,371 @@
+import asyncio
+import itertools
+import os
+import sys
+import time
+from collections import defaultdict, deque
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from intcode import IntcodeComputer, CompiledIntcodeComputer, Network, parse_program
+from intcode.amplifiers import phase_space, sweep
+from intcode.computer import PAGE_SIZE
+
+YEAR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class LegacyIntcodeComputer:
+    """The defaultdict-backed interpreter every day used to carry (from 2019/9), kept as the baseline"""
+
+    def __init__(self, program):
+        self.memory = defaultdict(int)
+        for i, val in enumerate(program):
+            self.memory[i] = val
+        self.pc = 0
+        self.relative_base = 0
+        self.inputs = deque()
+        self.outputs = deque()
+        self.halted = False
+        self.steps = 0
+
+    def get_addr(self, pos, mode):
+        if mode == 0: return self.memory[pos]
+        elif mode == 1: return pos
+        elif mode == 2: return self.memory[pos] + self.relative_base
+        else: raise ValueError(f"Unknown mode {mode}")
+
+    def get_val(self, pos, mode):
+        return self.memory[self.get_addr(pos, mode)]
+
+    def set_val(self, pos, mode, val):
+        self.memory[self.get_addr(pos, mode)] = val
+
+    def add_input(self, val):
+        self.inputs.append(val)
+
+    def run(self):
+        while True:
+            instr = self.memory[self.pc]
+            opcode = instr % 100
+            modes = [(instr // 100) % 10, (instr // 1000) % 10, (instr // 10000) % 10]
+            self.steps += 1
+
+            if opcode == 99:
+                self.steps -= 1
+                self.halted = True
+                return
+            elif opcode == 1:
+                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
+                self.set_val(self.pc + 3, modes[2], v1 + v2)
+                self.pc += 4
+            elif opcode == 2:
+                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
+                self.set_val(self.pc + 3, modes[2], v1 * v2)
+                self.pc += 4
+            elif opcode == 3:
+                if not self.inputs:
+                    self.steps -= 1
+                    return
+                self.set_val(self.pc + 1, modes[0], self.inputs.popleft())
+                self.pc += 2
+            elif opcode == 4:
+                self.outputs.append(self.get_val(self.pc + 1, modes[0]))
+                self.pc += 2
+            elif opcode == 5:
+                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
+                self.pc = v2 if v1 != 0 else self.pc + 3
+            elif opcode == 6:
+                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
+                self.pc = v2 if v1 == 0 else self.pc + 3
+            elif opcode == 7:
+                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
+                self.set_val(self.pc + 3, modes[2], 1 if v1 < v2 else 0)
+                self.pc += 4
+            elif opcode == 8:
+                v1, v2 = self.get_val(self.pc + 1, modes[0]), self.get_val(self.pc + 2, modes[1])
+                self.set_val(self.pc + 3, modes[2], 1 if v1 == v2 else 0)
+                self.pc += 4
+            elif opcode == 9:
+                self.relative_base += self.get_val(self.pc + 1, modes[0])
+                self.pc += 2
+            else:
+                raise ValueError(f"Unknown opcode {opcode}")
+
+
+def load_day(day):
+    with open(os.path.join(YEAR_DIR, str(day), 'input.txt')) as f:
+        return parse_program(f.read())
+
+
+def time_machine(factory, program, inputs):
+    computer = factory(program)
+    for val in inputs:
+        computer.add_input(val)
+    start = time.perf_counter()
+    computer.run()
+    elapsed = time.perf_counter() - start
+    return computer.outputs[-1], computer.steps, elapsed
+
+
+def bench_interpreter():
+    """Instructions/sec on 2019/9's sensor boost (input 2), legacy vs shared engine"""
+    program = load_day(9)
+    print("2019/9 sensor boost")
+    print(f"{'engine':<12} {'instructions':>13} {'seconds':>9} {'instr/sec':>12}")
+    results = {}
+    for label, factory in [('legacy', LegacyIntcodeComputer), ('shared', IntcodeComputer)]:
+        out, steps, elapsed = time_machine(factory, program, [2])
+        results[label] = (out, elapsed)
+        print(f"{label:<12} {steps:>13,} {elapsed:>9.3f} {steps / elapsed:>12,.0f}")
+    assert results['legacy'][0] == results['shared'][0]
+    print(f"speedup: {results['legacy'][1] / results['shared'][1]:.2f}x")
+
+
+def bench_compiled():
+    """Interpreter vs translated blocks: one long run (2019/9) and many short ones (2019/19)"""
+    program = load_day(9)
+    print("2019/9 sensor boost")
+    print(f"{'engine':<12} {'instructions':>13} {'seconds':>9} {'instr/sec':>12}")
+    for label, factory in [('interpreter', IntcodeComputer), ('compiled', CompiledIntcodeComputer)]:
+        out, steps, elapsed = time_machine(factory, program, [2])
+        print(f"{label:<12} {steps:>13,} {elapsed:>9.3f} {steps / elapsed:>12,.0f}")
+
+    program = load_day(19)
+    print("2019/19 fresh machine per point, 50x50 scan")
+    print(f"{'engine':<12} {'instructions':>13} {'seconds':>9} {'instr/sec':>12}")
+    for label, factory in [('interpreter', IntcodeComputer), ('compiled', CompiledIntcodeComputer)]:
+        steps = 0
+        start = time.perf_counter()
+        for y in range(50):
+            for x in range(50):
+                computer = factory(program)
+                computer.add_inputs((x, y))
+                computer.run()
+                steps += computer.steps
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {steps:>13,} {elapsed:>9.3f} {steps / elapsed:>12,.0f}")
+
+
+def bench_snapshot():
+    """Memory held per paused droid when 2019/15's whole maze is a BFS frontier of snapshots"""
+    program = load_day(15)
+    computer = IntcodeComputer(program)
+    dx = {1: 0, 2: 0, 3: -1, 4: 1}
+    dy = {1: -1, 2: 1, 3: 0, 4: 0}
+    seen = {(0, 0)}
+    snapshots = [computer.snapshot()]
+    queue = deque([((0, 0), snapshots[0])])
+    start = time.perf_counter()
+    while queue:
+        (x, y), snap = queue.popleft()
+        for move in dx:
+            pos = (x + dx[move], y + dy[move])
+            if pos in seen:
+                continue
+            seen.add(pos)
+            computer.restore(snap)
+            computer.add_input(move)
+            computer.run()
+            if computer.get_output():
+                snapshots.append(computer.snapshot())
+                queue.append((pos, snapshots[-1]))
+    elapsed = time.perf_counter() - start
+
+    pages = {id(page): page for snap in snapshots for page in snap.pages}
+    shared = sum(sys.getsizeof(page) for page in pages.values())
+    shared += sum(sys.getsizeof(snap.pages) for snap in snapshots)
+    full = sys.getsizeof(list(computer.memory))
+    print(f"2019/15 maze: {len(snapshots)} snapshots of {len(computer.memory)} words in {elapsed:.3f}s")
+    print(f"{'storage':<12} {'bytes/snapshot':>15} {'total':>12}")
+    print(f"{'full copy':<12} {full:>15,} {full * len(snapshots):>12,}")
+    print(f"{'pages':<12} {shared // len(snapshots):>15,} {shared:>12,}")
+    print(f"{len(pages)} distinct pages of {PAGE_SIZE} words, memory saving {full * len(snapshots) / shared:.1f}x")
+
+
+def round_robin_nat(program):
+    """2019/23 part 2 the way it ran before the scheduler: every NIC gets a turn each round"""
+    computers = [IntcodeComputer(program, name=f"NIC{i}") for i in range(50)]
+    for i, comp in enumerate(computers):
+        comp.add_input(i)
+    nat_packet = None
+    last_y = None
+    while True:
+        idle_network = True
+        for comp in computers:
+            if not comp.inputs:
+                comp.add_input(-1)
+            else:
+                idle_network = False
+            comp.run()
+            while len(comp.outputs) >= 3:
+                idle_network = False
+                addr, x, y = comp.outputs.popleft(), comp.outputs.popleft(), comp.outputs.popleft()
+                if addr == 255:
+                    nat_packet = (x, y)
+                else:
+                    computers[addr].add_inputs((x, y))
+        if idle_network and nat_packet:
+            if last_y == nat_packet[1]:
+                return last_y, sum(comp.steps for comp in computers)
+            last_y = nat_packet[1]
+            computers[0].add_inputs(nat_packet)
+
+
+def scheduled_nat(program):
+    """2019/23 part 2 on the asyncio scheduler, NAT woken by the scheduler's idle flag"""
+    nat_packet = None
+
+    def route(network, node):
+        nonlocal nat_packet
+        out = node.machine.outputs
+        while len(out) >= 3:
+            addr, x, y = out.popleft(), out.popleft(), out.popleft()
+            if addr == 255:
+                nat_packet = (x, y)
+            else:
+                network.deliver(addr, (x, y))
+
+    async def watch_idle():
+        last_y = None
+        while True:
+            await network.idle.wait()
+            if nat_packet is None:
+                network.idle.clear()
+                continue
+            if last_y == nat_packet[1]:
+                network.stop(last_y)
+                return
+            last_y = nat_packet[1]
+            network.deliver(0, nat_packet)
+
+    computers = [IntcodeComputer(program, name=f"NIC{i}") for i in range(50)]
+    for i, comp in enumerate(computers):
+        comp.add_input(i)
+    network = Network(computers, route, poll=-1)
+    y = asyncio.run(network.run(watch_idle()))
+    return y, sum(node.steps for node in network.nodes)
+
+
+def round_robin_amps(program):
+    """2019/7 part 2 feedback loops, amps polled in turn"""
+    best = 0
+    steps = 0
+    for phases in itertools.permutations(range(5, 10)):
+        amps = [IntcodeComputer(program) for _ in phases]
+        for amp, phase in zip(amps, phases):
+            amp.add_input(phase)
+        amps[0].add_input(0)
+        last = 0
+        while not amps[-1].halted:
+            for i, amp in enumerate(amps):
+                amp.run()
+                out = amp.get_all_outputs()
+                amps[(i + 1) % len(amps)].add_inputs(out)
+                if i == len(amps) - 1 and out:
+                    last = out[-1]
+        best = max(best, last)
+        steps += sum(amp.steps for amp in amps)
+    return best, steps
+
+
+def scheduled_amps(program):
+    """2019/7 part 2 with all 120 feedback loops sharing one scheduler"""
+    steps = 0
+
+    async def loop(phases):
+        nonlocal steps
+        amps = [IntcodeComputer(program) for _ in phases]
+        for amp, phase in zip(amps, phases):
+            amp.add_input(phase)
+        signals = []
+
+        def route(network, node):
+            out = node.machine.get_all_outputs()
+            if node.address == len(amps) - 1:
+                signals.extend(out)
+            network.deliver((node.address + 1) % len(amps), out)
+
+        network = Network(amps, route)
+        network.deliver(0, [0])
+        await network.run()
+        steps += sum(amp.steps for amp in amps)
+        return signals[-1]
+
+    async def sweep():
+        return max(await asyncio.gather(*(loop(p) for p in itertools.permutations(range(5, 10)))))
+
+    return asyncio.run(sweep()), steps
+
+
+def bench_network():
+    """Round-robin polling vs the asyncio scheduler on 2019/23's NAT and 2019/7's feedback loops"""
+    for day, title, runners in [
+        (23, "2019/23 NAT network, part 2", [('round-robin', round_robin_nat), ('scheduler', scheduled_nat)]),
+        (7, "2019/7 feedback loops, part 2", [('round-robin', round_robin_amps), ('scheduler', scheduled_amps)]),
+    ]:
+        program = load_day(day)
+        print(title)
+        print(f"{'loop':<12} {'answer':>10} {'instructions':>13} {'seconds':>9}")
+        for label, runner in runners:
+            start = time.perf_counter()
+            answer, steps = runner(program)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<12} {answer:>10} {steps:>13,} {elapsed:>9.3f}")
+
+
+def bench_amplifiers():
+    """2019/7 phase sweeps beyond the puzzle's size, by number of pool workers"""
+    program = load_day(7)
+    workers = sorted({1, 2, 4, os.cpu_count() or 1})
+    for title, values, amps, feedback in [
+        ("6 amps in series, phases 0-4 with repeats", range(5), 6, False),
+        ("5 amps in a feedback loop, phases 5-9", range(5, 10), 5, True),
+    ]:
+        print(f"2019/7 {title}: {len(list(phase_space(values, amps))):,} settings, {os.cpu_count()} CPUs")
+        print(f"{'workers':<8} {'best signal':>16} {'seconds':>9} {'settings/sec':>13} {'speedup':>8}")
+        base = None
+        for count in workers:
+            start = time.perf_counter()
+            results = list(sweep(program, phase_space(values, amps), feedback, count))
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            best = max(signal for _, signal in results)
+            print(f"{count:<8} {best:>16,} {elapsed:>9.3f} {len(results) / elapsed:>13,.0f} {base / elapsed:>7.2f}x")
+
+
+def run_examples():
+    """Compiled machines against the interpreter on self-modifying programs"""
+    # (program, [(machine, input or None, all its outputs so far)]), the
+    # machines on one image being run in turn
+    examples = [
+        # Reads a word into its own output operand
+        ([3, 6, 1105, 1, 5, 104, 7, 99], [(0, 7, [7])]),
+        # B attaches, A publishes the output block, then B patches the word
+        # that block baked in
+        ([3, 6, 1105, 1, 5, 104, 7, 99], [(1, None, []), (0, 7, [7]), (1, 9, [9])]),
+    ]
+    for program, runs in examples:
+        for factory in (IntcodeComputer, CompiledIntcodeComputer):
+            machines = {}
+            for index, val, expected in runs:
+                computer = machines.setdefault(index, factory(program))
+                if val is not None:
+                    computer.add_input(val)
+                computer.run()
+                assert list(computer.outputs) == expected, (factory.__name__, program, index)
+    print(f"{len(examples)} examples match the interpreter")
+
+
+BENCHMARKS = {
+    'examples': run_examples,
+    'interpreter': bench_interpreter,
+    'compiled': bench_compiled,
+    'snapshot': bench_snapshot,
+    'network': bench_network,
+    'amplifiers': bench_amplifiers,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -0,0 +1,428 @@
+from .computer import IntcodeComputer, ARITY, DECODE, HALT, INPUT, OUTPUT
+
+GROW = 'GROW'
+
+# Longest run of instructions translated into one block
+MAX_BLOCK = 200
+
+# Translated variants kept per block start, for code whose opcodes get patched.
+# A start patched beyond this is left to the interpreter.
+MAX_VARIANTS = 16
+
+# Program image -> Translation, shared by every machine running that program
+TRANSLATIONS = {}
+
+
+class Block:
+    """One translated block: the function plus the words it was built from.
+
+    Words at live addresses are read from memory by the function instead of
+    being baked into it, so they are stored as None and not covered.
+    """
+
+    def __init__(self, start, end, words, live, func, steps_at):
+        self.start = start
+        self.end = end
+        self.words = words
+        self.live = live
+        self.func = func
+        self.steps_at = steps_at # pc inside the block -> instructions already done
+        self.serial = None # Order of publication into the shared map, if published
+
+    def matches(self, mem):
+        seg = mem[self.start:self.end]
+        for addr in self.live:
+            seg[addr - self.start] = None
+        return seg == self.words
+
+    def cover(self, code_map):
+        code_map[self.start:self.end] = b'\x01' * (self.end - self.start)
+        for addr in self.live:
+            code_map[addr] = 0
+
+
+class Translation:
+    """Basic blocks translated for one program image.
+
+    blocks/code_map hold the blocks that match the unpatched image; machines
+    that have never patched their code run straight off them. variants keeps
+    every translation per start pc for patched machines. Parameter words that
+    get patched (e.g. return addresses written into jump operands) become live,
+    and blocks translated from then on read them at run time.
+    """
+
+    def __init__(self, image):
+        self.image = list(image)
+        self.blocks = {}
+        self.code_map = bytearray(len(image))
+        self.published = 0
+        self.variants = {}
+        self.interpreted = set()
+        self.live = set()
+
+    def variant_at(self, mem, pc):
+        """A block for pc built from the words the machine's memory holds now"""
+        for block in self.variants.get(pc, ()):
+            if block.matches(mem):
+                return block
+        return None
+
+    def add_variant(self, block):
+        variants = self.variants.setdefault(block.start, [])
+        variants.append(block)
+        if len(variants) >= MAX_VARIANTS:
+            # Rewritten too often to be worth translating
+            self.interpreted.add(block.start)
+
+    def publish(self, block):
+        """Share block with unpatched machines if it matches the image"""
+        if not block.matches(self.image):
+            return False
+        block.serial = self.published
+        self.published += 1
+        self.blocks[block.start] = block
+        block.cover(self.code_map)
+        return True
+
+    def make_live(self, addr):
+        """Stop baking the parameter word at addr into translations"""
+        self.live.add(addr)
+        for start, variants in self.variants.items():
+            self.variants[start] = [b for b in variants if not b.start <= addr < b.end]
+        for block in [b for b in self.blocks.values() if b.start <= addr < b.end]:
+            del self.blocks[block.start]
+        # Rebuilt in place, machines running off the shared map hold this object
+        self.code_map[:] = bytes(len(self.code_map))
+        for block in self.blocks.values():
+            block.cover(self.code_map)
+
+
+def operand(mode, param, addr, live):
+    """Python expression reading a parameter"""
+    value = f"mem[{addr}]" if addr in live else str(param)
+    if mode == 1:
+        return value
+    if mode == 2:
+        return f"mem[rb + {value}]"
+    return f"mem[{value}]"
+
+
+def translate_block(mem, start, code_size, live=()):
+    """Translate the code at start, up to an unconditional jump or halt, into Python source.
+
+    Returns (end, source, steps_at) or None if there is nothing to translate.
+    Every write into the code region checks the code map and calls
+    machine.invalidate() so blocks built from the old words are dropped, then
+    leaves the block so execution continues with freshly decoded code.
+    """
+    lines = []
+    steps_at = {}
+    pc = start
+    k = 0
+
+    def emit(text, indent=2):
+        lines.append("    " * indent + text)
+
+    def store(mode, param, addr, expr, next_pc, done, after=None):
+        if mode == 2 or addr in live:
+            dest = f"mem[{addr}]" if addr in live else str(param)
+            emit(f"d = rb + {dest}" if mode == 2 else f"d = {dest}")
+            emit(f"mem[d] = {expr}")
+            if after:
+                emit(after)
+            emit(f"if d < {code_size} and cmap[d]:")
+            emit("machine.invalidate(d)", 3)
+            emit(f"return {next_pc}, rb, None, {done}", 3)
+        else:
+            emit(f"mem[{param}] = {expr}")
+            if after:
+                emit(after)
+            if param < code_size:
+                emit(f"if cmap[{param}]:")
+                emit(f"machine.invalidate({param})", 3)
+                emit(f"return {next_pc}, rb, None, {done}", 3)
+
+    while k < MAX_BLOCK and pc < code_size:
+        instr = mem[pc]
+        opcode, m1, m2, m3 = DECODE[instr] if 0 <= instr < len(DECODE) else (0, 0, 0, 0)
+        width = ARITY.get(opcode, 0) + 1
+        if opcode == 0 or pc + width > code_size:
+            break
+
+        params = mem[pc + 1:pc + width]
+        fixed = [pc + 1 + i not in live for i in range(width - 1)]
+        next_pc = pc + width
+        steps_at[pc] = k
+        emit(f"at = {pc}")
+
+        if opcode in (1, 2, 7, 8):
+            a = operand(m1, params[0], pc + 1, live)
+            b = operand(m2, params[1], pc + 2, live)
+            if m1 == 1 and m2 == 1 and fixed[0] and fixed[1]:
+                expr = str({1: params[0] + params[1], 2: params[0] * params[1],
+                            7: int(params[0] < params[1]), 8: int(params[0] == params[1])}[opcode])
+            elif opcode == 1:
+                expr = f"{a} + {b}"
+            elif opcode == 2:
+                expr = f"{a} * {b}"
+            elif opcode == 7:
+                expr = f"1 if {a} < {b} else 0"
+            else:
+                expr = f"1 if {a} == {b} else 0"
+            store(m3, params[2], pc + 3, expr, next_pc, k + 1)
+
+        elif opcode == 9:
+            emit(f"rb += {operand(m1, params[0], pc + 1, live)}")
+
+        elif opcode == 3:
+            emit("if not inputs:")
+            emit(f"return {pc}, rb, INPUT, {k}", 3)
+            # Only consumed once the write is known to fit in memory
+            store(m1, params[0], pc + 1, "inputs[0]", next_pc, k + 1, after="inputs.popleft()")
+
+        elif opcode == 4:
+            emit(f"outputs.append({operand(m1, params[0], pc + 1, live)})")
+            emit("if until_output:")
+            emit(f"return {next_pc}, rb, OUTPUT, {k + 1}", 3)
+
+        elif opcode == 5 or opcode == 6:
+            target = operand(m2, params[1], pc + 2, live)
+            if m1 == 1 and fixed[0]:
+                # Constant condition: either always taken or a no-op
+                if (params[0] != 0) == (opcode == 5):
+                    emit(f"return {target}, rb, None, {k + 1}")
+                    return next_pc, finish(start, lines), steps_at
+            else:
+                # Taken branches leave the block, the fall-through keeps going
+                cond = operand(m1, params[0], pc + 1, live) + (" != 0" if opcode == 5 else " == 0")
+                emit(f"if {cond}:")
+                emit(f"return {target}, rb, None, {k + 1}", 3)
+
+        elif opcode == 99:
+            emit(f"return {pc}, rb, HALT, {k}")
+            return next_pc, finish(start, lines), steps_at
+
+        pc = next_pc
+        k += 1
+
+    if k == 0:
+        return None
+    emit(f"return {pc}, rb, None, {k}")
+    return pc, finish(start, lines), steps_at
+
+
+def finish(start, lines):
+    head = [
+        f"def block_{start}(mem, rb, inputs, outputs, cmap, machine, until_output):",
+        "    try:",
+    ]
+    tail = [
+        "    except IndexError:",
+        "        return at, rb, GROW, 0",
+    ]
+    return "\n".join(head + lines + tail)
+
+
+def compile_source(start, source):
+    namespace = {'HALT': HALT, 'INPUT': INPUT, 'OUTPUT': OUTPUT, 'GROW': GROW}
+    exec(source, namespace)
+    return namespace[f"block_{start}"]
+
+
+class CompiledIntcodeComputer(IntcodeComputer):
+    """Intcode machine that runs programs as translated Python blocks.
+
+    Machines running the same program image share its translated blocks until
+    they write into translated code. That write drops the affected blocks and
+    moves the machine onto its own copy of the block map, where the patched
+    words get (or reuse) a translation of their own. A block start that keeps
+    getting patched into new words is handed back to the interpreter.
+    The image is taken at the first run(), so poke the memory before that.
+    """
+
+    def __init__(self, program, name="Intcode"):
+        super().__init__(program, name)
+        self.translation = None
+        self.blocks = None
+        self.code_map = None
+        self.shared = True
+        self.serial_floor = 0 # Shared blocks from this serial on have not been checked against our memory
+
+    def snapshot(self):
+        snap = super().snapshot()
+        if self.shared:
+            snap.code = (self.translation, None, self.serial_floor)
+        else:
+            snap.code = (self.translation, dict(self.blocks), self.serial_floor)
+        return snap
+
+    def restore(self, snap):
+        super().restore(snap)
+        if snap.code is None:
+            # Taken from an interpreted machine, nothing known about its code
+            if self.translation is not None:
+                self.recheck(self.translation.blocks)
+            return
+        self.translation, blocks, self.serial_floor = snap.code
+        if self.translation is None:
+            self.blocks = self.code_map = None
+            self.shared = True
+        elif blocks is None:
+            self.blocks = self.translation.blocks
+            self.code_map = self.translation.code_map
+            self.shared = True
+            self.catch_up()
+            if self.shared:
+                # Remember the check so the next restore of snap skips it
+                snap.code = (self.translation, None, self.serial_floor)
+        else:
+            # Private blocks always match the memory they were snapshotted with
+            self.recheck(blocks, trusted=True)
+
+    def attach(self):
+        image = tuple(self.memory)
+        self.translation = TRANSLATIONS.get(image)
+        if self.translation is None:
+            self.translation = TRANSLATIONS[image] = Translation(image)
+        self.blocks = self.translation.blocks
+        self.code_map = self.translation.code_map
+        self.serial_floor = self.translation.published
+
+    def unshare(self):
+        """Move onto a private block map, keeping the shared blocks that still match memory"""
+        mem = self.memory
+        self.blocks = {
+            start: block for start, block in self.blocks.items()
+            if block.serial < self.serial_floor or block.matches(mem)
+        }
+        self.code_map = bytearray(len(self.code_map))
+        for block in self.blocks.values():
+            block.cover(self.code_map)
+        self.shared = False
+
+    def catch_up(self):
+        """Check the shared blocks published since serial_floor against memory in one go"""
+        if self.serial_floor == self.translation.published:
+            return
+        mem = self.memory
+        fresh = [b for b in self.blocks.values() if b.serial >= self.serial_floor]
+        if all(block.matches(mem) for block in fresh):
+            self.serial_floor = self.translation.published
+        else:
+            self.unshare()
+
+    def recheck(self, blocks, trusted=False):
+        """Move onto a private block map holding the blocks that match memory"""
+        mem = self.memory
+        self.blocks = {
+            start: block for start, block in blocks.items()
+            if trusted or block.matches(mem)
+        }
+        self.code_map = bytearray(len(self.translation.code_map))
+        for block in self.blocks.values():
+            block.cover(self.code_map)
+        self.shared = False
+
+    def fetch_block(self, pc):
+        """Find or translate the block starting at pc, or None to interpret it"""
+        translation = self.translation
+        if pc in translation.interpreted or pc >= len(self.code_map):
+            return None
+        mem = self.memory
+        if self.shared:
+            block = self.blocks.get(pc)
+            if block is not None:
+                # Published by another machine since we attached
+                if block.matches(mem):
+                    if block.serial == self.serial_floor:
+                        self.serial_floor += 1
+                    return block
+                self.unshare()
+        block = translation.variant_at(mem, pc)
+        if block is None:
+            live = translation.live
+            translated = translate_block(mem, pc, len(self.code_map), live)
+            if translated is None:
+                return None
+            end, source, steps_at = translated
+            words = mem[pc:end]
+            block_live = tuple(addr for addr in range(pc, end) if addr in live)
+            for addr in block_live:
+                words[addr - pc] = None
+            block = Block(pc, end, words, block_live, compile_source(pc, source), steps_at)
+            translation.add_variant(block)
+        if self.shared:
+            if block.serial is None and translation.publish(block):
+                if block.serial == self.serial_floor:
+                    self.serial_floor += 1
+                return block
+            self.unshare()
+        self.blocks[pc] = block
+        block.cover(self.code_map)
+        return block
+
+    def write(self, addr, val):
+        super().write(addr, val)
+        if addr < len(self.code_map) and self.code_map[addr]:
+            self.invalidate(addr)
+
+    def invalidate(self, addr):
+        """Drop every block built from the word at addr"""
+        if self.shared:
+            self.unshare()
+        stale = [b for b in self.blocks.values() if b.start <= addr < b.end]
+        for block in stale:
+            del self.blocks[block.start]
+            self.code_map[block.start:block.end] = bytes(block.end - block.start)
+        if not any(addr in b.steps_at for b in stale):
+            self.translation.make_live(addr)
+        if not stale:
+            # Only a block another machine published since we attached
+            # covered addr, and unshare() dropped it as not matching memory
+            self.code_map[addr] = 0
+            return
+        # Blocks overlapping a dropped one still cover their own words
+        lo = min(b.start for b in stale)
+        hi = max(b.end for b in stale)
+        for block in self.blocks.values():
+            if block.start < hi and lo < block.end:
+                block.cover(self.code_map)
+
+    def run(self, until_output=False):
+        if self.translation is None:
+            self.attach()
+        mem = self.memory
+        inputs = self.inputs
+        outputs = self.outputs
+        pc = self.pc
+        rb = self.relative_base
+        steps = 0
+
+        while True:
+            block = self.blocks.get(pc)
+            if block is None or (self.shared and block.serial >= self.serial_floor):
+                block = self.fetch_block(pc)
+            if block is None:
+                self.pc, self.relative_base = pc, rb
+                status = self.step()
+                pc, rb = self.pc, self.relative_base
+                if status is not None and (status != OUTPUT or until_output):
+                    self.steps += steps
+                    return status
+                continue
+
+            pc, rb, status, n = block.func(mem, rb, inputs, outputs, self.code_map, self, until_output)
+            steps += n
+            if status is not None:
+                if status is GROW:
+                    steps += block.steps_at[pc]
+                    self.pc = pc
+                    self.grow()
+                    continue
+                if status is INPUT:
+                    self.waiting_for_input = True
+                elif status is HALT:
+                    self.halted = True
+                self.pc, self.relative_base = pc, rb
+                self.steps += steps
+                return status
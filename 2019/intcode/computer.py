@@ -0,0 +1,310 @@
+from collections import deque
+from itertools import chain
+
+HALT = 'HALT'
+INPUT = 'INPUT'
+OUTPUT = 'OUTPUT'
+
+# Parameter count per opcode
+ARITY = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
+
+# Largest memory the machine will grow to before giving up on a runaway address
+MAX_MEMORY = 1 << 24
+
+# Words per copy-on-write page in a snapshot
+PAGE_SIZE = 128
+
+
+def build_decode_table():
+    """Map every valid instruction word to (opcode, mode1, mode2, mode3)"""
+    table = [(0, 0, 0, 0)] * 30000
+    for opcode in ARITY:
+        for m1 in range(3):
+            for m2 in range(3):
+                for m3 in range(3):
+                    instr = m3 * 10000 + m2 * 1000 + m1 * 100 + opcode
+                    table[instr] = (opcode, m1, m2, m3)
+    return table
+
+DECODE = build_decode_table()
+
+
+def parse_program(data):
+    return [int(x) for x in data.strip().split(',')]
+
+
+def paginate(mem, base=()):
+    """Split memory into pages, reusing every page of base that is unchanged.
+
+    Pages are lists for cheap comparison and copying, and are never modified.
+    """
+    pages = []
+    for i, lo in enumerate(range(0, len(mem), PAGE_SIZE)):
+        page = mem[lo:lo + PAGE_SIZE]
+        if i < len(base) and base[i] == page:
+            page = base[i]
+        pages.append(page)
+    return tuple(pages)
+
+
+class Snapshot:
+    """Frozen machine state, for restore() and fork().
+
+    Memory is a tuple of read-only pages. A page the machine has not touched
+    since its last snapshot or restore is the same object as in that one, so
+    a frontier of snapshots derived from each other only pays for dirty pages.
+    code is engine-specific state (the compiled machine keeps its block map there).
+    """
+
+    def __init__(self, pages, pc, relative_base, inputs, outputs, halted, waiting_for_input, steps):
+        self.pages = pages
+        self.size = (len(pages) - 1) * PAGE_SIZE + len(pages[-1]) if pages else 0
+        self.pc = pc
+        self.relative_base = relative_base
+        self.inputs = inputs
+        self.outputs = outputs
+        self.halted = halted
+        self.waiting_for_input = waiting_for_input
+        self.steps = steps
+        self.code = None
+
+
+class IntcodeComputer:
+    """Intcode machine with table-decoded instructions and list-backed memory.
+
+    Memory starts as a copy of the program and grows on demand, so addresses
+    past the end of the program read as 0 like they did with defaultdict(int).
+    """
+
+    def __init__(self, program, name="Intcode"):
+        self.memory = list(program)
+        self.pc = 0
+        self.relative_base = 0
+        self.inputs = deque()
+        self.outputs = deque()
+        self.halted = False
+        self.waiting_for_input = False
+        self.name = name
+        self.steps = 0 # Instructions executed so far
+        self.pages = () # Pages of the last snapshot taken or restored, to share unchanged ones
+
+    def snapshot(self):
+        self.pages = paginate(self.memory, self.pages)
+        return Snapshot(self.pages, self.pc, self.relative_base, tuple(self.inputs), tuple(self.outputs),
+                        self.halted, self.waiting_for_input, self.steps)
+
+    def restore(self, snap):
+        """Put the machine back into the state captured by snap"""
+        mem = self.memory
+        if len(mem) > snap.size:
+            del mem[snap.size:]
+        if len(mem) == snap.size:
+            for i, page in enumerate(snap.pages):
+                mem[i * PAGE_SIZE:i * PAGE_SIZE + len(page)] = page
+        else:
+            mem[:] = chain.from_iterable(snap.pages)
+        self.pages = snap.pages
+        self.pc = snap.pc
+        self.relative_base = snap.relative_base
+        self.inputs.clear()
+        self.inputs.extend(snap.inputs)
+        self.outputs.clear()
+        self.outputs.extend(snap.outputs)
+        self.halted = snap.halted
+        self.waiting_for_input = snap.waiting_for_input
+        self.steps = snap.steps
+
+    def fork(self):
+        """A new machine in the same state, sharing memory pages until either side writes"""
+        snap = self.snapshot()
+        child = type(self).__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child.memory = []
+        child.inputs = deque()
+        child.outputs = deque()
+        child.restore(snap)
+        return child
+
+    def copy(self):
+        return self.fork()
+
+    def add_input(self, val):
+        self.inputs.append(val)
+        self.waiting_for_input = False
+
+    def add_inputs(self, vals):
+        self.inputs.extend(vals)
+        self.waiting_for_input = False
+
+    def add_ascii_input(self, s):
+        self.add_inputs(ord(char) for char in s)
+
+    def get_output(self):
+        return self.outputs.popleft() if self.outputs else None
+
+    def has_output(self):
+        return len(self.outputs) > 0
+
+    def get_all_outputs(self):
+        out = list(self.outputs)
+        self.outputs.clear()
+        return out
+
+    def grow(self):
+        size = len(self.memory)
+        if size * 2 > MAX_MEMORY:
+            raise MemoryError(f"{self.name} addressed memory beyond {MAX_MEMORY} at pc {self.pc}")
+        self.memory.extend([0] * size)
+
+    def read(self, addr):
+        return self.memory[addr] if addr < len(self.memory) else 0
+
+    def write(self, addr, val):
+        while addr >= len(self.memory):
+            self.grow()
+        self.memory[addr] = val
+
+    def step(self):
+        """Execute a single instruction the slow, obvious way.
+
+        Returns HALT, INPUT or OUTPUT if the instruction stopped the machine,
+        otherwise None.
+        """
+        instr = self.read(self.pc)
+        opcode, m1, m2, m3 = DECODE[instr] if 0 <= instr < len(DECODE) else (0, 0, 0, 0)
+        if opcode == 0:
+            raise ValueError(f"Unknown opcode {instr} at {self.pc} in {self.name}")
+
+        def addr(k, mode):
+            param = self.read(self.pc + k)
+            return param + self.relative_base if mode == 2 else param
+
+        def val(k, mode):
+            return self.read(self.pc + k) if mode == 1 else self.read(addr(k, mode))
+
+        if opcode == 99:
+            self.halted = True
+            return HALT
+        if opcode == 3:
+            if not self.inputs:
+                self.waiting_for_input = True
+                return INPUT
+            self.write(addr(1, m1), self.inputs.popleft())
+        elif opcode == 4:
+            self.outputs.append(val(1, m1))
+        elif opcode == 9:
+            self.relative_base += val(1, m1)
+        elif opcode == 5 or opcode == 6:
+            if (val(1, m1) != 0) == (opcode == 5):
+                self.pc = val(2, m2)
+                self.steps += 1
+                return None
+        else:
+            a, b = val(1, m1), val(2, m2)
+            result = {1: a + b, 2: a * b, 7: int(a < b), 8: int(a == b)}[opcode]
+            self.write(addr(3, m3), result)
+
+        self.pc += ARITY[opcode] + 1
+        self.steps += 1
+        return OUTPUT if opcode == 4 else None
+
+    def run_until_output_or_input(self):
+        return self.run(until_output=True)
+
+    def run(self, until_output=False):
+        """Run until halt or waiting for input (or after one output if until_output).
+
+        Returns HALT, INPUT or OUTPUT to say why execution stopped.
+        """
+        mem = self.memory
+        inputs = self.inputs
+        outputs = self.outputs
+        decode = DECODE
+        pc = self.pc
+        rb = self.relative_base
+        steps = 0
+
+        while True:
+            # An IndexError means an access past the end of memory. Nothing is
+            # committed before the final write of an instruction, so grow and retry.
+            try:
+                while True:
+                    opcode, m1, m2, m3 = decode[mem[pc]]
+
+                    if opcode == 1 or opcode == 2 or opcode == 7 or opcode == 8:
+                        a = mem[pc + 1]
+                        if m1 == 0: a = mem[a]
+                        elif m1 == 2: a = mem[a + rb]
+                        b = mem[pc + 2]
+                        if m2 == 0: b = mem[b]
+                        elif m2 == 2: b = mem[b + rb]
+                        dest = mem[pc + 3]
+                        if m3 == 2: dest += rb
+                        if opcode == 1:
+                            mem[dest] = a + b
+                        elif opcode == 2:
+                            mem[dest] = a * b
+                        elif opcode == 7:
+                            mem[dest] = 1 if a < b else 0
+                        else:
+                            mem[dest] = 1 if a == b else 0
+                        pc += 4
+
+                    elif opcode == 5 or opcode == 6:
+                        a = mem[pc + 1]
+                        if m1 == 0: a = mem[a]
+                        elif m1 == 2: a = mem[a + rb]
+                        if (a != 0) == (opcode == 5):
+                            b = mem[pc + 2]
+                            if m2 == 0: b = mem[b]
+                            elif m2 == 2: b = mem[b + rb]
+                            pc = b
+                        else:
+                            pc += 3
+
+                    elif opcode == 9:
+                        a = mem[pc + 1]
+                        if m1 == 0: a = mem[a]
+                        elif m1 == 2: a = mem[a + rb]
+                        rb += a
+                        pc += 2
+
+                    elif opcode == 3:
+                        if not inputs:
+                            self.waiting_for_input = True
+                            self.pc, self.relative_base = pc, rb
+                            self.steps += steps
+                            return INPUT
+                        dest = mem[pc + 1]
+                        if m1 == 2: dest += rb
+                        mem[dest] = inputs[0]
+                        inputs.popleft()
+                        pc += 2
+
+                    elif opcode == 4:
+                        a = mem[pc + 1]
+                        if m1 == 0: a = mem[a]
+                        elif m1 == 2: a = mem[a + rb]
+                        outputs.append(a)
+                        pc += 2
+                        if until_output:
+                            steps += 1
+                            self.pc, self.relative_base = pc, rb
+                            self.steps += steps
+                            return OUTPUT
+
+                    elif opcode == 99:
+                        self.halted = True
+                        self.pc, self.relative_base = pc, rb
+                        self.steps += steps
+                        return HALT
+
+                    else:
+                        raise ValueError(f"Unknown opcode {mem[pc]} at {pc} in {self.name}")
+
+                    steps += 1
+            except IndexError:
+                if 0 <= pc < len(mem) and not 0 <= mem[pc] < len(decode):
+                    raise ValueError(f"Unknown opcode {mem[pc]} at {pc} in {self.name}")
+                self.pc = pc
+                self.grow()
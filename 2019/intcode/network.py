@@ -0,0 +1,125 @@
+import asyncio
+
+from .computer import HALT
+
+
+class Node:
+    """One machine on a Network, with the counters the scheduler keeps for it"""
+
+    def __init__(self, address, machine):
+        self.address = address
+        self.machine = machine
+        self.asleep = False # Waiting for a delivery
+        self.polled = False # Got the poll value and has not sent or received anything since
+        self.wakeup = None # Future resolved by the next delivery while asleep
+        self.wakeups = 0
+        self.peak_depth = 0
+
+    @property
+    def steps(self):
+        return self.machine.steps
+
+    @property
+    def depth(self):
+        return len(self.machine.inputs)
+
+
+class Network:
+    """Intcode machines run as asyncio tasks that sleep until input is delivered to them.
+
+    After every run() of a machine, route(network, node) is called to take its
+    outputs and deliver() them. With poll set, a machine asking for input on an
+    empty queue reads that value once (2019/23's -1) and only goes to sleep if
+    it asks again without having sent anything. When every live machine is
+    asleep the network is idle: watchers can await idle, and with no watchers
+    it is a deadlock.
+    """
+
+    def __init__(self, machines, route, poll=None):
+        self.nodes = [Node(address, machine) for address, machine in enumerate(machines)]
+        self.route = route
+        self.poll = poll
+        self.sleeping = 0
+        self.running = len(self.nodes)
+        self.idle = asyncio.Event()
+        self.done = asyncio.Event()
+        self.result = None
+
+    def deliver(self, address, values):
+        node = self.nodes[address]
+        node.machine.add_inputs(values)
+        node.polled = False
+        node.peak_depth = max(node.peak_depth, node.depth)
+        if node.asleep:
+            node.asleep = False
+            self.sleeping -= 1
+            self.idle.clear()
+            node.wakeup.set_result(None)
+
+    def stop(self, result=None):
+        self.result = result
+        self.done.set()
+
+    def sleep(self, node):
+        node.asleep = True
+        node.wakeup = asyncio.get_running_loop().create_future()
+        self.sleeping += 1
+        if self.sleeping == self.running:
+            self.idle.set()
+
+    async def run_node(self, node):
+        machine = node.machine
+        while True:
+            status = machine.run()
+            if machine.outputs:
+                node.polled = False
+                self.route(self, node)
+            if status == HALT:
+                self.running -= 1
+                if self.running and self.sleeping == self.running:
+                    self.idle.set()
+                return
+            if machine.inputs:
+                # Delivered to itself while it ran
+                continue
+            if self.poll is not None and not node.polled:
+                node.polled = True
+                machine.add_input(self.poll)
+                await asyncio.sleep(0)
+            else:
+                self.sleep(node)
+                await node.wakeup
+                node.wakeups += 1
+
+    async def watch_deadlock(self):
+        await self.idle.wait()
+        raise RuntimeError("Deadlock: every machine is waiting for input")
+
+    async def run(self, *watchers):
+        """Run until every machine halts or stop() is called, returning the stop() result.
+
+        watchers are extra coroutines run alongside the machines, e.g. one
+        that awaits network.idle.
+        """
+        machines = asyncio.gather(*(self.run_node(node) for node in self.nodes))
+        extra = [asyncio.ensure_future(w) for w in watchers or [self.watch_deadlock()]]
+        stopped = asyncio.ensure_future(self.done.wait())
+        finished, _ = await asyncio.wait([machines, stopped, *extra], return_when=asyncio.FIRST_COMPLETED)
+        pending = [task for task in [machines, stopped, *extra] if task not in finished]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        # A stop() wins over anything that went wrong in the same step
+        errors = [task.exception() for task in finished if not task.cancelled()]
+        for error in errors:
+            if error is not None and not self.done.is_set():
+                raise error
+        return self.result
+
+    def report(self):
+        """Per-node instruction counts, wakeups and input queue depths"""
+        lines = [f"{'node':<8} {'instructions':>13} {'wakeups':>8} {'queue':>6} {'peak':>6}"]
+        for node in self.nodes:
+            lines.append(f"{node.machine.name:<8} {node.steps:>13,} {node.wakeups:>8} {node.depth:>6} {node.peak_depth:>6}")
+        lines.append(f"{'total':<8} {sum(node.steps for node in self.nodes):>13,} {sum(node.wakeups for node in self.nodes):>8}")
+        return "\n".join(lines)
@@ -1,82 +1,44 @@
 import os
 import sys
-from typing import Callable, List, Tuple
-
-Grid = List[List[str]]
-DIRECTIONS: Tuple[Tuple[int, int], ...] = (
-    (-1, -1),
-    (-1, 0),
-    (-1, 1),
-    (0, -1),
-    (0, 1),
-    (1, -1),
-    (1, 0),
-    (1, 1),
-)
-
-
-def parse(data: str) -> Grid:
-    return [list(line.strip()) for line in data.splitlines() if line.strip()]
-
-
-def count_adjacent(grid: Grid, r: int, c: int) -> int:
-    rows, cols = len(grid), len(grid[0])
-    count = 0
-    for dr, dc in DIRECTIONS:
-        nr, nc = r + dr, c + dc
-        if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == '#':
-            count += 1
-    return count
-
-
-def count_visible(grid: Grid, r: int, c: int) -> int:
-    rows, cols = len(grid), len(grid[0])
-    count = 0
-    for dr, dc in DIRECTIONS:
-        nr, nc = r + dr, c + dc
-        while 0 <= nr < rows and 0 <= nc < cols:
-            seat = grid[nr][nc]
-            if seat == '#':
-                count += 1
-                break
-            if seat == 'L':
-                break
-            nr += dr
-            nc += dc
-    return count
-
-
-def simulate(grid: Grid, tolerance: int, visible_counter: Callable[[Grid, int, int], int]) -> int:
-    rows, cols = len(grid), len(grid[0])
-    changed = True
-    current = [row[:] for row in grid]
-    while changed:
-        changed = False
-        new_grid = [row[:] for row in current]
-        for r in range(rows):
-            for c in range(cols):
-                seat = current[r][c]
-                if seat == '.':
-                    continue
-                occupied = visible_counter(current, r, c)
-                if seat == 'L' and occupied == 0:
-                    new_grid[r][c] = '#'
-                    changed = True
-                elif seat == '#' and occupied >= tolerance:
-                    new_grid[r][c] = 'L'
-                    changed = True
-        current = new_grid
-    return sum(row.count('#') for row in current)
+
+import numpy as np
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from automaton import Automaton, Shifts, Sightlines, MOORE, rule_table, from_lines
+
+FLOOR, EMPTY, OCCUPIED = range(3)
+SYMBOLS = '.L#'
+
+
+def parse(data: str) -> np.ndarray:
+    return from_lines([line.strip() for line in data.splitlines() if line.strip()], SYMBOLS)
+
+
+def seating_rule(tolerance: int) -> np.ndarray:
+    def next_seat(seat: int, occupied: int) -> int:
+        if seat == EMPTY and occupied == 0:
+            return OCCUPIED
+        if seat == OCCUPIED and occupied >= tolerance:
+            return EMPTY
+        return seat
+    return rule_table(3, 1, 8, next_seat)
+
+
+def simulate(grid: np.ndarray, tolerance: int, neighbourhood) -> int:
+    seats = Automaton(grid, seating_rule(tolerance), counted=(OCCUPIED,), neighbourhood=neighbourhood)
+    seats.settle()
+    return seats.count(OCCUPIED)
 
 
 def part1(data: str) -> int:
     grid = parse(data)
-    return simulate(grid, 4, count_adjacent)
+    return simulate(grid, 4, Shifts(MOORE))
 
 
 def part2(data: str) -> int:
     grid = parse(data)
-    return simulate(grid, 5, count_visible)
+    # Look past floor to the first seat in each direction
+    return simulate(grid, 5, Sightlines(grid == FLOOR))
 
 
 def read_input() -> str:
@@ -1,7 +1,9 @@
-import itertools
 import os
 import sys
-from typing import List, Set, Tuple
+from typing import Set, Tuple
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from automaton import PackedLife
 
 Coordinate = Tuple[int, ...]
 
@@ -18,33 +20,12 @@ def parse(data: str) -> Set[Coordinate]:
     return active
 
 
-def build_offsets(dims: int) -> List[Coordinate]:
-    offsets = []
-    for delta in itertools.product((-1, 0, 1), repeat=dims):
-        if all(d == 0 for d in delta):
-            continue
-        offsets.append(delta)
-    return offsets
-
-
-def run(data: str, dims: int) -> int:
-    base_active = parse(data)
-    active = {coord + (0,) * (dims - len(coord)) for coord in base_active}
-    offsets = build_offsets(dims)
-    for _ in range(6):
-        neighbor_counts = {}
-        for coord in active:
-            for delta in offsets:
-                neighbor = tuple(c + d for c, d in zip(coord, delta))
-                neighbor_counts[neighbor] = neighbor_counts.get(neighbor, 0) + 1
-        new_active = set()
-        for coord, count in neighbor_counts.items():
-            if coord in active and count in (2, 3):
-                new_active.add(coord)
-            elif coord not in active and count == 3:
-                new_active.add(coord)
-        active = new_active
-    return len(active)
+def run(data: str, dims: int, cycles: int = 6) -> int:
+    # Seeded on the z = w = ... = 0 plane, so every axis after y is mirror
+    # symmetric and only its non-negative half is simulated
+    life = PackedLife(parse(data), dims, fold=dims - 2)
+    life.run(cycles)
+    return life.count()
 
 
 def part1(data: str) -> int:
@@ -73,3 +54,6 @@ if __name__ == '__main__':
     data = read_input()
     print(part1(data))
     print(part2(data))
+    if '--dims' in sys.argv:
+        dims = int(sys.argv[sys.argv.index('--dims') + 1])
+        print(f"{dims}-D:", run(data, dims))
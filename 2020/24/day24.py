@@ -1,7 +1,11 @@
 import os
 import sys
-from collections import Counter
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Tuple
+
+import numpy as np
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from automaton import HexLife
 
 Direction = Tuple[int, int]
 DIRECTIONS: Dict[str, Direction] = {
@@ -13,77 +17,46 @@ DIRECTIONS: Dict[str, Direction] = {
     'sw': (-1, 1),
 }
 
+# The two-letter directions as one byte each, so every byte of the input is a step
+SHORT = {'ne': 'N', 'nw': 'M', 'se': 'S', 'sw': 'T'}
+
+
+def parse(data: str) -> np.ndarray:
+    """(q, r) of the tile each line ends on, walked for all lines at once"""
+    lines = [line.strip() for line in data.splitlines() if line.strip()]
+    text = '\n'.join(lines)
+    for pair, short in SHORT.items():
+        text = text.replace(pair, short)
+    dq = np.zeros(256, np.int64)
+    dr = np.zeros(256, np.int64)
+    for name, (q, r) in DIRECTIONS.items():
+        code = ord(SHORT.get(name, name))
+        dq[code], dr[code] = q, r
+    steps = np.frombuffer(text.encode(), np.uint8)
+    line = np.cumsum(steps == ord('\n'))
+    q = np.bincount(line, dq[steps], len(lines)).astype(np.int64)
+    r = np.bincount(line, dr[steps], len(lines)).astype(np.int64)
+    return np.stack([q, r], axis=1)
+
+
+def initial_black_tiles(tiles: np.ndarray) -> np.ndarray:
+    """Tiles flipped an odd number of times"""
+    flipped, counts = np.unique(tiles, axis=0, return_counts=True)
+    return flipped[counts % 2 == 1]
+
 
-def parse_line(line: str) -> List[str]:
-    instructions = []
-    i = 0
-    while i < len(line):
-        if line[i] in {'e', 'w'}:
-            instructions.append(line[i])
-            i += 1
-        else:
-            instructions.append(line[i:i + 2])
-            i += 2
-    return instructions
-
-
-def parse(data: str) -> List[List[str]]:
-    return [parse_line(line.strip()) for line in data.splitlines() if line.strip()]
-
-
-def walk(instructions: List[str]) -> Tuple[int, int]:
-    q = r = 0
-    for instr in instructions:
-        dq, dr = DIRECTIONS[instr]
-        q += dq
-        r += dr
-    return q, r
-
-
-def initial_black_tiles(paths: List[List[str]]) -> Set[Tuple[int, int]]:
-    black: Set[Tuple[int, int]] = set()
-    for path in paths:
-        pos = walk(path)
-        if pos in black:
-            black.remove(pos)
-        else:
-            black.add(pos)
-    return black
-
-
-def simulate(black: Set[Tuple[int, int]], days: int) -> Set[Tuple[int, int]]:
-    current = set(black)
-    for _ in range(days):
-        counts: Counter[Tuple[int, int]] = Counter()
-        for q, r in current:
-            for dq, dr in DIRECTIONS.values():
-                neighbor = (q + dq, r + dr)
-                counts[neighbor] += 1
-        new_black: Set[Tuple[int, int]] = set()
-        tiles_to_check = set(counts.keys()) | current
-        for tile in tiles_to_check:
-            neighbors = counts.get(tile, 0)
-            if tile in current:
-                if neighbors in (1, 2):
-                    new_black.add(tile)
-            else:
-                if neighbors == 2:
-                    new_black.add(tile)
-        current = new_black
-    return current
+def simulate(black: np.ndarray, days: int) -> HexLife:
+    lobby = HexLife(black, born=(2,), survive=(1, 2))
+    lobby.run(days)
+    return lobby
 
 
 def part1(data: str) -> int:
-    paths = parse(data)
-    black = initial_black_tiles(paths)
-    return len(black)
+    return len(initial_black_tiles(parse(data)))
 
 
-def part2(data: str) -> int:
-    paths = parse(data)
-    black = initial_black_tiles(paths)
-    final_black = simulate(black, 100)
-    return len(final_black)
+def part2(data: str, days: int = 100) -> int:
+    return simulate(initial_black_tiles(parse(data)), days).count()
 
 
 def read_input() -> str:
@@ -121,3 +94,6 @@ if __name__ == '__main__':
     data = read_input()
     print(part1(data))
     print(part2(data))
+    if '--days' in sys.argv:
+        days = int(sys.argv[sys.argv.index('--days') + 1])
+        print(f"Day {days}:", part2(data, days))
@@ -0,0 +1,3 @@
+from .grid import Automaton, Shifts, Sightlines, MOORE, VON_NEUMANN, moore, rule_table, life_rule, from_lines, to_lines
+from .hex import HexLife, AXIAL, HEX
+from .packed import PackedLife
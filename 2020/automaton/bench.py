@@ -0,0 +1,258 @@
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from automaton import Automaton, HexLife, PackedLife, Shifts, Sightlines, AXIAL, HEX, MOORE, rule_table, life_rule, from_lines
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+# Generations run per backend; the per-cell loops only run the first few
+GENERATIONS = 100
+CELL_GENERATIONS = 5
+
+# Side of the random Life grid for the stress run
+STRESS_SIZE = 1000
+
+# Dimensions of the 2020/17 runs, and the most the dict and unfolded runs get
+DIMS = (3, 4, 5, 6)
+DICT_DIMS = 4
+UNFOLDED_DIMS = 5
+
+# Days of 2020/24 run on the bit-packed hex board; the dict and dense runs only get the first
+HEX_DAYS = (100, 1000, 2000)
+
+
+def load_day(year, day):
+    with open(os.path.join(ROOT, str(year), str(day), 'input.txt')) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def adjacent(grid, r, c):
+    return [(r + dr, c + dc) for dr, dc in MOORE if 0 <= r + dr < len(grid) and 0 <= c + dc < len(grid[0])]
+
+
+def visible(grid, r, c):
+    # First non-floor cell in each direction, walked per cell
+    cells = []
+    for dr, dc in MOORE:
+        nr, nc = r + dr, c + dc
+        while 0 <= nr < len(grid) and 0 <= nc < len(grid[0]):
+            if grid[nr][nc]:
+                cells.append((nr, nc))
+                break
+            nr += dr
+            nc += dc
+    return cells
+
+
+def cell_step(grid, rule, counted, neighbours, pinned):
+    # Nested lists, a neighbour list built for every cell
+    new = []
+    for r, row in enumerate(grid):
+        new_row = []
+        for c, state in enumerate(row):
+            cells = neighbours(grid, r, c)
+            entry = rule[state]
+            for s in counted:
+                entry = entry[sum(1 for nr, nc in cells if grid[nr][nc] == s)]
+            new_row.append(entry)
+        new.append(new_row)
+    for (r, c), state in pinned.items():
+        new[r][c] = state
+    return new
+
+
+def seating_rule(tolerance):
+    return rule_table(3, 1, 8, lambda seat, n: 2 if seat == 1 and n == 0 else 1 if seat == 2 and n >= tolerance else seat)
+
+
+def corners(n):
+    return {(0, 0): 1, (0, n - 1): 1, (n - 1, 0): 1, (n - 1, n - 1): 1}
+
+
+def runs():
+    """(label, grid, rule, counted, neighbourhood factory, per-cell neighbours, pinned)"""
+    lights = from_lines(load_day(2015, 18), '.#')
+    acres = from_lines(load_day(2018, 18), '.|#')
+    seats = from_lines(load_day(2020, 11), '.L#')
+    lumber = rule_table(3, 2, 8, lambda acre, trees, yards: (
+        (1 if trees >= 3 else 0) if acre == 0 else (2 if yards >= 3 else 1) if acre == 1 else
+        (2 if yards and trees else 0)))
+    rng = np.random.default_rng(2015)
+    noise = rng.integers(0, 2, (STRESS_SIZE, STRESS_SIZE), np.uint8)
+    return [
+        ("2015/18 part 1", lights, life_rule(), (1,), Shifts, adjacent, {}),
+        ("2015/18 part 2", lights, life_rule(), (1,), Shifts, adjacent, corners(len(lights))),
+        ("2018/18", acres, lumber, (1, 2), Shifts, adjacent, {}),
+        ("2020/11 part 1", seats, seating_rule(4), (2,), Shifts, adjacent, {}),
+        ("2020/11 part 2", seats, seating_rule(5), (2,), lambda: Sightlines(seats == 0), visible, {}),
+        (f"life {STRESS_SIZE}x{STRESS_SIZE}", noise, life_rule(), (1,), Shifts, None, {}),
+    ]
+
+
+def octopus_runs():
+    """2021/11 steps, recursive flood per flash against flash rounds of neighbour counts"""
+    energy = np.array([[int(ch) for ch in line] for line in load_day(2021, 11)])
+    adjacent_counts = Shifts()
+
+    def flash(index, m):
+        r, c = index
+        for adj in adjacent(m, r, c):
+            if m[adj] < 10:
+                m[adj] += 1
+                if m[adj] == 10:
+                    flash(adj, m)
+
+    def recursive(m):
+        m += 1
+        for index in zip(*np.where(m == 10)):
+            flash(index, m)
+        m[m == 10] = 0
+
+    def rounds(m):
+        m += 1
+        flashed = np.zeros(m.shape, bool)
+        while (new := (m > 9) & ~flashed).any():
+            flashed |= new
+            m += adjacent_counts.count(new)
+        m[flashed] = 0
+
+    results = []
+    for name, step in (("recursive", recursive), ("engine", rounds)):
+        m = energy.copy()
+        start = time.perf_counter()
+        for _ in range(GENERATIONS):
+            step(m)
+        results.append((name, GENERATIONS, time.perf_counter() - start, m))
+    assert np.array_equal(results[0][3], results[1][3])
+    return results
+
+
+def dict_life(cells, dims, generations=6):
+    # Neighbour tuples counted in a dict, per live cell and offset
+    active = {c + (0,) * (dims - len(c)) for c in cells}
+    offsets = [d for d in itertools.product((-1, 0, 1), repeat=dims) if any(d)]
+    for _ in range(generations):
+        counts = {}
+        for coord in active:
+            for delta in offsets:
+                neighbour = tuple(c + d for c, d in zip(coord, delta))
+                counts[neighbour] = counts.get(neighbour, 0) + 1
+        active = {c for c, n in counts.items() if n == 3 or n == 2 and c in active}
+    return len(active)
+
+
+def bench_dims():
+    """Six cycles of 2020/17 by dimension: dict counts, packed keys, packed keys with the extra axes folded"""
+    cells = [(x, y) for y, line in enumerate(load_day(2020, 17)) for x, ch in enumerate(line) if ch == '#']
+    print(f"\n{'dims':>4} {'engine':<8} {'live':>9} {'stored':>8} {'seconds':>8}")
+    for dims in DIMS:
+        results = set()
+        engines = [("dict", None), ("packed", 0), ("folded", dims - 2)]
+        for name, fold in engines:
+            if name == "dict" and dims > DICT_DIMS or name == "packed" and dims > UNFOLDED_DIMS:
+                continue
+            start = time.perf_counter()
+            if fold is None:
+                live = stored = dict_life(cells, dims)
+            else:
+                life = PackedLife(cells, dims, fold=fold)
+                life.run(6)
+                live, stored = life.count(), len(life.cells)
+            elapsed = time.perf_counter() - start
+            results.add(live)
+            print(f"{dims:>4} {name:<8} {live:>9,} {stored:>8,} {elapsed:>8.3f}")
+        assert len(results) == 1
+
+
+def dict_hex(black, days):
+    # Neighbour counts in a dict, per black tile and direction
+    black = set(map(tuple, black.tolist()))
+    for _ in range(days):
+        counts = {}
+        for q, r in black:
+            for dq, dr in AXIAL:
+                counts[q + dq, r + dr] = counts.get((q + dq, r + dr), 0) + 1
+        black = {tile for tile, n in counts.items() if n == 2 or n == 1 and tile in black}
+    return len(black)
+
+
+def dense_hex(black, days):
+    # uint8 grid sized for the whole run up front, counted with Shifts
+    q, r = black.T
+    grid = np.zeros((np.ptp(r) + 2 * days + 3, np.ptp(q) + 2 * days + 3), np.uint8)
+    grid[r - r.min() + days + 1, q - q.min() + days + 1] = 1
+    engine = Automaton(grid, life_rule((2,), (1, 2), 6), neighbourhood=Shifts(HEX))
+    engine.run(days)
+    return engine.count()
+
+
+def packed_hex(black, days):
+    lobby = HexLife(black)
+    lobby.run(days)
+    return lobby.count()
+
+
+def bench_hex():
+    """Days of 2020/24: dict counts, a dense grid with Shifts, the bit-packed hex board"""
+    lines = load_day(2020, 24)
+    steps = {'e': (1, 0), 'w': (-1, 0), 'ne': (1, -1), 'nw': (0, -1), 'se': (0, 1), 'sw': (-1, 1)}
+    flipped = {}
+    for line in lines:
+        tile = (0, 0)
+        for step in line.replace('e', 'e,').replace('w', 'w,').split(',')[:-1]:
+            tile = (tile[0] + steps[step][0], tile[1] + steps[step][1])
+        flipped[tile] = not flipped.get(tile)
+    black = np.array([tile for tile, odd in flipped.items() if odd], np.int64)
+
+    print(f"\n{'days':>5} {'engine':<8} {'black':>9} {'seconds':>8} {'days/s':>9}")
+    engines = (("dict", dict_hex), ("dense", dense_hex), ("packed", packed_hex))
+    results = {}
+    for days in HEX_DAYS:
+        for name, engine in engines:
+            if name != "packed" and days > HEX_DAYS[0]:
+                continue
+            start = time.perf_counter()
+            count = engine(black, days)
+            elapsed = time.perf_counter() - start
+            assert results.setdefault(days, count) == count
+            print(f"{days:>5} {name:<8} {count:>9,} {elapsed:>8.3f} {days / elapsed:>9,.0f}")
+
+
+def bench_grids():
+    """Generations per second for each automaton, per-cell loops against the engine"""
+    print(f"{'run':<16} {'backend':<9} {'gens':>5} {'seconds':>8} {'gens/s':>9}")
+    for label, grid, rule, counted, neighbourhood, neighbours, pinned in runs():
+        engine = Automaton(grid, rule, counted, neighbourhood(), pinned)
+        start = time.perf_counter()
+        after = engine.run(CELL_GENERATIONS)
+        engine.run(GENERATIONS - CELL_GENERATIONS)
+        elapsed = time.perf_counter() - start
+        if neighbours:
+            cells = grid.tolist()
+            for cell, state in pinned.items():
+                cells[cell[0]][cell[1]] = state
+            table = rule.tolist()
+            start = time.perf_counter()
+            for _ in range(CELL_GENERATIONS):
+                cells = cell_step(cells, table, counted, neighbours, pinned)
+            cell_elapsed = time.perf_counter() - start
+            assert np.array_equal(np.array(cells), after)
+            print(f"{label:<16} {'cells':<9} {CELL_GENERATIONS:>5} {cell_elapsed:>8.3f} {CELL_GENERATIONS / cell_elapsed:>9,.0f}")
+        print(f"{label:<16} {'engine':<9} {GENERATIONS:>5} {elapsed:>8.3f} {GENERATIONS / elapsed:>9,.0f}")
+    for name, generations, elapsed, _ in octopus_runs():
+        print(f"{'2021/11':<16} {name:<9} {generations:>5} {elapsed:>8.3f} {generations / elapsed:>9,.0f}")
+
+
+def main():
+    bench_grids()
+    bench_dims()
+    bench_hex()
+
+
+if __name__ == "__main__":
+    main()
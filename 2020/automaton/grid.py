@@ -0,0 +1,153 @@
+import itertools
+
+import numpy as np
+
+
+def moore(dims=2, radius=1):
+    """Offsets of the cells within radius of the origin on every axis, origin excluded"""
+    return tuple(d for d in itertools.product(range(-radius, radius + 1), repeat=dims) if any(d))
+
+
+MOORE = moore()
+VON_NEUMANN = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+
+def from_lines(lines, symbols):
+    """Grid of states from text rows, a cell's state being the index of its character in symbols"""
+    lookup = np.zeros(256, np.uint8)
+    for state, ch in enumerate(symbols):
+        lookup[ord(ch)] = state
+    return lookup[np.array([list(line.encode()) for line in lines], np.uint8)]
+
+
+def to_lines(grid, symbols):
+    return ["".join(symbols[state] for state in row) for row in grid.tolist()]
+
+
+class Shifts:
+    """Neighbourhood of fixed offsets, in any number of dimensions.
+
+    Counts are a sum of shifted windows of the zero-padded mask: a
+    convolution with a 0/1 kernel. Cells outside the grid are never set.
+    The padded buffer and the windows are kept for the last shape counted.
+    """
+
+    def __init__(self, offsets=MOORE):
+        self.offsets = tuple(offsets)
+        self.size = len(self.offsets)
+        self.radius = max(abs(x) for offset in self.offsets for x in offset)
+        self.shape = None
+
+    def prepare(self, shape):
+        r = self.radius
+        self.shape = shape
+        self.padded = np.zeros(tuple(n + 2 * r for n in shape), np.uint8)
+        self.interior = tuple(slice(r, r + n) for n in shape)
+        self.windows = [tuple(slice(r + d, r + d + n) for d, n in zip(offset, shape)) for offset in self.offsets]
+
+    def count(self, mask):
+        if mask.shape != self.shape:
+            self.prepare(mask.shape)
+        padded = self.padded
+        padded[self.interior] = mask
+        counts = np.zeros(mask.shape, np.uint8)
+        for window in self.windows:
+            counts += padded[window]
+        return counts
+
+
+class Sightlines:
+    """Neighbourhood of the first cell seen in each direction, looking past
+    cells where clear is True (2020/11 part 2).
+
+    The cell seen from every cell is found once, as a flat index per
+    direction; counts gather the mask at those indexes. A sightline that
+    leaves the grid points at an extra cell past the end that is never set.
+    """
+
+    def __init__(self, clear, directions=MOORE):
+        rows, cols = clear.shape
+        clear = clear.tolist()
+        outside = rows * cols
+        targets = []
+        for dr, dc in directions:
+            # A cell sees its neighbour, or what the neighbour sees if it is
+            # clear, so visit neighbours first
+            seen = [[outside] * cols for _ in range(rows)]
+            for r in range(rows) if dr <= 0 else range(rows - 1, -1, -1):
+                nr = r + dr
+                if not 0 <= nr < rows:
+                    continue
+                row, next_row, next_clear = seen[r], seen[nr], clear[nr]
+                for c in range(cols) if dc <= 0 else range(cols - 1, -1, -1):
+                    nc = c + dc
+                    if 0 <= nc < cols:
+                        row[c] = next_row[nc] if next_clear[nc] else nr * cols + nc
+            targets.append(seen)
+        self.targets = np.array(targets, np.intp).reshape(len(directions), outside)
+        self.size = len(directions)
+
+    def count(self, mask):
+        flat = np.append(mask.ravel(), False)
+        return flat[self.targets].sum(axis=0, dtype=np.uint8).reshape(mask.shape)
+
+
+def rule_table(states, counted, neighbours, next_state):
+    """Rule array for Automaton: table[state, n1, n2, ...] = next_state(state, n1, n2, ...)
+    for counts of 0..neighbours in each of the counted states"""
+    table = np.zeros((states,) + (neighbours + 1,) * counted, np.uint8)
+    for index in np.ndindex(table.shape):
+        table[index] = next_state(*index)
+    return table
+
+
+def life_rule(born=(3,), survive=(2, 3), neighbours=8):
+    """Rule array for a two-state life-like automaton, B3/S23 by default"""
+    return rule_table(2, 1, neighbours, lambda alive, n: n in (survive if alive else born))
+
+
+class Automaton:
+    """Cellular automaton over an ndarray of small int states.
+
+    Each generation counts, for every cell, its neighbours in each of the
+    counted states, then looks up rule[state, n1, n2, ...] for its next
+    state, all as whole-array operations. The neighbourhood is any object
+    with count(mask) (Shifts or Sightlines). Pinned cells are set back to
+    their state after every generation, e.g. the stuck corners of 2015/18.
+    """
+
+    def __init__(self, grid, rule, counted=(1,), neighbourhood=None, pinned=None):
+        self.grid = np.array(grid, np.uint8)
+        self.rule = np.asarray(rule, np.uint8)
+        self.counted = tuple(counted)
+        self.neighbourhood = neighbourhood or Shifts()
+        self.pinned = dict(pinned or {})
+        self.generation = 0
+        self.pin()
+
+    def pin(self):
+        for cell, state in self.pinned.items():
+            self.grid[cell] = state
+
+    def step(self):
+        grid = self.grid
+        counts = tuple(self.neighbourhood.count(grid == state) for state in self.counted)
+        self.grid = self.rule[(grid,) + counts]
+        self.pin()
+        self.generation += 1
+        return self.grid
+
+    def run(self, generations):
+        for _ in range(generations):
+            self.step()
+        return self.grid
+
+    def settle(self):
+        """Step until a generation changes nothing"""
+        while True:
+            previous = self.grid
+            if np.array_equal(self.step(), previous):
+                return self.grid
+
+    def count(self, state=1):
+        return int(np.count_nonzero(self.grid == state))
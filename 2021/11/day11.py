@@ -2,52 +2,47 @@ import os
 import sys
 import numpy as np
 
+# The automaton engine is shared with 2015/18, 2018/18 and 2020/11
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '2020'))
+from automaton import Shifts
+
 with open(os.path.join(sys.path[0], 'input.txt'), 'r') as f:
     arr = np.array([[int(i) for i in line.strip()] for line in f])
 
-rows, cols = arr.shape
-
-
-def find_adjs(i, j):
-    ajds = [
-        (i-1, j-1), (i-1, j), (i-1, j+1),
-        (i, j-1), (i, j+1),
-        (i+1, j-1), (i+1, j), (i+1, j+1)
-    ]
-    return filter(lambda p: p[0] >= 0 and p[0] < rows and p[1] >= 0 and p[1] < cols, ajds)
+adjacent = Shifts()
 
 
-def flash(index, m):
-    for adj in filter(lambda adj: m[adj] < 10, find_adjs(*index)):
-        m[adj] += 1
-        if m[adj] == 10:
-            flash(adj, m)
+def step(m):
+    m += 1  # energy + 1
+    flashed = np.zeros(m.shape, bool)
+    while True:
+        # every octopus over 9 flashes once, raising its neighbours
+        new = (m > 9) & ~flashed
+        if not new.any():
+            break
+        flashed |= new
+        m += adjacent.count(new)
+    m[flashed] = 0  # reset flashed
+    return np.count_nonzero(flashed)
 
 
 def part1():
     a = arr.copy()
     sum = 0
     for _ in range(100):
-        a += 1  # energy + 1
-        for fla in zip(*np.where(a == 10)):
-            flash(fla, a)
-        a[a == 10] = 0  # reset flashed
-        sum += a[a == 0].size
+        sum += step(a)
     print(sum)
 
 
 def part2():
     a = arr.copy()
-    step = 0
+    step_count = 0
     while True:
-        a += 1  # energy + 1
-        for fla in zip(*np.where(a == 10)):
-            flash(fla, a)
-        a[a == 10] = 0  # reset flashed
-        step += 1
-        if np.all(a == 0):
+        flashes = step(a)
+        step_count += 1
+        if flashes == a.size:
             break
-    print(step)
+    print(step_count)
 
 
 part1()  # 1640
@@ -1,47 +1,82 @@
 import os
 import sys
 import numpy as np
-from collections import defaultdict
+
+# The grid graph is shared with 2016/13, 2022/12, 2023/17 and 2024/16, 18 and 20
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '2024'))
+from gridgraph import dial
 
 with open(os.path.join(sys.path[0], 'input.txt'), 'r') as f:
     arr = np.array([[int(i) for i in line.strip()] for line in f])
 
 rows, cols = arr.shape
+base = arr.tolist()
 
 
-def find_adjs(i, j, scale):
-    pts = [(i-1, j), (i, j-1), (i, j+1), (i+1, j)]
-    return filter(lambda p: p[0] >= 0 and p[0] < rows * scale and p[1] >= 0 and p[1] < cols * scale, pts)
+class Cave:
+    """Edges of the map tiled scale times each way, cell i * width + j, a
+    step costing the risk of the cell entered. Risks come from the base
+    tile as the search reaches each cell, so the full map is never built:
+    only the base row and column of each row and column, and how many
+    tiles in they are, are kept."""
 
+    def __init__(self, scale):
+        self.height = height = rows * scale
+        self.width = width = cols * scale
+        self.base_row = [base[i % rows] for i in range(height)]
+        self.tile_row = [i // rows for i in range(height)]
+        self.base_col = [j % cols for j in range(width)]
+        self.tile_col = [j // cols for j in range(width)]
+        # Risk of a base value raised by some tiles, wrapping 9 to 1
+        self.wrap = [(v - 1) % 9 + 1 for v in range(9 + 2 * scale)]
 
-def dijkstra(solved: dict, unsolved: dict, scale):
-    k = min(unsolved, key=unsolved.get)
-    solved[k] = unsolved[k]
-    del unsolved[k]
-    for adj in find_adjs(k[0], k[1], scale):
-        if adj in solved:
-            continue
-        unsolved[adj] = min(solved[k] + scaled_value(adj), unsolved[adj])
+    def __len__(self):
+        return self.height * self.width
 
+    def risk(self, i, j):
+        return self.wrap[self.base_row[i][self.base_col[j]] + self.tile_row[i] + self.tile_col[j]]
 
-def scaled_value(x):
-    i, j = x
-    v = arr[i % rows, j % cols]
-    return (v + i // rows + j // cols - 1) % 9 + 1
+    def __getitem__(self, node):
+        width = self.width
+        i, j = divmod(node, width)
+        if 0 < i < self.height - 1 and 0 < j < width - 1:
+            # Away from the edges, the common case, with risk() inlined
+            wrap, base_col, tile_col = self.wrap, self.base_col, self.tile_col
+            above, here, below = self.base_row[i - 1:i + 2]
+            lift = self.tile_row[i]
+            left, right = base_col[j - 1], base_col[j + 1]
+            return [
+                (node - width, wrap[above[base_col[j]] + self.tile_row[i - 1] + tile_col[j]]),
+                (node - 1, wrap[here[left] + lift + tile_col[j - 1]]),
+                (node + 1, wrap[here[right] + lift + tile_col[j + 1]]),
+                (node + width, wrap[below[base_col[j]] + self.tile_row[i + 1] + tile_col[j]]),
+            ]
+        risk = self.risk
+        edges = []
+        if i:
+            edges.append((node - width, risk(i - 1, j)))
+        if j:
+            edges.append((node - 1, risk(i, j - 1)))
+        if j + 1 < width:
+            edges.append((node + 1, risk(i, j + 1)))
+        if i + 1 < self.height:
+            edges.append((node + width, risk(i + 1, j)))
+        return edges
 
 
-def solve(scale):
-    solved, unsolved = {}, defaultdict(lambda: 9999)
-    unsolved[(0, 0)] = 0
-    target = (rows*scale-1, cols*scale-1)
-    while target not in solved:
-        dijkstra(solved, unsolved, scale)
-    return solved[target]
+def solve(scale, stats=None):
+    cave = Cave(scale)
+    target = len(cave) - 1
+    return dial(cave, [0], 9, targets=[target], stats=stats)[target]
 
 
 def part1(): print(solve(1))
 def part2(): print(solve(5))
 
 
-part1()  # 720
-part2()  # 3025
+if __name__ == '__main__':
+    part1()  # 720
+    part2()  # 3025
+    if '--scale' in sys.argv:
+        scale = int(sys.argv[sys.argv.index('--scale') + 1])
+        print(f"{scale}x{scale}:", solve(scale))
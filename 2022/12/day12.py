@@ -1,65 +1,31 @@
 import os
 import sys
-from collections import deque
 from textwrap import dedent
-from typing import Tuple
 
-
-def parse(data: str):
-    grid = []
-    start = end = None
-    for r, line in enumerate(data.strip().splitlines()):
-        row = []
-        for c, ch in enumerate(line.strip()):
-            if ch == "S":
-                start = (r, c)
-                row.append(0)
-            elif ch == "E":
-                end = (r, c)
-                row.append(25)
-            else:
-                row.append(ord(ch) - ord("a"))
-        grid.append(row)
-    return grid, start, end
+# The grid graph is shared with 2016/13, 2021/15, 2023/17 and 2024/16, 18 and 20
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "2024"))
+from gridgraph import Grid, bfs
 
 
-def bfs(grid, start, is_goal, can_move):
-    rows, cols = len(grid), len(grid[0])
-    queue = deque([(start[0], start[1], 0)])
-    seen = {start}
-    while queue:
-        r, c, dist = queue.popleft()
-        if is_goal(r, c):
-            return dist
-        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols:
-                if (nr, nc) not in seen and can_move((r, c), (nr, nc)):
-                    seen.add((nr, nc))
-                    queue.append((nr, nc, dist + 1))
-    return None
+def parse(data: str):
+    lines = [line.strip() for line in data.strip().splitlines()]
+    grid = Grid.from_lines(lines, walls="")
+    start, end = grid.find("S"), grid.find("E")
+    heights = [ord(ch) - ord("a") for ch in grid.text.replace("S", "a").replace("E", "z")]
+    # A step climbs at most one
+    climbs = grid.where(lambda i, j: heights[j] <= heights[i] + 1)
+    return heights, climbs, start, end
 
 
 def part1(data: str) -> int:
-    grid, start, end = parse(data)
-
-    def can_move(current, nxt):
-        r1, c1 = current
-        r2, c2 = nxt
-        return grid[r2][c2] <= grid[r1][c1] + 1
-
-    return bfs(grid, start, lambda r, c: (r, c) == end, can_move)
+    heights, climbs, start, end = parse(data)
+    return bfs(climbs, [start], targets=[end])[end]
 
 
 def part2(data: str) -> int:
-    grid, start, end = parse(data)
-
-    def can_move(current, nxt):
-        r1, c1 = current
-        r2, c2 = nxt
-        return grid[r2][c2] >= grid[r1][c1] - 1
-
-    return bfs(grid, end, lambda r, c: grid[r][c] == 0, can_move)
+    heights, climbs, start, end = parse(data)
+    lowest = [i for i, height in enumerate(heights) if height == 0]
+    return bfs(climbs, lowest, targets=[end])[end]
 
 
 def run_example() -> None:
@@ -1,7 +1,13 @@
 import os
+import random
 import sys
+import time
 from textwrap import dedent
 
+# The cycle finder is shared with 2018/12, 2018/18 and 2023/14
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "2018"))
+from cycles import CycleFinder
+
 
 ROCKS = [
     [(0, 0), (1, 0), (2, 0), (3, 0)],
@@ -11,75 +17,145 @@ ROCKS = [
     [(0, 0), (1, 0), (0, 1), (1, 1)],
 ]
 
+WIDTH = 7
+FULL = (1 << WIDTH) - 1
+
+# Columns set in each row mask
+COLUMNS = [[x for x in range(WIDTH) if mask >> x & 1] for mask in range(FULL + 1)]
+
+# Rows the chamber grows by before rows no rock can reach are trimmed
+TRIM_AT = 4096
+
+
+def placements(cells):
+    """Row masks of a rock, bottom up, at every x it fits at, and the last x"""
+    width = max(x for x, _ in cells) + 1
+    rows = [sum(1 << x for x, y in cells if y == row) for row in range(max(y for _, y in cells) + 1)]
+    return [tuple(mask << x for mask in rows) for x in range(WIDTH - width + 1)], WIDTH - width
+
+
+SHAPES = [placements(cells) for cells in ROCKS]
+
+
+def reachable_floor(chamber, top):
+    """Lowest row a falling rock could still reach. Rocks only move down and
+    sideways, so the free cells reachable from above are found row by row."""
+    reach = FULL
+    y = top
+    while reach:
+        free = ~chamber[y] & FULL
+        reach &= free
+        while True:
+            grown = (reach | reach << 1 | reach >> 1) & free
+            if grown == reach:
+                break
+            reach = grown
+        y -= 1
+    return y + 2
+
 
-def simulate(data: str, total_rocks: int) -> int:
-    jets = data.strip()
+def simulate(data: str, total_rocks: int, stats: dict | None = None) -> int:
+    jets = [-1 if jet == "<" else 1 for jet in data.strip()]
     jet_len = len(jets)
-    occupied = set()
-    max_y = -1
+    # One 7-bit mask per row, over a full floor row, with room for a rock above the top
+    chamber = bytearray([FULL]) + bytearray(8)
+    top = 0 # Highest filled row
+    base = 0 # Rows trimmed off below chamber[0]
+    column_tops = [0] * WIDTH
     jet_index = 0
-    column_heights = [-1] * 7
-    seen = {}
-    added_height = 0
     rock_count = 0
-    skip_done = False
-
-    def can_move(rock, dx, dy):
-        for x, y in rock:
-            nx, ny = x + dx, y + dy
-            if nx < 0 or nx >= 7 or ny < 0:
-                return False
-            if (nx, ny) in occupied:
-                return False
-        return True
+    trim_at = TRIM_AT
+    peak_rows = 0
+    finder = CycleFinder()
 
     while rock_count < total_rocks:
-        shape = ROCKS[rock_count % len(ROCKS)]
-        rock = [(x + 2, y + max_y + 4) for x, y in shape]
+        # The chamber repeats once the next rock, jet and surface profile do.
+        # The profile is seven depths, so hashing it whole costs no more than
+        # the columns a rock changes; a ShiftHash of the column tops pays two
+        # modular powers per change and made part 2 ten times slower.
+        profile = tuple(top - t for t in column_tops)
+        if finder.push(hash((rock_count % len(ROCKS), jet_index, profile)), base + top):
+            if stats is not None:
+                stats.update(index=finder.index, period=finder.period, rows=max(peak_rows, len(chamber)))
+            return finder.extrapolate(total_rocks)
+
+        shapes, last = SHAPES[rock_count % len(ROCKS)]
+        # Three rows above the top, the first four pushes can only hit the walls
+        x = 2
+        for _ in range(4):
+            x = min(max(x + jets[jet_index], 0), last)
+            jet_index = (jet_index + 1) % jet_len
+        rock = shapes[x]
+        y = top + 1
 
         while True:
-            jet = jets[jet_index % jet_len]
-            jet_index = (jet_index + 1) % jet_len
-            dx = -1 if jet == "<" else 1
-            if can_move(rock, dx, 0):
-                rock = [(x + dx, y) for x, y in rock]
-            if can_move(rock, 0, -1):
-                rock = [(x, y - 1) for x, y in rock]
+            below = y - 1
+            for mask in rock:
+                if chamber[below] & mask:
+                    break
+                below += 1
             else:
-                for x, y in rock:
-                    occupied.add((x, y))
-                    column_heights[x] = max(column_heights[x], y)
-                max_y = max(max_y, max(y for _, y in rock))
-                break
-
+                y -= 1
+                nx = x + jets[jet_index]
+                jet_index = (jet_index + 1) % jet_len
+                if 0 <= nx <= last:
+                    moved = shapes[nx]
+                    row = y
+                    for mask in moved:
+                        if chamber[row] & mask:
+                            break
+                        row += 1
+                    else:
+                        x, rock = nx, moved
+                continue
+            break
+
+        for row, mask in enumerate(rock, y):
+            chamber[row] |= mask
+            for col in COLUMNS[mask]:
+                if row > column_tops[col]:
+                    column_tops[col] = row
+        top = max(top, y + len(rock) - 1)
+        if len(chamber) < top + 8:
+            chamber.extend(bytes(8))
         rock_count += 1
 
-        profile = tuple(max_y - column_heights[x] for x in range(7))
-        key = (rock_count % len(ROCKS), jet_index, profile)
-        if not skip_done:
-            if key in seen:
-                prev_rock, prev_height = seen[key]
-                cycle_len = rock_count - prev_rock
-                height_gain = max_y - prev_height
-                remaining = total_rocks - rock_count
-                if cycle_len > 0:
-                    cycles = remaining // cycle_len
-                    if cycles:
-                        rock_count += cycles * cycle_len
-                        added_height += cycles * height_gain
-                        skip_done = True
-            else:
-                seen[key] = (rock_count, max_y)
+        if len(chamber) > trim_at:
+            # Keep one row under the reachable floor for rocks to land on
+            peak_rows = max(peak_rows, len(chamber))
+            cut = reachable_floor(chamber, top + 1) - 1
+            del chamber[:cut]
+            base += cut
+            top -= cut
+            column_tops = [t - cut for t in column_tops]
+            trim_at = len(chamber) + TRIM_AT
 
-    return max_y + 1 + added_height
+    if stats is not None:
+        stats.update(rows=max(peak_rows, len(chamber)))
+    return base + top
 
 
 def part1(data: str) -> int:
     return simulate(data, 2022)
 
 
-def part2(data: str) -> int:
-    return simulate(data, 1_000_000_000_000)
+def part2(data: str, stats: dict | None = None) -> int:
+    return simulate(data, 1_000_000_000_000, stats)
+
+
+def bench(data: str) -> None:
+    """1e12 rocks on the input and on random jet streams 100 times as long"""
+    rng = random.Random(2022)
+    runs = [("input", data.strip())]
+    runs += [(f"random x100 #{k}", "".join(rng.choice("<>") for _ in range(100 * len(data.strip())))) for k in range(2)]
+    print(f"{'jets':<16} {'length':>9} {'rocks run':>10} {'period':>8} {'peak rows':>9} {'seconds':>8} {'rocks/s':>9}")
+    for name, jets in runs:
+        stats = {}
+        start = time.perf_counter()
+        simulate(jets, 1_000_000_000_000, stats)
+        elapsed = time.perf_counter() - start
+        rocks = stats["index"]
+        print(f"{name:<16} {len(jets):>9,} {rocks:>10,} {stats['period']:>8,} {stats['rows']:>9,} {elapsed:>8.3f} {rocks / elapsed:>9,.0f}")
 
 
 def run_example() -> None:
@@ -95,3 +171,5 @@ if __name__ == "__main__":
         puzzle_input = f.read().strip()
     print(part1(puzzle_input))
     print(part2(puzzle_input))
+    if "--bench" in sys.argv:
+        bench(puzzle_input)
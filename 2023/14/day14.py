@@ -6,8 +6,13 @@ Advent of Code 2023 Day 14: Parabolic Reflector Dish
 from __future__ import annotations
 
 import os
+import struct
 import sys
-from typing import Iterable, List, Tuple
+from typing import Iterable
+
+# The cycle finder is shared with 2018/12, 2018/18 and 2022/17
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "2018"))
+from cycles import CycleFinder
 
 
 def read_input() -> list[str]:
@@ -16,105 +21,158 @@ def read_input() -> list[str]:
         return [line.strip() for line in f if line.strip()]
 
 
-def tilt(grid: list[list[str]], direction: str) -> None:
-    rows = len(grid)
-    cols = len(grid[0])
-
-    if direction == "N":
-        for c in range(cols):
-            target = 0
-            for r in range(rows):
-                if grid[r][c] == "#":
-                    target = r + 1
-                elif grid[r][c] == "O":
-                    if r != target:
-                        grid[r][c] = "."
-                        grid[target][c] = "O"
-                    target += 1
-    elif direction == "S":
-        for c in range(cols):
-            target = rows - 1
-            for r in range(rows - 1, -1, -1):
-                if grid[r][c] == "#":
-                    target = r - 1
-                elif grid[r][c] == "O":
-                    if r != target:
-                        grid[r][c] = "."
-                        grid[target][c] = "O"
-                    target -= 1
-    elif direction == "W":
-        for r in range(rows):
-            target = 0
-            for c in range(cols):
-                if grid[r][c] == "#":
-                    target = c + 1
-                elif grid[r][c] == "O":
-                    if c != target:
-                        grid[r][c] = "."
-                        grid[r][target] = "O"
-                    target += 1
-    elif direction == "E":
-        for r in range(rows):
-            target = cols - 1
-            for c in range(cols - 1, -1, -1):
-                if grid[r][c] == "#":
-                    target = c - 1
-                elif grid[r][c] == "O":
-                    if c != target:
-                        grid[r][c] = "."
-                        grid[r][target] = "O"
-                    target -= 1
-
-
-def load(grid: list[list[str]]) -> int:
-    rows = len(grid)
-    total = 0
-    for r in range(rows):
-        weight = rows - r
-        total += weight * sum(1 for ch in grid[r] if ch == "O")
-    return total
-
-
-def cycle(grid: list[list[str]]) -> None:
-    for direction in ["N", "W", "S", "E"]:
-        tilt(grid, direction)
+def runs(size: int, walls: list[int]) -> tuple[list[tuple[int, int, int]], int]:
+    """(mask, start, end) of the runs of two or more cells between cube
+    rocks in a line, and a mask of the single cells between them, where a
+    rock cannot move"""
+    found = []
+    fixed = 0
+    start = 0
+    for end in walls + [size]:
+        if end == start + 1:
+            fixed |= 1 << start
+        elif end > start:
+            found.append((((1 << (end - start)) - 1) << start, start, end))
+        start = end + 1
+    return found, fixed
+
+
+class RolledLines(dict):
+    """Tilted lines by line, for one line and direction: a line not seen
+    before has its rocks rolled to the start of each run, or to_end to its
+    end, only the popcount per run mattering"""
+
+    def __init__(self, line_runs: tuple[list[tuple[int, int, int]], int], to_end: bool) -> None:
+        super().__init__()
+        self.runs, self.fixed = line_runs
+        self.to_end = to_end
+
+    def __missing__(self, line: bytes) -> bytes:
+        bits = int.from_bytes(line, "little")
+        rolled = bits & self.fixed
+        if self.to_end:
+            for mask, _, end in self.runs:
+                n = (bits & mask).bit_count()
+                if n:
+                    rolled |= ((1 << n) - 1) << (end - n)
+        else:
+            for mask, start, _ in self.runs:
+                n = (bits & mask).bit_count()
+                if n:
+                    rolled |= ((1 << n) - 1) << start
+        tilted = self[line] = rolled.to_bytes(len(line), "little")
+        return tilted
+
+
+def transposer(side: int) -> list[tuple[int, int]]:
+    """(shift, mask) of the delta swaps transposing a side x side bit matrix,
+    bit r * side + c, side a power of two: each swaps the top right and
+    bottom left quarters of every block, halving the blocks each time"""
+    swaps = []
+    half = side // 2
+    blank = bytes(side // 8)
+    while half:
+        row = sum(1 << c for c in range(side) if c & half).to_bytes(side // 8, "little")
+        mask = int.from_bytes(b"".join(blank if r & half else row for r in range(side)), "little")
+        swaps.append((half * (side - 1), mask))
+        half //= 2
+    return swaps
+
+
+class Platform:
+    """Rounded rocks as bitboards, one bitmask per line with bit k for cell k.
+
+    Tilting a line rolls its rocks to one end of each run between cube
+    rocks, so only the popcount per run matters. The board alternates
+    between columns (for N and S) and rows (for W and E): after each tilt
+    the lines are joined into one int, a square bit matrix of side a power
+    of two, and transposed with delta swaps. Tilted lines are memoised per
+    line, as the same lines keep coming back as the spins settle.
+    """
+
+    def __init__(self, data: list[str]) -> None:
+        self.height = height = len(data)
+        self.width = width = len(data[0])
+        self.side = side = max(8, 1 << (max(height, width) - 1).bit_length())
+        self.swaps = transposer(side)
+        columns = ["".join(col) for col in zip(*data)]
+        column_runs = [runs(height, [r for r, ch in enumerate(col) if ch == "#"]) for col in columns]
+        row_runs = [runs(width, [c for c, ch in enumerate(row) if ch == "#"]) for row in data]
+        self.memos = {
+            "N": [RolledLines(line_runs, False) for line_runs in column_runs],
+            "S": [RolledLines(line_runs, True) for line_runs in column_runs],
+            "W": [RolledLines(line_runs, False) for line_runs in row_runs],
+            "E": [RolledLines(line_runs, True) for line_runs in row_runs],
+        }
+        # Lines are side / 8 bytes each, split off the board in one go
+        self.unpack = {
+            "columns": struct.Struct(f"{side // 8}s" * width).unpack_from,
+            "rows": struct.Struct(f"{side // 8}s" * height).unpack_from,
+        }
+        # Bit planes of the row number: cells of rows with bit j set, for
+        # the board as columns (bit c * side + r) and as rows (bit r * side + c)
+        size = side // 8
+        full, blank = b"\xff" * size, bytes(size)
+        self.planes = {"rows": [], "columns": []}
+        for j in range(height.bit_length()):
+            self.planes["rows"].append(int.from_bytes(b"".join(full if r >> j & 1 else blank for r in range(height)), "little"))
+            column = sum(1 << r for r in range(height) if r >> j & 1).to_bytes(size, "little")
+            self.planes["columns"].append(int.from_bytes(column * side, "little"))
+
+        self.board = b"".join(sum(1 << r for r, ch in enumerate(col) if ch == "O").to_bytes(size, "little") for col in columns).ljust(side * size, b"\0")
+        self.bits = int.from_bytes(self.board, "little")
+        self.across = "columns"
+        self.lines = self.unpack[self.across](self.board)
+
+    def tilt(self, direction: str) -> None:
+        """Roll every rock as far as it goes"""
+        tilted = list(map(dict.__getitem__, self.memos[direction], self.lines))
+        # Transpose: rows after tilting columns, columns after tilting rows
+        board = int.from_bytes(b"".join(tilted), "little")
+        for shift, mask in self.swaps:
+            swapped = (board ^ board >> shift) & mask
+            board ^= swapped ^ swapped << shift
+        self.bits = board
+        self.board = board.to_bytes(self.side * self.side // 8, "little")
+        self.across = "rows" if direction in "NS" else "columns"
+        self.lines = self.unpack[self.across](self.board)
+
+    def load(self) -> int:
+        """North load: each rock counts its distance from the south edge,
+        height less its row number, summed a bit plane of rows at a time"""
+        bits = self.bits
+        rows = sum((bits & plane).bit_count() << j for j, plane in enumerate(self.planes[self.across]))
+        return self.height * bits.bit_count() - rows
+
+    def spin(self) -> int:
+        for direction in "NWSE":
+            self.tilt(direction)
+        return self.load()
 
 
 def part1(lines: Iterable[str] | None = None) -> int:
     data = read_input() if lines is None else [line.strip() for line in lines if line.strip()]
-    grid = [list(row) for row in data]
-    tilt(grid, "N")
-    return load(grid)
-
-
-def grid_state(grid: list[list[str]]) -> tuple[str, ...]:
-    return tuple("".join(row) for row in grid)
+    platform = Platform(data)
+    platform.tilt("N")
+    return platform.load()
 
 
-def part2(lines: Iterable[str] | None = None) -> int:
+def part2(lines: Iterable[str] | None = None, stats: dict | None = None) -> int:
     data = read_input() if lines is None else [line.strip() for line in lines if line.strip()]
-    grid = [list(row) for row in data]
-
-    seen: dict[tuple[str, ...], int] = {}
-    states: list[tuple[str, ...]] = []
+    platform = Platform(data)
     total_cycles = 1_000_000_000
-    cycle_idx = 0
-
-    while cycle_idx < total_cycles:
-        state = grid_state(grid)
-        if state in seen:
-            start = seen[state]
-            loop_len = cycle_idx - start
-            remaining = (total_cycles - start) % loop_len
-            final_state = states[start + remaining]
-            grid = [list(row) for row in final_state]
-            return load(grid)
-        seen[state] = cycle_idx
-        states.append(state)
-        cycle(grid)
-        cycle_idx += 1
-
-    return load(grid)
+
+    # After a spin the board bytes are the rocks column by column. Hashing
+    # them whole is a single pass in C over a couple of kilobytes; finding
+    # the columns a spin changed to update a Zobrist-style fingerprint takes
+    # a Python loop over every column, which costs more than the hash.
+    finder = CycleFinder()
+    while not finder.push(hash(platform.board), platform.load()):
+        platform.spin()
+
+    if stats is not None:
+        stats.update(index=finder.index, period=finder.period)
+    return finder.extrapolate(total_cycles)
 
 
 def run_example() -> None:
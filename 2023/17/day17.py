@@ -7,8 +7,12 @@ from __future__ import annotations
 
 import os
 import sys
-import heapq
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Iterable
+
+# The grid graph is shared with 2016/13, 2021/15, 2022/12 and 2024/16, 18 and 20
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "2024"))
+import gridgraph
+from gridgraph import Grid, UNREACHED
 
 
 def read_input() -> list[str]:
@@ -17,69 +21,64 @@ def read_input() -> list[str]:
         return [line.strip() for line in f if line.strip()]
 
 
-Grid = list[str]
-State = tuple[int, int, Optional[int], int]  # row, col, direction index, run length
-
-DIRS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-
-
-def dijkstra(grid: Grid, min_run_before_turn: int, max_run: int, min_run_to_finish: int) -> int:
-    rows = len(grid)
-    cols = len(grid[0])
-    target = (rows - 1, cols - 1)
-
-    pq: list[tuple[int, State]] = []
-    dist: Dict[State, int] = {}
-
-    # start with no direction
-    heapq.heappush(pq, (0, (0, 0, None, 0)))
-    dist[(0, 0, None, 0)] = 0
-
-    while pq:
-        cost, (r, c, dir_idx, run_len) = heapq.heappop(pq)
-        if (r, c) == target:
-            if dir_idx is None:
-                return cost
-            if run_len >= min_run_to_finish:
-                return cost
-        if cost != dist[(r, c, dir_idx, run_len)]:
-            continue
-
-        for new_dir_idx, (dr, dc) in enumerate(DIRS):
-            nr, nc = r + dr, c + dc
-            if not (0 <= nr < rows and 0 <= nc < cols):
-                continue
-            if dir_idx is not None and (new_dir_idx + 2) % 4 == dir_idx:
-                continue
-
-            if dir_idx is None:
-                new_run = 1
-            elif new_dir_idx == dir_idx:
-                if run_len >= max_run:
-                    continue
-                new_run = run_len + 1
-            else:
-                if run_len < min_run_before_turn:
-                    continue
-                new_run = 1
-
-            new_cost = cost + int(grid[nr][nc])
-            state = (nr, nc, new_dir_idx, new_run)
-            if state not in dist or new_cost < dist[state]:
-                dist[state] = new_cost
-                heapq.heappush(pq, (new_cost, state))
-
-    raise RuntimeError("Target not reachable")
+class Crucible:
+    """Edges between crucible states (cell, axis), numbered cell * 2 + axis:
+    the crucible has just stopped at the cell after moving along the axis,
+    0 for north-south and 1 for east-west, and must turn. An edge is a
+    whole run of min_run to max_run cells the other way, weighing the heat
+    lost on it, so run lengths never need to be part of the state. The
+    edges are worked out as the search reaches each state."""
+
+    def __init__(self, grid: Grid, heat: list[int], min_run: int, max_run: int) -> None:
+        self.grid = grid
+        self.heat = heat
+        self.min_run = max(1, min_run)
+        self.max_run = max_run
+
+    def __len__(self) -> int:
+        return 2 * self.grid.size
+
+    def __getitem__(self, node: int) -> list[tuple[int, int]]:
+        cell, axis = divmod(node, 2)
+        heat = self.heat
+        edges = []
+        # Headings 0 and 2 run north-south, 1 and 3 east-west
+        for heading in (1 - axis, 3 - axis):
+            step = self.grid.step[heading]
+            at, lost = cell, 0
+            for run in range(1, self.max_run + 1):
+                at = step[at]
+                if at < 0:
+                    break
+                lost += heat[at]
+                if run >= self.min_run:
+                    edges.append((2 * at + 1 - axis, lost))
+        return edges
+
+
+def dijkstra(lines: list[str], min_run: int, max_run: int) -> int:
+    """Least heat lost from the top left to the bottom right, the buckets
+    kept in a ring as no run loses more than 9 per cell"""
+    grid = Grid.from_lines(lines)
+    crucible = Crucible(grid, [int(ch) for ch in grid.text], min_run, max_run)
+    target = grid.size - 1
+    # Starting out either way, as if it had just stopped
+    targets = [2 * target, 2 * target + 1]
+    dist = gridgraph.dial(crucible, [0, 1], 9 * max_run, targets=targets)
+    reached = [dist[node] for node in targets if dist[node] != UNREACHED]
+    if not reached:
+        raise RuntimeError("Target not reachable")
+    return min(reached)
 
 
 def part1(lines: Iterable[str] | None = None) -> int:
     grid = read_input() if lines is None else [line.strip() for line in lines if line.strip()]
-    return dijkstra(grid, min_run_before_turn=0, max_run=3, min_run_to_finish=0)
+    return dijkstra(grid, min_run=1, max_run=3)
 
 
 def part2(lines: Iterable[str] | None = None) -> int:
     grid = read_input() if lines is None else [line.strip() for line in lines if line.strip()]
-    return dijkstra(grid, min_run_before_turn=4, max_run=10, min_run_to_finish=4)
+    return dijkstra(grid, min_run=4, max_run=10)
 
 
 def run_example() -> None:
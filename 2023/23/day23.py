@@ -7,9 +7,12 @@ from __future__ import annotations
 
 import os
 import sys
-from typing import Dict, Iterable, List, Set, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
 
-sys.setrecursionlimit(1_000_000)
+# Partial walks handed out per worker when the search is split across processes
+SPLIT = 8
 
 
 def read_input() -> list[str]:
@@ -36,45 +39,7 @@ def find_start_end(grid: list[str]) -> tuple[tuple[int, int], tuple[int, int]]:
     return start, end
 
 
-def part1(lines: Iterable[str] | None = None) -> int:
-    grid = read_input() if lines is None else [line.rstrip("\n") for line in lines if line.strip("\n")]
-    rows = len(grid)
-    cols = len(grid[0])
-    start, end = find_start_end(grid)
-
-    best = 0
-    visited = set()
-
-    def dfs(r: int, c: int, steps: int) -> None:
-        nonlocal best
-        if (r, c) == end:
-            best = max(best, steps)
-            return
-        visited.add((r, c))
-        current_char = grid[r][c]
-        dirs = ALL_DIRS
-        if current_char in DIRECTIONS:
-            dirs = [DIRECTIONS[current_char]]
-        for dr, dc in dirs:
-            nr, nc = r + dr, c + dc
-            if not (0 <= nr < rows and 0 <= nc < cols):
-                continue
-            if grid[nr][nc] == "#":
-                continue
-            if (nr, nc) in visited:
-                continue
-            dest_char = grid[nr][nc]
-            if dest_char in DIRECTIONS:
-                if (dr, dc) != DIRECTIONS[dest_char]:
-                    continue
-            dfs(nr, nc, steps + 1)
-        visited.remove((r, c))
-
-    dfs(*start, 0)
-    return best
-
-
-def build_graph(grid: list[str]) -> tuple[dict[tuple[int, int], list[tuple[tuple[int, int], int]]], tuple[int, int], tuple[int, int]]:
+def build_graph(grid: list[str], slopes: bool = False) -> tuple[dict[tuple[int, int], list[tuple[tuple[int, int], int]]], tuple[int, int], tuple[int, int]]:
     rows = len(grid)
     cols = len(grid[0])
     start, end = find_start_end(grid)
@@ -87,6 +52,17 @@ def build_graph(grid: list[str]) -> tuple[dict[tuple[int, int], list[tuple[tuple
                 result.append((nr, nc))
         return result
 
+    def steps(r: int, c: int) -> list[tuple[int, int]]:
+        # Neighbours a step can reach: with icy slopes, only downhill off or onto a slope
+        if not slopes:
+            return neighbors(r, c)
+        result = []
+        for nr, nc in neighbors(r, c):
+            move = (nr - r, nc - c)
+            if DIRECTIONS.get(grid[r][c], move) == move and DIRECTIONS.get(grid[nr][nc], move) == move:
+                result.append((nr, nc))
+        return result
+
     nodes = {start, end}
     for r in range(rows):
         for c in range(cols):
@@ -99,46 +75,139 @@ def build_graph(grid: list[str]) -> tuple[dict[tuple[int, int], list[tuple[tuple
     graph: dict[tuple[int, int], list[tuple[tuple[int, int], int]]] = {node: [] for node in nodes}
 
     for node in nodes:
-        for nr, nc in neighbors(*node):
+        for nr, nc in steps(*node):
             prev = node
             current = (nr, nc)
             distance = 1
             while current not in nodes:
-                next_steps = [n for n in neighbors(*current) if n != prev]
+                next_steps = [n for n in steps(*current) if n != prev]
                 if not next_steps:
                     break
                 prev = current
                 current = next_steps[0]
                 distance += 1
-            graph[node].append((current, distance))
+            if current in nodes:
+                graph[node].append((current, distance))
     return graph, start, end
 
 
-def part2(lines: Iterable[str] | None = None) -> int:
-    raw = read_input() if lines is None else [line.rstrip("\n") for line in lines if line.strip("\n")]
-    # Convert slopes to open tiles
-    grid = []
-    for row in raw:
-        grid.append(row.replace("^", ".").replace("v", ".").replace("<", ".").replace(">", "."))
-    graph, start, end = build_graph(grid)
+def junctions(grid: list[str], slopes: bool = False) -> tuple[list[list[tuple[int, int]]], list[int]]:
+    """The contracted maze with junctions numbered 0..N-1, the start 0 and
+    the end N-1: the (junction, length) edges of each, and the longest edge
+    into each"""
+    graph, start, end = build_graph(grid, slopes)
+    order = [start] + sorted(set(graph) - {start, end}) + [end]
+    index = {node: i for i, node in enumerate(order)}
+    edges = [[(index[nxt], cost) for nxt, cost in graph[node]] for node in order]
+    # The only junction next to the end must go straight there, or the end is cut off
+    exits = [i for i, node_edges in enumerate(edges) if any(nxt == len(order) - 1 for nxt, _ in node_edges)]
+    if len(exits) == 1:
+        edges[exits[0]] = [(nxt, cost) for nxt, cost in edges[exits[0]] if nxt == len(order) - 1]
+    longest_in = [0] * len(order)
+    for node_edges in edges:
+        for nxt, cost in node_edges:
+            longest_in[nxt] = max(longest_in[nxt], cost)
+    return edges, longest_in
+
+
+def longest_walk(edges: list[list[tuple[int, int]]], longest_in: list[int], walks: list[tuple[int, int, int, int]], best: int = 0) -> int:
+    """Longest walk to the end continuing any of the partial walks (junction,
+    visited bitmask, length, bound). A walk's bound is the most the junctions
+    it has not visited could still add, each entered at most once by its
+    longest edge; walks that cannot beat the best so far even so are cut."""
+    end = len(edges) - 1
+    stack = list(walks)
+    while stack:
+        node, visited, length, bound = stack.pop()
+        if node == end:
+            if length > best:
+                best = length
+            continue
+        if length + bound <= best:
+            continue
+        for nxt, cost in edges[node]:
+            bit = 1 << nxt
+            if not visited & bit:
+                stack.append((nxt, visited | bit, length + cost, bound - longest_in[nxt]))
+    return best
 
-    best = 0
-    visited = set([start])
 
-    def dfs(node: tuple[int, int], distance: int):
-        nonlocal best
-        if node == end:
-            best = max(best, distance)
-            return
-        for neighbor, cost in graph[node]:
-            if neighbor in visited:
+def split(edges: list[list[tuple[int, int]]], longest_in: list[int], count: int) -> list[tuple[int, int, int, int]]:
+    """Partial walks from the start, extended breadth first until there are
+    at least count of them; every longest walk continues one of them"""
+    end = len(edges) - 1
+    walks = [(0, 1, 0, sum(longest_in) - longest_in[0])]
+    while 0 < len(walks) < count:
+        longer = []
+        for node, visited, length, bound in walks:
+            if node == end:
+                longer.append((node, visited, length, bound))
                 continue
-            visited.add(neighbor)
-            dfs(neighbor, distance + cost)
-            visited.remove(neighbor)
+            for nxt, cost in edges[node]:
+                if not visited >> nxt & 1:
+                    longer.append((nxt, visited | 1 << nxt, length + cost, bound - longest_in[nxt]))
+        if len(longer) == len(walks):
+            break
+        walks = longer
+    return walks
+
+
+def longest(grid: list[str], slopes: bool, workers: int = 1) -> int:
+    edges, longest_in = junctions(grid, slopes)
+    if workers <= 1:
+        return longest_walk(edges, longest_in, [(0, 1, 0, sum(longest_in) - longest_in[0])])
+    walks = split(edges, longest_in, SPLIT * workers)
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(longest_walk, [edges] * len(walks), [longest_in] * len(walks), [[walk] for walk in walks])
+        return max(results, default=0)
+
+
+def part1(lines: Iterable[str] | None = None, workers: int = 1) -> int:
+    grid = read_input() if lines is None else [line.rstrip("\n") for line in lines if line.strip("\n")]
+    return longest(grid, slopes=True, workers=workers)
 
-    dfs(start, 0)
-    return best
+
+def part2(lines: Iterable[str] | None = None, workers: int = 1) -> int:
+    grid = read_input() if lines is None else [line.rstrip("\n") for line in lines if line.strip("\n")]
+    # The slopes are as good as open tiles
+    return longest(grid, slopes=False, workers=workers)
+
+
+def bench(workers: int) -> None:
+    """Wall time of part 2: the recursive search it replaced, the bitmask
+    search, and the bitmask search split across processes"""
+
+    def recursive() -> int:
+        # Reference: the recursive search over tuple-keyed junctions that part2
+        # replaced. It only recurses junction deep, so the default limit holds.
+        grid = [row.translate(str.maketrans("^v<>", "....")) for row in read_input()]
+        graph, start, end = build_graph(grid)
+        best = 0
+        visited = {start}
+
+        def dfs(node: tuple[int, int], distance: int) -> None:
+            nonlocal best
+            if node == end:
+                best = max(best, distance)
+                return
+            for neighbor, cost in graph[node]:
+                if neighbor in visited:
+                    continue
+                visited.add(neighbor)
+                dfs(neighbor, distance + cost)
+                visited.remove(neighbor)
+
+        dfs(start, 0)
+        return best
+
+    runs = [("recursive", recursive), ("bitmask", part2)]
+    if workers > 1:
+        runs.append((f"{workers} workers", lambda: part2(workers=workers)))
+    print(f"{'search':<12} {'longest':>8} {'seconds':>8}")
+    for name, run in runs:
+        start = time.perf_counter()
+        longest = run()
+        print(f"{name:<12} {longest:>8} {time.perf_counter() - start:>8.3f}")
 
 
 def run_example() -> None:
@@ -175,5 +244,8 @@ def run_example() -> None:
 if __name__ == "__main__":
     if os.getenv("RUN_EXAMPLE", "0") == "1":
         run_example()
-    print(part1())
-    print(part2())
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 1
+    print(part1(workers=workers))
+    print(part2(workers=workers))
+    if "--bench" in sys.argv:
+        bench(workers)
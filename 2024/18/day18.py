@@ -1,6 +1,10 @@
 import os
 import sys
-from collections import deque
+from functools import lru_cache
+
+# The grid graph is shared with 2016/13, 2021/15, 2022/12, 2023/17 and 2024/16 and 20
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from gridgraph import Grid, bfs
 
 def parse_input(filename):
     """Parse the input file to get list of falling byte coordinates."""
@@ -13,34 +17,18 @@ def parse_input(filename):
         coordinates.append((x, y))
     return coordinates
 
-def find_shortest_path(corrupted, grid_size):
-    """Find shortest path from (0,0) to (grid_size, grid_size) using BFS."""
-    start = (0, 0)
-    end = (grid_size, grid_size)
-
-    # BFS
-    queue = deque([(start, 0)])  # (position, steps)
-    visited = {start}
-
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+@lru_cache(maxsize=None)
+def open_grid(side):
+    return Grid(side, side)
 
-    while queue:
-        (x, y), steps = queue.popleft()
 
-        if (x, y) == end:
-            return steps
-
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-
-            # Check bounds
-            if 0 <= nx <= grid_size and 0 <= ny <= grid_size:
-                # Check not corrupted and not visited
-                if (nx, ny) not in corrupted and (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    queue.append(((nx, ny), steps + 1))
-
-    return -1  # No path found
+def find_shortest_path(corrupted, grid_size):
+    """Find shortest path from (0,0) to (grid_size, grid_size) using BFS."""
+    side = grid_size + 1
+    grid = open_grid(side)
+    blocked = {y * side + x for x, y in corrupted}
+    end = grid.index(grid_size, grid_size)
+    return bfs(grid.neighbours, [0], targets=[end], blocked=blocked)[end]  # -1 if no path found
 
 def find_first_blocking_byte(coordinates, grid_size):
     """Find the first byte that blocks the path using binary search."""
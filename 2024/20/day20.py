@@ -1,6 +1,11 @@
 import os
 import sys
-from collections import deque
+
+import numpy as np
+
+# The grid graph is shared with 2016/13, 2021/15, 2022/12, 2023/17 and 2024/16 and 18
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gridgraph import Grid, bfs, UNREACHED
 
 
 def parse_input(filename):
@@ -8,65 +13,38 @@ def parse_input(filename):
     with open(filename) as f:
         lines = [line.rstrip("\n") for line in f if line.strip()]
 
-    grid = [list(line) for line in lines]
-    start = end = None
-    for r, row in enumerate(grid):
-        for c, ch in enumerate(row):
-            if ch == "S":
-                start = (r, c)
-                grid[r][c] = "."
-            elif ch == "E":
-                end = (r, c)
-                grid[r][c] = "."
-
-    if start is None or end is None:
+    grid = Grid.from_lines(lines)
+    if "S" not in grid.text or "E" not in grid.text:
         raise ValueError("Grid must contain both S and E")
 
-    return grid, start, end
+    return grid, grid.find("S"), grid.find("E")
 
 
-def bfs(grid, start):
-    """Return shortest distances from start to all open cells."""
-    rows, cols = len(grid), len(grid[0])
-    dist = {start: 0}
-    q = deque([start])
-    while q:
-        r, c = q.popleft()
-        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] != "#":
-                if (nr, nc) not in dist:
-                    dist[(nr, nc)] = dist[(r, c)] + 1
-                    q.append((nr, nc))
-    return dist
+def bfs_distances(grid, start):
+    """Shortest distances from start to every cell as a (rows, cols) array, -1 where unreachable."""
+    return np.array(bfs(grid.neighbours, [start]), np.int64).reshape(grid.rows, grid.cols)
 
 
 def count_cheats(grid, start, end, cheat_range, threshold=100):
     """Count cheats that save at least `threshold` picoseconds."""
-    dist_start = bfs(grid, start)
-    dist_end = bfs(grid, end)
-    baseline = dist_start[end]
+    dist_start = bfs_distances(grid, start)
+    dist_end = bfs_distances(grid, end)
+    baseline = dist_start[grid.cell(end)]
 
-    rows, cols = len(grid), len(grid[0])
+    # Every cheat of one offset at once: the cells it starts from against the
+    # cells it ends on, both on the track
+    rows, cols = grid.rows, grid.cols
     count = 0
-
-    for (r, c), d0 in dist_start.items():
-        for dr in range(-cheat_range, cheat_range + 1):
-            remaining = cheat_range - abs(dr)
-            for dc in range(-remaining, remaining + 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = r + dr, c + dc
-                if not (0 <= nr < rows and 0 <= nc < cols):
-                    continue
-                if grid[nr][nc] == "#":
-                    continue
-                if (nr, nc) not in dist_end:
-                    continue
-                cheat_cost = abs(dr) + abs(dc)
-                total = d0 + cheat_cost + dist_end[(nr, nc)]
-                if baseline - total >= threshold:
-                    count += 1
+    for dr in range(-cheat_range, cheat_range + 1):
+        remaining = cheat_range - abs(dr)
+        for dc in range(-remaining, remaining + 1):
+            if dr == 0 and dc == 0:
+                continue
+            before = dist_start[max(0, -dr):rows - max(0, dr), max(0, -dc):cols - max(0, dc)]
+            after = dist_end[max(0, dr):rows + min(0, dr), max(0, dc):cols + min(0, dc)]
+            cheat_cost = abs(dr) + abs(dc)
+            saved = baseline - (before + cheat_cost + after)
+            count += int(np.count_nonzero((saved >= threshold) & (before != UNREACHED) & (after != UNREACHED)))
 
     return count
 
@@ -96,8 +74,7 @@ def run_example():
         f.write(example)
 
     grid, start, end = parse_input(tmp_path)
-    dist_start = bfs(grid, start)
-    baseline = dist_start[end]
+    baseline = bfs_distances(grid, start)[grid.cell(end)]
     p1 = count_cheats(grid, start, end, cheat_range=2, threshold=1)
     p2 = count_cheats(grid, start, end, cheat_range=4, threshold=1)
 
@@ -0,0 +1,2 @@
+from .grid import Grid, HEADINGS, NORTH, EAST, SOUTH, WEST
+from .search import bfs, bfs01, dijkstra, dial, astar, UNREACHED
@@ -0,0 +1,162 @@
+import contextlib
+import heapq
+import importlib.util
+import io
+import os
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from gridgraph import Grid, bfs, bfs01, dijkstra, dial, astar, UNREACHED
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+# (year, day, part 1, part 2), each part called with the loaded module
+DAYS = [
+    (2016, 13, lambda day: day.part1(), lambda day: day.part2()),
+    (2021, 15, lambda day: day.solve(1), lambda day: day.solve(5)),
+    (2022, 12, lambda day: day.part1(read(2022, 12)), lambda day: day.part2(read(2022, 12))),
+    (2023, 17, lambda day: day.part1(), lambda day: day.part2()),
+    (2024, 16, lambda day: day.part1(), lambda day: day.part2()),
+    (2024, 18, lambda day: day.part1(), lambda day: day.part2()),
+    (2024, 20, lambda day: day.part1(), lambda day: day.part2()),
+]
+
+# Bytes fallen on the 2024/18 grid for the search comparison
+FALLEN = 1024
+
+# Tilings of the 2021/15 map for the stress run
+SCALES = (5, 10, 25)
+
+
+def read(year, day):
+    with open(os.path.join(ROOT, str(year), str(day), 'input.txt')) as f:
+        return f.read()
+
+
+@contextlib.contextmanager
+def at_day(year, day):
+    # Days read input.txt next to sys.path[0], so it points at the day while it loads and runs
+    script = sys.path[0]
+    sys.path[0] = os.path.join(ROOT, str(year), str(day))
+    try:
+        yield
+    finally:
+        sys.path[0] = script
+
+
+def load_day(year, day):
+    path = os.path.join(ROOT, str(year), str(day), f'day{day}.py')
+    spec = importlib.util.spec_from_file_location(f'day_{year}_{day}', path)
+    module = importlib.util.module_from_spec(spec)
+    with at_day(year, day), contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+def heap_dijkstra(edges, sources, size=None, targets=(), stats=None):
+    # Reference: a heap entry per relaxed edge
+    dist = [UNREACHED] * (len(edges) if size is None else size)
+    queue = [(0, node) for node in sources]
+    for node in sources:
+        dist[node] = 0
+    settled = 0
+    while queue:
+        d, node = heapq.heappop(queue)
+        if d != dist[node]:
+            continue
+        settled += 1
+        if node in targets:
+            break
+        for nxt, weight in edges[node]:
+            nd = d + weight
+            if dist[nxt] == UNREACHED or nd < dist[nxt]:
+                dist[nxt] = nd
+                heapq.heappush(queue, (nd, nxt))
+    stats["settled"] = settled
+    return dist
+
+
+def bench_days():
+    """Latency of each part of each day on the toolkit"""
+    print(f"{'day':<8} {'part':>4} {'answer':>12} {'ms':>8}")
+    for year, day, *parts in DAYS:
+        module = load_day(year, day)
+        for part, run in enumerate(parts, 1):
+            with at_day(year, day), contextlib.redirect_stdout(io.StringIO()) as out:
+                start = time.perf_counter()
+                answer = run(module)
+                elapsed = time.perf_counter() - start
+            answer = out.getvalue().strip() if answer is None else answer
+            print(f"{year}/{day:<3} {part:>4} {str(answer):>12} {elapsed * 1000:>8.1f}")
+
+
+def bench_searches():
+    """Each search on the same unit-weight grid (2024/18), lazily tiled map
+    (2021/15 x5) and crucible runs (2023/17 part 2)"""
+    lines = read(2024, 18).split()
+    blocked = {int(y) * 71 + int(x) for x, y in (line.split(',') for line in lines[:FALLEN])}
+    maze = Grid(71, 71)
+    neighbours = maze.without(blocked)
+    unit = [[(j, 1) for j in moves] for moves in neighbours]
+
+    cave = load_day(2021, 15).Cave(5)
+    crucibles = load_day(2023, 17)
+    grid = Grid.from_lines(read(2023, 17).split())
+    crucible = crucibles.Crucible(grid, [int(ch) for ch in grid.text], 4, 10)
+
+    def manhattan(rows, cols):
+        # Steps to the bottom right corner, a lower bound when no step costs under 1
+        return lambda i: rows - 1 - i // cols + cols - 1 - i % cols
+
+    last = maze.size - 1
+    corner = len(cave) - 1
+    ends = [2 * grid.size - 2, 2 * grid.size - 1]
+    runs = [
+        ("2024/18", "bfs", lambda stats: bfs(maze.neighbours, [0], targets=[last], blocked=blocked, stats=stats), [last]),
+        ("2024/18", "bfs01", lambda stats: bfs01(unit, [0], targets=[last], stats=stats), [last]),
+        ("2024/18", "buckets", lambda stats: dijkstra(unit, [0], targets=[last], stats=stats), [last]),
+        ("2024/18", "dial", lambda stats: dial(unit, [0], 1, targets=[last], stats=stats), [last]),
+        ("2024/18", "heap", lambda stats: heap_dijkstra(unit, [0], targets={last}, stats=stats), [last]),
+        ("2024/18", "astar", lambda stats: astar(unit, [0], [last], manhattan(71, 71), stats=stats), [last]),
+        ("2021/15", "buckets", lambda stats: dijkstra(cave, [0], targets=[corner], stats=stats), [corner]),
+        ("2021/15", "dial", lambda stats: dial(cave, [0], 9, targets=[corner], stats=stats), [corner]),
+        ("2021/15", "heap", lambda stats: heap_dijkstra(cave, [0], targets={corner}, stats=stats), [corner]),
+        ("2021/15", "astar", lambda stats: astar(cave, [0], [corner], manhattan(cave.height, cave.width), stats=stats), [corner]),
+        ("2023/17", "buckets", lambda stats: dijkstra(crucible, [0, 1], targets=ends, stats=stats), ends),
+        ("2023/17", "dial", lambda stats: dial(crucible, [0, 1], 90, targets=ends, stats=stats), ends),
+        ("2023/17", "heap", lambda stats: heap_dijkstra(crucible, [0, 1], targets=set(ends), stats=stats), ends),
+    ]
+    print(f"\n{'graph':<8} {'search':<8} {'distance':>8} {'settled':>8} {'ms':>8}")
+    found = {}
+    for graph, name, run, targets in runs:
+        stats = {}
+        start = time.perf_counter()
+        dist = run(stats)
+        elapsed = time.perf_counter() - start
+        distance = min(dist[node] for node in targets if dist[node] != UNREACHED)
+        assert found.setdefault(graph, distance) == distance
+        print(f"{graph:<8} {name:<8} {distance:>8} {stats['settled']:>8,} {elapsed * 1000:>8.1f}")
+
+
+def bench_tiling():
+    """2021/15 on Dial's ring of buckets, the map tiled further and further"""
+    day = load_day(2021, 15)
+    print(f"\n{'scale':>5} {'cells':>10} {'risk':>6} {'settled':>10} {'seconds':>8} {'nodes/s':>9}")
+    for scale in SCALES:
+        stats = {}
+        start = time.perf_counter()
+        risk = day.solve(scale, stats)
+        elapsed = time.perf_counter() - start
+        cells = day.rows * day.cols * scale * scale
+        print(f"{scale:>5} {cells:>10,} {risk:>6} {stats['settled']:>10,} {elapsed:>8.3f} {stats['settled'] / elapsed:>9,.0f}")
+
+
+def main():
+    bench_days()
+    bench_searches()
+    bench_tiling()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# (dr, dc) of the four headings, clockwise from north; heading (h + 2) % 4 is h reversed
+HEADINGS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+NORTH, EAST, SOUTH, WEST = range(4)
+
+
+class Grid:
+    """Rectangular grid of cells numbered row by row, cell r * cols + c.
+
+    step[h][i] is the cell one step from cell i in heading h, or -1 off the
+    grid or into a wall, and neighbours[i] lists the cells a step away, so
+    searches never build tuples or check bounds. Nodes with extra state
+    (a heading, a run length) are numbered cell * states + state.
+    """
+
+    def __init__(self, rows, cols, walls=None):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.walls = [False] * self.size if walls is None else list(walls)
+        walls = self.walls
+        self.step = []
+        for dr, dc in HEADINGS:
+            offset = dr * cols + dc
+            step = list(range(offset, self.size + offset))
+            # Steps off the first or last row or column
+            if dr:
+                step[slice(0, cols) if dr < 0 else slice(self.size - cols, None)] = [-1] * cols
+            if dc:
+                step[0 if dc < 0 else cols - 1::cols] = [-1] * rows
+            if any(walls):
+                step = [-1 if wall or j < 0 or walls[j] else j for j, wall in zip(step, walls)]
+            self.step.append(step)
+        self.neighbours = [[j for j in moves if j >= 0] for moves in zip(*self.step)]
+
+    @classmethod
+    def from_lines(cls, lines, walls="#"):
+        grid = cls(len(lines), len(lines[0]), [ch in walls for line in lines for ch in line])
+        grid.text = "".join(lines)
+        return grid
+
+    def find(self, ch):
+        """Cell of the first ch in the lines the grid was read from"""
+        return self.text.index(ch)
+
+    def index(self, r, c):
+        return r * self.cols + c
+
+    def cell(self, i):
+        return divmod(i, self.cols)
+
+    def where(self, allowed):
+        """Neighbour lists keeping only the steps from i to j with allowed(i, j)"""
+        return [[j for j in moves if allowed(i, j)] for i, moves in enumerate(self.neighbours)]
+
+    def without(self, blocked):
+        """Neighbour lists with the cells in the set blocked walled off"""
+        return [[] if i in blocked else [j for j in moves if j not in blocked] for i, moves in enumerate(self.neighbours)]
+
+    def weighted(self, weights, neighbours=None):
+        """Edge lists of (j, weights[j]) pairs, a step costing the weight of the cell entered"""
+        return [[(j, weights[j]) for j in moves] for moves in neighbours or self.neighbours]
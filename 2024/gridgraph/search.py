@@ -0,0 +1,180 @@
+import heapq
+from collections import deque
+
+# Distance of a node no search reached
+UNREACHED = -1
+# Distance a search gives blocked nodes while it runs, so no step enters them
+BLOCKED = -2
+
+
+def start(size, sources, targets):
+    """Distances with the sources at 0, the distinct sources, the targets as a set"""
+    sources = list(dict.fromkeys(sources))
+    dist = [UNREACHED] * size
+    for node in sources:
+        dist[node] = 0
+    return dist, sources, frozenset(targets)
+
+
+def bfs(neighbours, sources, size=None, targets=(), limit=None, blocked=(), stats=None):
+    """Steps from the nearest source to every node, over neighbours[node]
+    lists, never entering the blocked nodes. Stops once a target is
+    reached, or past limit steps."""
+    dist, sources, targets = start(len(neighbours) if size is None else size, sources, targets)
+    # Blocked nodes look reached until the search is over, so the same
+    # lists serve any set of them at no cost per step
+    blocked = [node for node in blocked if dist[node] == UNREACHED]
+    for node in blocked:
+        dist[node] = BLOCKED
+    frontier = sources
+    settled = len(frontier)
+    steps = 0
+    while frontier and not targets.intersection(frontier) and steps != limit:
+        steps += 1
+        found = []
+        for node in frontier:
+            for nxt in neighbours[node]:
+                if dist[nxt] == UNREACHED:
+                    dist[nxt] = steps
+                    found.append(nxt)
+        frontier = found
+        settled += len(found)
+    for node in blocked:
+        dist[node] = UNREACHED
+    if stats is not None:
+        stats["settled"] = settled
+    return dist
+
+
+def bfs01(edges, sources, size=None, targets=(), stats=None):
+    """Distances over edges[node] lists of (next, weight) with weights 0 or 1"""
+    dist, sources, targets = start(len(edges) if size is None else size, sources, targets)
+    queue = deque((0, node) for node in sources)
+    settled = 0
+    while queue:
+        d, node = queue.popleft()
+        if d != dist[node]:
+            continue
+        settled += 1
+        if node in targets:
+            break
+        for nxt, weight in edges[node]:
+            nd = d + weight
+            if dist[nxt] == UNREACHED or nd < dist[nxt]:
+                dist[nxt] = nd
+                if weight:
+                    queue.append((nd, nxt))
+                else:
+                    queue.appendleft((nd, nxt))
+    if stats is not None:
+        stats["settled"] = settled
+    return dist
+
+
+def dijkstra(edges, sources, size=None, targets=(), stats=None):
+    """Distances over edges[node] lists of (next, weight) with positive
+    integer weights.
+
+    The queue is a bucket of nodes per distance, with a heap of the
+    distances that have a bucket: every node in a bucket is settled at
+    once, and the heap only orders distinct distances, far fewer than
+    nodes when weights are small. A node whose distance dropped after it
+    was queued is skipped when its old bucket comes up. Stops once a
+    target is settled; a target's distance is then final and the other
+    targets' no smaller.
+    """
+    dist, sources, targets = start(len(edges) if size is None else size, sources, targets)
+    buckets = {0: sources}
+    pending = [0]
+    settled = 0
+    while pending:
+        d = heapq.heappop(pending)
+        for node in buckets.pop(d):
+            if dist[node] != d:
+                continue
+            settled += 1
+            if node in targets:
+                pending = None
+                break
+            for nxt, weight in edges[node]:
+                nd = d + weight
+                old = dist[nxt]
+                if old == UNREACHED or nd < old:
+                    dist[nxt] = nd
+                    if nd in buckets:
+                        buckets[nd].append(nxt)
+                    else:
+                        buckets[nd] = [nxt]
+                        heapq.heappush(pending, nd)
+    if stats is not None:
+        stats["settled"] = settled
+    return dist
+
+
+def dial(edges, sources, max_weight, size=None, targets=(), stats=None):
+    """Distances over edges[node] lists of (next, weight) with integer
+    weights from 1 to max_weight (Dial's algorithm).
+
+    Every queued node is within max_weight of the distance being settled,
+    so the buckets are a ring of max_weight + 1 lists indexed by distance
+    modulo its length: a push is an append and finding the next bucket is
+    a step round the ring, with no heap at all.
+    """
+    dist, sources, targets = start(len(edges) if size is None else size, sources, targets)
+    span = max_weight + 1
+    ring = [[] for _ in range(span)]
+    ring[0] = sources
+    queued = len(sources)
+    settled = 0
+    d = 0
+    while queued:
+        slot = d % span
+        bucket = ring[slot]
+        if bucket:
+            ring[slot] = []
+            queued -= len(bucket)
+            for node in bucket:
+                if dist[node] != d:
+                    continue
+                settled += 1
+                if node in targets:
+                    queued = 0
+                    break
+                for nxt, weight in edges[node]:
+                    nd = d + weight
+                    old = dist[nxt]
+                    if old == UNREACHED or nd < old:
+                        dist[nxt] = nd
+                        ring[nd % span].append(nxt)
+                        queued += 1
+        d += 1
+    if stats is not None:
+        stats["settled"] = settled
+    return dist
+
+
+def astar(edges, sources, targets, heuristic, size=None, stats=None):
+    """Distances over edges[node] lists of (next, weight), settling nodes in
+    order of distance plus heuristic(node), a lower bound on the distance
+    left to the nearest target. Only the nodes on the way to the first
+    target settled get a final distance."""
+    dist, sources, targets = start(len(edges) if size is None else size, sources, targets)
+    queue = [(heuristic(node), 0, node) for node in sources]
+    heapq.heapify(queue)
+    settled = 0
+    while queue:
+        _, d, node = heapq.heappop(queue)
+        if d != dist[node]:
+            continue
+        settled += 1
+        if node in targets:
+            break
+        for nxt, weight in edges[node]:
+            nd = d + weight
+            old = dist[nxt]
+            if old == UNREACHED or nd < old:
+                dist[nxt] = nd
+                heapq.heappush(queue, (nd + heuristic(nxt), nd, nxt))
+    if stats is not None:
+        stats["settled"] = settled
+    return dist